@@ -4,6 +4,8 @@ ACCEPTED_TEXTS = ('да', 'yes', 'y')
 
 DT_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
 
+INVITE_URL = 'https://t.me/smena_trainee_bot?start={token}'
+
 FIELD_LABLES = {
     'name': 'имени',
     'full_address': 'адреса',
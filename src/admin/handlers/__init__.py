@@ -1,6 +1,8 @@
 from aiogram import Dispatcher  # noqa
 
+from .import_users import router as import_users_router  # noqa
 from .invitations import router as invitations_router  # noqa
+from .pickers import router as pickers_router  # noqa
 from .restaurants import router as restaurants_router  # noqa
 
 from .roadmaps import router as roadmap_templates_router  # noqa
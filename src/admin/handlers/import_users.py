@@ -0,0 +1,108 @@
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from aiogram import F, Router
+from aiogram.filters import Command
+from aiogram.fsm.context import FSMContext
+from aiogram.types import FSInputFile, Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from admin.services.import_users import IMPORT_EXTENSIONS, UserImporter
+from admin.states.users import ImportUsersForm
+
+router = Router(name='import_users')
+
+IMPORT_FORMAT_TEXT = (
+    'Импорт пользователей из CSV (UTF-8 или Windows-1251) или XLSX.\n\n'
+    'Первая строка файла - названия колонок. Обязательные: first_name, '
+    'last_name, tg_id, email, phone_number. Необязательные: patronymic, '
+    'role (USER, MANAGER, ADMIN; по умолчанию USER), timezone '
+    '(по умолчанию Europe/Moscow), additional_info.\n\n'
+    'Введите срок действия приглашений в днях или «-», если '
+    'приглашения не нужны:'
+)
+
+
+@router.message(Command('import_users'))
+async def cmd_import_users(
+    message: Message,
+    state: FSMContext,
+) -> None:
+    """Начало импорта. Запрашивает срок действия приглашений."""
+    await state.clear()
+    await message.answer(IMPORT_FORMAT_TEXT)
+    await state.set_state(ImportUsersForm.expires_at)
+
+
+@router.message(ImportUsersForm.expires_at)
+async def proc_import_expires_at(
+    message: Message,
+    state: FSMContext,
+) -> None:
+    """Сохраняет срок действия приглашений и запрашивает файл."""
+    text = (message.text or '').strip()
+    if text != '-' and not text.isdigit():
+        await message.answer('Введите число дней или «-»:')
+        return
+    await state.update_data(days=None if text == '-' else int(text))
+    await message.answer('Отправьте файл CSV или XLSX:')
+    await state.set_state(ImportUsersForm.file)
+
+
+@router.message(ImportUsersForm.file, F.document)
+async def proc_import_file(
+    message: Message,
+    state: FSMContext,
+    session: AsyncSession,
+) -> None:
+    """Импортирует пользователей из файла и присылает отчёт.
+
+    Файл скачивается на диск и читается построчно, отчёт тоже пишется
+    в файл, так что в памяти держится только одна пачка строк. Файл,
+    отклонённый до записи первой строки, можно прислать заново; если
+    импорт прервался посередине, приходит отчёт по записанным строкам.
+    """
+    name = message.document.file_name or ''
+    if Path(name).suffix.lower() not in IMPORT_EXTENSIONS:
+        await message.answer('Нужен файл с расширением .csv или .xlsx.')
+        return
+    data = await state.get_data()
+    expires_at = None
+    if data['days'] is not None:
+        expires_at = datetime.now() + timedelta(days=data['days'])
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / f'import{Path(name).suffix.lower()}'
+        report_path = Path(directory) / 'import_report.csv'
+        await message.bot.download(message.document, destination=source)
+        failure = None
+        with report_path.open('w', newline='', encoding='utf-8-sig') as file:
+            importer = UserImporter(file, session, expires_at)
+            try:
+                await importer.run(source)
+            except ValueError as error:
+                failure = str(error)
+        result = importer.result
+        if failure is not None and not result.processed:
+            await message.answer(
+                f'Файл не принят: {failure}.\n'
+                'Отправьте исправленный файл CSV или XLSX:',
+            )
+            return
+        summary = (
+            f'Создано пользователей: {result.created}\n'
+            f'Конфликтов: {result.conflicts}\n'
+            f'Строк с ошибками: {result.invalid}\n'
+            f'Создано приглашений: {result.invites}'
+        )
+        if failure is not None:
+            summary = f'Импорт прерван: {failure}\n\n{summary}'
+        await message.answer(summary)
+        await message.answer_document(FSInputFile(report_path))
+    await state.clear()
+
+
+@router.message(ImportUsersForm.file)
+async def proc_import_not_file(message: Message) -> None:
+    """Напоминает, что для импорта нужен файл."""
+    await message.answer('Отправьте файл CSV или XLSX документом:')
@@ -1,5 +1,4 @@
 from datetime import datetime, timedelta
-from json import dumps
 
 from aiogram import F, Router
 from aiogram.filters import Command
@@ -7,16 +6,17 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from admin.keyboards import build_user_id_select_keyboard
+from admin.constants import INVITE_URL
+from admin.pickers import picker_keyboard
 from admin.states.users import InvitationForm
-from admin.utils import get_unique_link_token, json_deserial, json_serial
-from crud import invite_crud, user_crud
-from models.models import User
+from crud import invite_crud
 
 router = Router(name='invitations')
 
+# Ссылок в одном сообщении: укладываемся в лимит длины сообщения.
+LINKS_PER_MESSAGE = 50
+
 
 @router.message(Command('get_invite'))
 async def cmd_get_invite(
@@ -24,24 +24,15 @@ async def cmd_get_invite(
     state: FSMContext,
     session: AsyncSession,
 ) -> None:
-    """Начало создание ссылки-приглашения. Устанавливает текущее время."""
+    """Начало создание ссылки-приглашения."""
     await state.clear()
-    await state.update_data(
-        created_at=dumps(datetime.now(), default=json_serial),
-    )
-    users = await user_crud.get_multi(
-        session,
-        options=[selectinload(User.restaurant)],
-    )
-    if not users:
+    keyboard = await picker_keyboard('invite_user', session)
+    if keyboard is None:
         await message.answer('Нет пользователей.')
         return
     await message.answer(
         'Выберите пользователя, для которого нужно создать приглашение:',
-        reply_markup=build_user_id_select_keyboard(
-            users,
-            prefix='invite_user',
-        ),
+        reply_markup=keyboard,
     )
 
 
@@ -67,16 +58,13 @@ async def proc_expires_at(
 ) -> None:
     """Обработка времени действия ссылки. Создание ссылки-приглашения."""
     expires_at = datetime.now() + timedelta(days=int(message.text))
-    await state.update_data(
-        expires_at=dumps(expires_at, default=json_serial),
-    )
-    link_token = await get_unique_link_token(session)
-    await state.update_data(link_token=link_token)
     data = await state.get_data()
-    data['created_at'] = json_deserial(data['created_at'])
-    data['expires_at'] = json_deserial(data['expires_at'])
     try:
-        invite = await invite_crud.create(data, session)
+        [invite] = await invite_crud.issue(
+            [data['user_id']],
+            expires_at,
+            session,
+        )
     except IntegrityError as error:
         await message.answer(
             'Конфликт данных при сохранении.',
@@ -86,10 +74,69 @@ async def proc_expires_at(
     await message.answer(
         f'Для пользователя #{invite.user_id} создана ссылка-приглашение:',
     )
+    await message.answer(INVITE_URL.format(token=invite.link_token))
+    await state.clear()
+
+
+@router.message(Command('restaurant_invites'))
+async def cmd_restaurant_invites(
+    message: Message,
+    state: FSMContext,
+    session: AsyncSession,
+) -> None:
+    """Начало создания приглашений для всех стажёров ресторана."""
+    await state.clear()
+    keyboard = await picker_keyboard('invite_restaurant', session)
+    if keyboard is None:
+        await message.answer('Нет ресторанов.')
+        return
     await message.answer(
-        f'https://t.me/smena_trainee_bot?start={invite.link_token}',
+        'Выберите ресторан, стажёрам которого нужно создать приглашения:',
+        reply_markup=keyboard,
+    )
+
+
+@router.callback_query(F.data.startswith('invite_restaurant:'))
+async def proc_restaurant_id(
+    call: CallbackQuery,
+    state: FSMContext,
+) -> None:
+    """Обработка ID ресторана. Запрашивает время действия ссылок."""
+    restaurant_id = int(call.data.split(':', 1)[1])
+    await state.update_data(restaurant_id=restaurant_id)
+    await call.message.edit_reply_markup()
+    await call.message.answer('Введите срок действия ссылок в днях:')
+    await state.set_state(InvitationForm.restaurant_expires_at)
+
+
+@router.message(InvitationForm.restaurant_expires_at)
+async def proc_restaurant_expires_at(
+    message: Message,
+    state: FSMContext,
+    session: AsyncSession,
+) -> None:
+    """Создание приглашений стажёрам ресторана одной транзакцией."""
+    expires_at = datetime.now() + timedelta(days=int(message.text))
+    data = await state.get_data()
+    invites = await invite_crud.issue_for_restaurant(
+        data['restaurant_id'],
+        expires_at,
+        session,
     )
     await state.clear()
+    if not invites:
+        await message.answer('В ресторане нет активных стажёров.')
+        return
+    await message.answer(f'Создано приглашений: {len(invites)}')
+    lines = [
+        f'#{invite.user_id}: {INVITE_URL.format(token=invite.link_token)}'
+        for invite in invites
+    ]
+    for start in range(0, len(lines), LINKS_PER_MESSAGE):
+        await message.answer(
+            '\n'.join(lines[start:start + LINKS_PER_MESSAGE]),
+            disable_web_page_preview=True,
+        )
 
 
 @router.message(F.text == 'Сгенерировать приглашение')
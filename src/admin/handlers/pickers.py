@@ -0,0 +1,27 @@
+from aiogram import F, Router
+from aiogram.types import CallbackQuery
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from admin.pickers import PICKERS, picker_keyboard
+from services.pagination import PageCallback
+
+router = Router(name='pickers')
+
+
+@router.callback_query(PageCallback.filter(F.picker.in_(PICKERS)))
+async def turn_picker_page(
+    call: CallbackQuery,
+    callback_data: PageCallback,
+    session: AsyncSession,
+) -> None:
+    """Листает клавиатуру выбора на соседнюю страницу."""
+    keyboard = await picker_keyboard(
+        callback_data.picker,
+        session,
+        callback_data,
+    )
+    if keyboard is None:
+        await call.answer('Список изменился, начните выбор заново.')
+        return
+    await call.message.edit_reply_markup(reply_markup=keyboard)
+    await call.answer()
@@ -6,18 +6,11 @@ from aiogram.types import CallbackQuery, Message
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from admin.keyboards import (
-    build_restaurant_select_keyboard,
-    build_roadmap_template_select_keyboard,
-    point_type_keyboard,
-)
+from admin.keyboards import point_type_keyboard
+from admin.pickers import picker_keyboard
 from admin.services.reference_points import update_ref_point_state
 from admin.states.reference_points import RefPointTemplateForm
-from crud import (
-    restaurant_crud,
-    template_reference_point_crud,
-    template_roadmap_crud,
-)
+from crud import template_reference_point_crud
 
 router = Router(name='reference_points')
 
@@ -81,7 +74,6 @@ async def ref_point_order_execution(
             'Порядковый номер должен быть числом. Введите ещё раз:',
         )
         return
-    rest_list = await restaurant_crud.get_multi(session)
     if await update_ref_point_state(
         state=state,
         key='order_execution',
@@ -89,9 +81,9 @@ async def ref_point_order_execution(
         next_state=RefPointTemplateForm.restaurant_id,
         message=message,
         prompt='Выберите ресторан:',
-        reply_markup=build_restaurant_select_keyboard(
-            rest_list,
-            prefix='assign_rest_for_refpoint',
+        reply_markup=await picker_keyboard(
+            'assign_rest_for_refpoint',
+            session,
         ),
     ):
         return
@@ -107,7 +99,6 @@ async def process_restaurant_callback(
     session: AsyncSession,
 ) -> None:
     """Привязка шаблона контрольной точки к ресторану."""
-    roadmaps_list = await template_roadmap_crud.get_multi(session)
     rest_id = int(call.data.split(':', 1)[1])
     if await update_ref_point_state(
         state=state,
@@ -116,10 +107,7 @@ async def process_restaurant_callback(
         next_state=RefPointTemplateForm.templateroadmap_id,
         message=call.message,
         prompt='Выберите шаблон дорожной карты:',
-        reply_markup=build_roadmap_template_select_keyboard(
-            roadmaps_list,
-            prefix='assign_roadmap',
-        ),
+        reply_markup=await picker_keyboard('assign_roadmap', session),
     ):
         return
 
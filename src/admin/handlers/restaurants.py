@@ -4,16 +4,14 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from admin.constants import FIELDS_RESTAURANT, FIELD_LABLES
 from admin.keyboards import (
     build_confirm_keyboard,
-    build_restaurant_select_keyboard,
-    build_user_select_keyboard,
     edit_fields_keyboard,
     fields_rest_keyboard,
 )
+from admin.pickers import picker_keyboard
 from admin.services.restaurants import (
     show_summary_and_confirm_restaurant,
     update_restaurant_state,
@@ -23,7 +21,6 @@ from admin.states.restaurants import (
     RestaurantForm,
 )
 from crud import restaurant_crud, user_crud
-from models.models import User
 
 router = Router(name='restaurants')
 
@@ -172,16 +169,13 @@ async def cmd_edit_restaurant_start(
 ) -> None:
     """Старт для редактирования ресторана."""
     await state.clear()
-    restaurants = await restaurant_crud.get_multi(session)
-    if not restaurants:
+    keyboard = await picker_keyboard('edit_restaurant_select', session)
+    if keyboard is None:
         await message.answer('Рестораны не найдены!')
         return
     await message.answer(
         'Выберите ресторан для редактирования:',
-        reply_markup=build_restaurant_select_keyboard(
-            restaurants,
-            prefix='edit_restaurant_select',
-        ),
+        reply_markup=keyboard,
     )
 
 
@@ -245,16 +239,13 @@ async def cmd_block_restaurant_start(
 ) -> None:
     """Начинаем блокировку."""
     await state.clear()
-    restaurants = await restaurant_crud.get_multi(session)
-    if not restaurants:
+    keyboard = await picker_keyboard('block_restaurant_select', session)
+    if keyboard is None:
         await message.answer('Рестораны не найдены!')
         return
     await message.answer(
         'Выберите ресторан для блокировки:',
-        reply_markup=build_restaurant_select_keyboard(
-            restaurants,
-            prefix='block_restaurant_select',
-        ),
+        reply_markup=keyboard,
     )
 
 
@@ -315,16 +306,13 @@ async def cmd_assign_user_start(
 ) -> None:
     """1) Попросить выбрать пользователя."""
     await state.clear()
-    users = await user_crud.get_multi(
-        session,
-        options=[selectinload(User.restaurant)],
-    )
-    if not users:
+    keyboard = await picker_keyboard('assign_user', session)
+    if keyboard is None:
         await message.answer('Нет пользователей для привязки.')
         return
     await message.answer(
         'Выберите пользователя, которого нужно привязать к ресторану:',
-        reply_markup=build_user_select_keyboard(users, prefix='assign_user'),
+        reply_markup=keyboard,
     )
 
 
@@ -338,16 +326,13 @@ async def on_user_selected(
     tg_id = int(call.data.split(':', 1)[1])
     await state.update_data(tg_id=tg_id)
     await call.message.edit_reply_markup()
-    rest_list = await restaurant_crud.get_multi(session)
-    if not rest_list:
+    keyboard = await picker_keyboard('assign_rest', session)
+    if keyboard is None:
         await call.message.answer('Нет ресторанов для привязки.')
         return
     await call.message.answer(
         'Выберите, к какому ресторану привязать пользователя:',
-        reply_markup=build_restaurant_select_keyboard(
-            rest_list,
-            prefix='assign_rest',
-        ),
+        reply_markup=keyboard,
     )
 
 
@@ -11,11 +11,10 @@ from admin.constants import (
 )
 from admin.keyboards import (
     build_confirm_keyboard,
-    build_restaurant_select_keyboard,
-    build_roadmap_template_select_keyboard,
     fields_template_roadmap_keyboard,
     roadmap_edit_fields_keyboard,
 )
+from admin.pickers import picker_keyboard
 from admin.services.roadmap_templates import (
     maybe_confirm_edit_roadmap_template,
     show_summary_and_confirm_roadmap_template,
@@ -138,16 +137,13 @@ async def cmd_edit_roadmap_template_start(
 ) -> None:
     """Старт для редактирования шаблона дорожной карты."""
     await state.clear()
-    roadmap_templates = await template_roadmap_crud.get_multi(session)
-    if not roadmap_templates:
+    keyboard = await picker_keyboard('edit_roadmap_template_select', session)
+    if keyboard is None:
         await message.answer('Шаблоны дорожных карт не найдены!')
         return
     await message.answer(
         'Выберите шаблон для редактирования:',
-        reply_markup=build_roadmap_template_select_keyboard(
-            roadmap_templates,
-            prefix='edit_roadmap_template_select',
-        ),
+        reply_markup=keyboard,
     )
 
 
@@ -216,16 +212,13 @@ async def cmd_block_roadmap_template_start(
 ) -> None:
     """Начинаем блокировку."""
     await state.clear()
-    templates = await template_roadmap_crud.get_multi(session)
-    if not templates:
+    keyboard = await picker_keyboard('block_roadmap_template_select', session)
+    if keyboard is None:
         await message.answer('Шаблоны дорожных карт не найдены!')
         return
     await message.answer(
         'Выберите шаблон для блокировки:',
-        reply_markup=build_roadmap_template_select_keyboard(
-            templates,
-            prefix='block_roadmap_template_select',
-        ),
+        reply_markup=keyboard,
     )
 
 
@@ -287,16 +280,13 @@ async def cmd_adapt_template_for_roadmap_start(
 ) -> None:
     """Показывает все шаблоны дорожных карт."""
     await state.clear()
-    templates = await template_roadmap_crud.get_multi(session)
-    if not templates:
+    keyboard = await picker_keyboard('adapt_roadmap_template_select', session)
+    if keyboard is None:
         await message.answer('Шаблоны дорожных карт не найдены!')
         return
     await message.answer(
         'Выберите шаблон дорожной карты:',
-        reply_markup=build_roadmap_template_select_keyboard(
-            templates,
-            prefix='adapt_roadmap_template_select',
-        ),
+        reply_markup=keyboard,
     )
 
 
@@ -310,16 +300,13 @@ async def process_adapt_restaurant_select(
     template_id = int(call.data.split(':')[1])
     await state.update_data(roadmap_template_id=template_id)
     await call.message.edit_reply_markup()
-    restaurants = await restaurant_crud.get_multi(session)
-    if not restaurants:
+    keyboard = await picker_keyboard('adapt_restaurant_select', session)
+    if keyboard is None:
         await call.message.answer('Рестораны не найдены!')
         return
     await call.message.answer(
         'Выберите ресторан для адаптации шаблона:',
-        reply_markup=build_restaurant_select_keyboard(
-            restaurants,
-            prefix='adapt_restaurant_select',
-        ),
+        reply_markup=keyboard,
     )
 
 
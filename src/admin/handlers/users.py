@@ -4,17 +4,16 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from admin.constants import FIELDS_USER, PROMPT_MAP
 from admin.keyboards import (
     build_confirm_keyboard,
-    build_user_select_keyboard,
     fields_keyboard,
     fields_keyboard_edit,
     role_keyboard,
     timezone_keyboard,
 )
+from admin.pickers import picker_keyboard
 from admin.services.users import (
     maybe_confirm_edit,
     show_summary_and_confirm,
@@ -23,7 +22,6 @@ from admin.services.users import (
 from admin.states.users import EditUserForm, UserForm
 from admin.validators import is_valid_email, is_valid_phone_number
 from crud import user_crud
-from models.models import User
 
 router = Router(name='users')
 
@@ -289,19 +287,13 @@ async def cmd_edit_user_start(
 ) -> None:
     """Начинаем редактирование."""
     await state.clear()
-    users = await user_crud.get_multi(
-        session,
-        options=[selectinload(User.restaurant)],
-    )
-    if not users:
+    keyboard = await picker_keyboard('edit_user_select', session)
+    if keyboard is None:
         await message.answer('Пользователи не найдены!')
         return
     await message.answer(
         'Выберите пользователя, которого хотите редактировать:',
-        reply_markup=build_user_select_keyboard(
-            users,
-            prefix='edit_user_select',
-        ),
+        reply_markup=keyboard,
     )
 
 
@@ -425,19 +417,13 @@ async def cmd_block_user_start(
 ) -> None:
     """Начинаем блокировку."""
     await state.clear()
-    users = await user_crud.get_multi(
-        session,
-        options=[selectinload(User.restaurant)],
-    )
-    if not users:
+    keyboard = await picker_keyboard('block_user_select', session)
+    if keyboard is None:
         await message.answer('Пользователи не найдены!')
         return
     await message.answer(
         'Выберите пользователя, которого хотите заблокировать:',
-        reply_markup=build_user_select_keyboard(
-            users,
-            prefix='block_user_select',
-        ),
+        reply_markup=keyboard,
     )
 
 
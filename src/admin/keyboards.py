@@ -1,6 +1,8 @@
 # =========================
 # Общие клавиатуры
 # =========================
+from typing import Optional
+
 from aiogram.types import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
@@ -173,6 +175,7 @@ fields_keyboard_edit = InlineKeyboardMarkup(
 def build_user_select_keyboard(
     users: list[User],
     prefix: str,
+    nav_buttons: Optional[list[InlineKeyboardButton]] = None,
 ) -> InlineKeyboardMarkup:
     """Клавиатура выбора пользователя."""
     buttons = [
@@ -189,12 +192,15 @@ def build_user_select_keyboard(
         ]
         for user in users
     ]
+    if nav_buttons:
+        buttons.append(nav_buttons)
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
 def build_user_id_select_keyboard(
     users: list[User],
     prefix: str,
+    nav_buttons: Optional[list[InlineKeyboardButton]] = None,
 ) -> InlineKeyboardMarkup:
     """Клавиатура выбора пользователя. Возвращает id."""
     buttons = [
@@ -206,6 +212,8 @@ def build_user_id_select_keyboard(
         ]
         for user in users
     ]
+    if nav_buttons:
+        buttons.append(nav_buttons)
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
@@ -274,6 +282,7 @@ fields_rest_keyboard = InlineKeyboardMarkup(
 def build_restaurant_select_keyboard(
     restaurants: list[Restaurant],
     prefix: str,
+    nav_buttons: Optional[list[InlineKeyboardButton]] = None,
 ) -> InlineKeyboardMarkup:
     """Клавиатура выбора ресторана."""
     buttons = [
@@ -285,6 +294,8 @@ def build_restaurant_select_keyboard(
         ]
         for restaurant in restaurants
     ]
+    if nav_buttons:
+        buttons.append(nav_buttons)
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
@@ -328,6 +339,7 @@ fields_template_roadmap_keyboard = InlineKeyboardMarkup(
 def build_roadmap_template_select_keyboard(
     roadmap_templates: list[TemplateRoadMap],
     prefix: str,
+    nav_buttons: Optional[list[InlineKeyboardButton]] = None,
 ) -> InlineKeyboardMarkup:
     """Клавиатура выбора шаблона дорожной карты."""
     buttons = [
@@ -339,6 +351,8 @@ def build_roadmap_template_select_keyboard(
         ]
         for template in roadmap_templates
     ]
+    if nav_buttons:
+        buttons.append(nav_buttons)
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
@@ -0,0 +1,66 @@
+"""Постраничные клавиатуры выбора в админ-части бота."""
+
+from typing import Optional
+
+from aiogram.types import InlineKeyboardMarkup
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from admin.keyboards import (
+    build_restaurant_select_keyboard,
+    build_roadmap_template_select_keyboard,
+    build_user_id_select_keyboard,
+    build_user_select_keyboard,
+)
+from crud import restaurant_crud, template_roadmap_crud, user_crud
+from models.models import User
+from services.pagination import PageCallback, Picker
+
+USER_PICKER = Picker(
+    crud=user_crud,
+    build_keyboard=build_user_select_keyboard,
+    options=(selectinload(User.restaurant),),
+)
+USER_ID_PICKER = Picker(
+    crud=user_crud,
+    build_keyboard=build_user_id_select_keyboard,
+)
+RESTAURANT_PICKER = Picker(
+    crud=restaurant_crud,
+    build_keyboard=build_restaurant_select_keyboard,
+)
+ROADMAP_TEMPLATE_PICKER = Picker(
+    crud=template_roadmap_crud,
+    build_keyboard=build_roadmap_template_select_keyboard,
+)
+
+# Ключ - префикс callback выбора объекта.
+PICKERS = {
+    'invite_user': USER_ID_PICKER,
+    'edit_user_select': USER_PICKER,
+    'block_user_select': USER_PICKER,
+    'assign_user': USER_PICKER,
+    'edit_restaurant_select': RESTAURANT_PICKER,
+    'block_restaurant_select': RESTAURANT_PICKER,
+    'assign_rest': RESTAURANT_PICKER,
+    'adapt_restaurant_select': RESTAURANT_PICKER,
+    'assign_rest_for_refpoint': RESTAURANT_PICKER,
+    'invite_restaurant': RESTAURANT_PICKER,
+    'edit_roadmap_template_select': ROADMAP_TEMPLATE_PICKER,
+    'block_roadmap_template_select': ROADMAP_TEMPLATE_PICKER,
+    'adapt_roadmap_template_select': ROADMAP_TEMPLATE_PICKER,
+    'assign_roadmap': ROADMAP_TEMPLATE_PICKER,
+}
+
+
+async def picker_keyboard(
+    name: str,
+    session: AsyncSession,
+    callback_data: Optional[PageCallback] = None,
+) -> Optional[InlineKeyboardMarkup]:
+    """Клавиатура выбора по её имени, None - если выбирать не из чего."""
+    return await PICKERS[name].keyboard(
+        name,
+        session,
+        callback_data=callback_data,
+    )
@@ -1,7 +1,9 @@
 from aiogram import Router
 
 from admin.handlers import (
+    import_users_router,
     invitations_router,
+    pickers_router,
     restaurants_router,
     roadmap_templates_router,
     template_ref_point_router,
@@ -14,5 +16,7 @@ admin_router.message.middleware(cancel_middleware)
 admin_router.include_router(users_router)
 admin_router.include_router(restaurants_router)
 admin_router.include_router(invitations_router)
+admin_router.include_router(import_users_router)
 admin_router.include_router(roadmap_templates_router)
 admin_router.include_router(template_ref_point_router)
+admin_router.include_router(pickers_router)
@@ -0,0 +1,320 @@
+import csv
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO
+from zipfile import BadZipFile
+from zoneinfo import available_timezones
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from admin.constants import INVITE_URL
+from admin.validators import is_valid_email, is_valid_phone_number
+from config import settings
+from crud import invite_crud, user_crud
+from models.constants import (
+    MAX_LEN_EMAIL,
+    MAX_LEN_FIRST_NAME,
+    MAX_LEN_LAST_NAME,
+    MAX_LEN_PATRONYMIC,
+    MAX_LEN_PHONE_NUMBER,
+    MOSCOW_TIMEZONE,
+    UserRole,
+)
+
+IMPORT_EXTENSIONS = ('.csv', '.xlsx')
+# Excel в русской локали сохраняет CSV в Windows-1251.
+CSV_ENCODINGS = ('utf-8-sig', 'cp1251')
+XLSX_ERRORS = (BadZipFile, InvalidFileException, KeyError, OSError)
+BROKEN_XLSX = 'файл XLSX повреждён или не является книгой Excel'
+REQUIRED_COLUMNS = (
+    'first_name',
+    'last_name',
+    'tg_id',
+    'email',
+    'phone_number',
+)
+MAX_LENGTHS = {
+    'first_name': MAX_LEN_FIRST_NAME,
+    'last_name': MAX_LEN_LAST_NAME,
+    'patronymic': MAX_LEN_PATRONYMIC,
+    'email': MAX_LEN_EMAIL,
+    'phone_number': MAX_LEN_PHONE_NUMBER,
+}
+REPORT_COLUMNS = ('line', 'tg_id', 'email', 'status', 'detail')
+TIMEZONES = frozenset(available_timezones())
+
+STATUS_CREATED = 'создан'
+STATUS_CONFLICT = 'конфликт'
+STATUS_INVALID = 'ошибка'
+CONFLICT_DETAIL = 'tg_id, email или телефон уже заняты'
+DUPLICATE_DETAIL = 'tg_id повторяется в файле'
+
+
+@dataclass(slots=True)
+class ImportResult:
+    """Итоги импорта пользователей из файла."""
+
+    created: int = 0
+    conflicts: int = 0
+    invalid: int = 0
+    invites: int = 0
+
+    @property
+    def processed(self) -> int:
+        """Сколько строк файла попало в отчёт."""
+        return self.created + self.conflicts + self.invalid
+
+
+def _cell(value: Any) -> str:
+    """Значение ячейки как строка без пробелов по краям.
+
+    Excel хранит tg_id и телефоны числами, поэтому целые float
+    приводятся к int, иначе в строке появится «.0».
+    """
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _header(cells: Any) -> list[str]:
+    """Имена колонок из первой строки файла.
+
+    Без обязательных колонок импорт бессмыслен: ошибка в каждой
+    строке, поэтому такой файл отклоняется целиком.
+    """
+    header = [_cell(name).lower() for name in cells]
+    missing = [name for name in REQUIRED_COLUMNS if name not in header]
+    if missing:
+        raise ValueError(f'В файле нет колонок: {", ".join(missing)}')
+    return header
+
+
+def _iter_csv(file: TextIO) -> Iterator[tuple[int, Dict[str, str]]]:
+    """Строки CSV с разделителем, определённым по началу файла."""
+    try:
+        dialect = csv.Sniffer().sniff(file.read(4096), delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    file.seek(0)
+    reader = csv.reader(file, dialect)
+    header = _header(next(reader, ()))
+    for row in reader:
+        if any(row):
+            yield reader.line_num, dict(zip(header, map(_cell, row)))
+
+
+def _csv_encoding(path: Path) -> str:
+    """Кодировка CSV: UTF-8 или Windows-1251.
+
+    Файл декодируется целиком до импорта: ошибка кодировки в середине
+    файла не должна прерывать импорт после записи первых пачек.
+    """
+    for encoding in CSV_ENCODINGS:
+        try:
+            with path.open(encoding=encoding) as file:
+                while file.read(1 << 16):
+                    pass
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    raise ValueError('файл CSV должен быть в кодировке UTF-8 или Windows-1251')
+
+
+def _iter_xlsx(path: Path) -> Iterator[tuple[int, Dict[str, str]]]:
+    """Строки первого листа XLSX, прочитанные потоково.
+
+    Ошибки чтения повреждённой книги превращаются в ValueError.
+    """
+    try:
+        workbook = load_workbook(path, read_only=True, data_only=True)
+    except XLSX_ERRORS as error:
+        raise ValueError(BROKEN_XLSX) from error
+    line = 1
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _header(next(rows, ()))
+        for line, row in enumerate(rows, start=2):
+            if any(cell is not None for cell in row):
+                yield line, dict(zip(header, map(_cell, row)))
+    except XLSX_ERRORS as error:
+        raise ValueError(f'{BROKEN_XLSX} (строка {line})') from error
+    finally:
+        workbook.close()
+
+
+def iter_rows(path: Path) -> Iterator[tuple[int, Dict[str, str]]]:
+    """Построчно читает файл импорта, не загружая его в память.
+
+    Возвращает номер строки в файле и словарь «колонка - значение».
+    Неподходящий файл (кодировка, повреждённая книга, нет колонок)
+    отклоняется ValueError до первой строки.
+    """
+    if path.suffix.lower() == '.xlsx':
+        yield from _iter_xlsx(path)
+        return
+    encoding = _csv_encoding(path)
+    with path.open(newline='', encoding=encoding) as file:
+        yield from _iter_csv(file)
+
+
+def _row_errors(values: Dict[str, Any]) -> list[str]:
+    """Ошибки в полях пользователя, прочитанного из файла."""
+    errors = [
+        f'не заполнено поле {name}'
+        for name in REQUIRED_COLUMNS if not values[name]
+    ]
+    errors.extend(
+        f'поле {name} длиннее {limit} символов'
+        for name, limit in MAX_LENGTHS.items() if len(values[name]) > limit
+    )
+    if values['email'] and not is_valid_email(values['email']):
+        errors.append('некорректный email')
+    if values['phone_number'] and not is_valid_phone_number(
+        values['phone_number'],
+    ):
+        errors.append('некорректный номер телефона')
+    if values['role'] not in UserRole.__members__:
+        errors.append(f'неизвестная роль {values["role"]}')
+    if values['timezone'] not in TIMEZONES:
+        errors.append(f'неизвестный часовой пояс {values["timezone"]}')
+    return errors
+
+
+def parse_row(row: Dict[str, str]) -> tuple[Dict[str, Any], list[str]]:
+    """Приводит строку файла к полям модели User и проверяет их.
+
+    Необязательные колонки заполняются так же, как в пошаговом
+    создании пользователя: «-» в отчестве и доп. информации - пусто.
+    """
+    patronymic = row.get('patronymic', '')
+    additional_info = row.get('additional_info', '')
+    tg_id = row.get('tg_id', '')
+    values = {
+        'first_name': row.get('first_name', ''),
+        'last_name': row.get('last_name', ''),
+        'patronymic': ' ' if patronymic in ('', '-') else patronymic,
+        'role': row.get('role', '').upper() or UserRole.USER,
+        'tg_id': tg_id,
+        'email': row.get('email', ''),
+        'phone_number': row.get('phone_number', ''),
+        'timezone': row.get('timezone', '') or MOSCOW_TIMEZONE,
+        'additional_info': (
+            None if additional_info in ('', '-') else additional_info
+        ),
+    }
+    errors = _row_errors(values)
+    if tg_id.isdigit():
+        values['tg_id'] = int(tg_id)
+    elif tg_id:
+        errors.append('tg_id должен быть числом')
+    return values, errors
+
+
+class UserImporter:
+    """Импорт пользователей пачками с построчным отчётом.
+
+    Прочитанные строки копятся до IMPORT_BATCH_SIZE и вставляются одним
+    запросом, а итог каждой строки сразу пишется в CSV-отчёт, поэтому
+    память не зависит от размера файла. При заданном expires_at
+    созданным пользователям пачкой выпускаются приглашения.
+    """
+
+    def __init__(
+        self,
+        report: TextIO,
+        session: AsyncSession,
+        expires_at: Optional[datetime] = None,
+    ) -> None:
+        """Создаёт импорт с отчётом в открытый текстовый файл."""
+        self.session = session
+        self.expires_at = expires_at
+        self.result = ImportResult()
+        self._writer = csv.writer(report)
+        self._writer.writerow(REPORT_COLUMNS)
+        self._batch: list[tuple[int, Dict[str, Any]]] = []
+
+    async def run(self, path: Path) -> ImportResult:
+        """Импортирует всех пользователей из файла.
+
+        Если файл оказался испорчен посередине, прочитанные до этого
+        строки всё равно импортируются и попадают в отчёт, а затем
+        поднимается ValueError; итоги остаются в self.result.
+        """
+        try:
+            for line, row in iter_rows(path):
+                values, errors = parse_row(row)
+                if errors:
+                    self.result.invalid += 1
+                    self._report(
+                        line, values, STATUS_INVALID, '; '.join(errors),
+                    )
+                    continue
+                self._batch.append((line, values))
+                if len(self._batch) >= settings.IMPORT_BATCH_SIZE:
+                    await self._flush()
+        except ValueError:
+            await self._flush()
+            raise
+        await self._flush()
+        return self.result
+
+    def _report(
+        self,
+        line: int,
+        values: Dict[str, Any],
+        status: str,
+        detail: str = '',
+    ) -> None:
+        """Записывает итог строки файла в отчёт."""
+        self._writer.writerow(
+            (line, values['tg_id'], values['email'], status, detail),
+        )
+
+    async def _flush(self) -> None:
+        """Вставляет накопленную пачку и пишет её итоги в отчёт."""
+        batch, self._batch = self._batch, []
+        unique = {}
+        for line, values in batch:
+            if values['tg_id'] in unique:
+                self.result.conflicts += 1
+                self._report(line, values, STATUS_CONFLICT, DUPLICATE_DETAIL)
+            else:
+                unique[values['tg_id']] = (line, values)
+        created = await user_crud.bulk_create(
+            [values for _, values in unique.values()],
+            self.session,
+        )
+        user_ids = {row.tg_id: row.id for row in created}
+        links = await self._issue_invites(list(user_ids.values()))
+        for tg_id, (line, values) in unique.items():
+            if tg_id not in user_ids:
+                self.result.conflicts += 1
+                self._report(line, values, STATUS_CONFLICT, CONFLICT_DETAIL)
+                continue
+            self.result.created += 1
+            self._report(
+                line,
+                values,
+                STATUS_CREATED,
+                links.get(user_ids[tg_id], ''),
+            )
+
+    async def _issue_invites(self, user_ids: list[int]) -> Dict[int, str]:
+        """Выпускает приглашения созданным пользователям пачки."""
+        if self.expires_at is None or not user_ids:
+            return {}
+        invites = await invite_crud.issue(
+            user_ids,
+            self.expires_at,
+            self.session,
+        )
+        self.result.invites += len(invites)
+        return {
+            invite.user_id: INVITE_URL.format(token=invite.link_token)
+            for invite in invites
+        }
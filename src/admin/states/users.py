@@ -31,3 +31,11 @@ class InvitationForm(StatesGroup):
     created_at = State()
     expires_at = State()
     link_token = State()
+    restaurant_expires_at = State()
+
+
+class ImportUsersForm(StatesGroup):
+    """FSM-состояния для импорта пользователей из файла."""
+
+    expires_at = State()
+    file = State()
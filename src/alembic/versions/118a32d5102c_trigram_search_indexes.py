@@ -0,0 +1,48 @@
+"""trigram search indexes
+
+Revision ID: 118a32d5102c
+Revises: 94da32efb9c4
+Create Date: 2026-10-18 15:21:40.127305
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '118a32d5102c'
+down_revision = '94da32efb9c4'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_COLUMNS = (
+    ('user', 'first_name'),
+    ('user', 'last_name'),
+    ('user', 'email'),
+    ('user', 'phone_number'),
+    ('restaurant', 'name'),
+    ('restaurant', 'short_address'),
+    ('templateroadmap', 'name'),
+)
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # индексы строим без блокировки записи в таблицы
+    with op.get_context().autocommit_block():
+        for table, column in TRIGRAM_COLUMNS:
+            op.create_index(
+                f'ix_{table}_{column}_trgm', table, [column], unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    # расширение pg_trgm оставляем: им могут пользоваться не только индексы
+    with op.get_context().autocommit_block():
+        for table, column in reversed(TRIGRAM_COLUMNS):
+            op.drop_index(
+                f'ix_{table}_{column}_trgm', table_name=table,
+                postgresql_concurrently=True,
+            )
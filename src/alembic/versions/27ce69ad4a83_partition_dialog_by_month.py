@@ -0,0 +1,144 @@
+"""partition dialog by month
+
+Revision ID: 27ce69ad4a83
+Revises: 118a32d5102c
+Create Date: 2026-10-18 18:02:17.553904
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '27ce69ad4a83'
+down_revision = '118a32d5102c'
+branch_labels = None
+depends_on = None
+
+# секции на месяцы вперёд; дальше их создаёт services/dialog_partitions.py
+PARTITIONS_AHEAD = 2
+
+
+def month_start(moment):
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def upgrade():
+    bind = op.get_bind()
+    first = bind.execute(
+        sa.text('SELECT MIN(message_datetime) FROM dialog'),
+    ).scalar()
+    current = month_start(datetime.now())
+    month = month_start(min(first, current) if first else current)
+
+    op.execute('CREATE SEQUENCE dialog_new_id_seq AS bigint')
+    op.execute(
+        """
+        CREATE TABLE dialog_new (
+            id BIGINT NOT NULL DEFAULT nextval('dialog_new_id_seq'),
+            message TEXT NOT NULL,
+            message_datetime TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            sender_id INTEGER,
+            recipient_id INTEGER,
+            CONSTRAINT dialog_new_pkey PRIMARY KEY (id, message_datetime),
+            CONSTRAINT dialog_sender_id_fkey FOREIGN KEY (sender_id)
+                REFERENCES "user" (id) ON DELETE SET NULL,
+            CONSTRAINT dialog_recipient_id_fkey FOREIGN KEY (recipient_id)
+                REFERENCES "user" (id) ON DELETE SET NULL
+        ) PARTITION BY RANGE (message_datetime)
+        """
+    )
+    while month <= add_months(current, PARTITIONS_AHEAD):
+        following = add_months(month, 1)
+        op.execute(
+            f'CREATE TABLE dialog_p{month:%Y%m} PARTITION OF dialog_new '
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') "
+            f"TO ('{following:%Y-%m-%d}')"
+        )
+        month = following
+    op.execute('CREATE TABLE dialog_default PARTITION OF dialog_new DEFAULT')
+
+    op.execute(
+        'INSERT INTO dialog_new '
+        '(id, message, message_datetime, sender_id, recipient_id) '
+        'SELECT id, message, message_datetime, sender_id, recipient_id '
+        'FROM dialog'
+    )
+    op.execute(
+        "SELECT setval('dialog_new_id_seq', "
+        'COALESCE((SELECT MAX(id) FROM dialog_new), 0) + 1, false)'
+    )
+    op.drop_table('dialog')
+
+    op.execute('ALTER TABLE dialog_new RENAME TO dialog')
+    op.execute(
+        'ALTER TABLE dialog RENAME CONSTRAINT dialog_new_pkey TO dialog_pkey'
+    )
+    op.execute('ALTER SEQUENCE dialog_new_id_seq RENAME TO dialog_id_seq')
+    op.execute("ALTER TABLE dialog ALTER COLUMN id "
+               "SET DEFAULT nextval('dialog_id_seq')")
+    op.execute('ALTER SEQUENCE dialog_id_seq OWNED BY dialog.id')
+    op.create_index(
+        'ix_dialog_sender_id_recipient_id_message_datetime_id',
+        'dialog',
+        ['sender_id', 'recipient_id', 'message_datetime', 'id'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.execute('ALTER TABLE dialog RENAME TO dialog_partitioned')
+    op.execute(
+        'ALTER TABLE dialog_partitioned '
+        'RENAME CONSTRAINT dialog_pkey TO dialog_partitioned_pkey'
+    )
+    op.execute('ALTER SEQUENCE dialog_id_seq '
+               'RENAME TO dialog_partitioned_id_seq')
+    op.create_table(
+        'dialog',
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('message_datetime', sa.DateTime(), nullable=False),
+        sa.Column('sender_id', sa.Integer(), nullable=True),
+        sa.Column('recipient_id', sa.Integer(), nullable=True),
+        sa.Column(
+            'id', sa.Integer(), sa.Identity(always=True), nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ['recipient_id'], ['user.id'], ondelete='SET NULL',
+        ),
+        sa.ForeignKeyConstraint(
+            ['sender_id'], ['user.id'], ondelete='SET NULL',
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute(
+        'INSERT INTO dialog '
+        '(id, message, message_datetime, sender_id, recipient_id) '
+        'OVERRIDING SYSTEM VALUE '
+        'SELECT id, message, message_datetime, sender_id, recipient_id '
+        'FROM dialog_partitioned'
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('dialog', 'id'), "
+        'COALESCE((SELECT MAX(id) FROM dialog), 0) + 1, false)'
+    )
+    op.drop_table('dialog_partitioned')
+    op.create_index(
+        'ix_dialog_sender_id_message_datetime',
+        'dialog',
+        ['sender_id', 'message_datetime'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_dialog_recipient_id_message_datetime',
+        'dialog',
+        ['recipient_id', 'message_datetime'],
+        unique=False,
+    )
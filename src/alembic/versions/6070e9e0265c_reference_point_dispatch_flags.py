@@ -0,0 +1,32 @@
+"""reference point dispatch flags
+
+Revision ID: 6070e9e0265c
+Revises: 5d934b3df226
+Create Date: 2026-10-18 10:12:41.301552
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6070e9e0265c'
+down_revision = '5d934b3df226'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('referencepoint', sa.Column('is_sent', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('referencepoint', sa.Column('is_overdue_notified', sa.Boolean(), server_default=sa.false(), nullable=False))
+    # уже выполненные точки повторно не отправляем
+    op.execute('UPDATE referencepoint SET is_sent = true WHERE is_completed')
+    op.create_index('ix_referencepoint_is_completed_trigger_datetime', 'referencepoint', ['is_completed', 'trigger_datetime'], unique=False)
+    op.create_index('ix_referencepoint_is_completed_check_datetime', 'referencepoint', ['is_completed', 'check_datetime'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_referencepoint_is_completed_check_datetime', table_name='referencepoint')
+    op.drop_index('ix_referencepoint_is_completed_trigger_datetime', table_name='referencepoint')
+    op.drop_column('referencepoint', 'is_overdue_notified')
+    op.drop_column('referencepoint', 'is_sent')
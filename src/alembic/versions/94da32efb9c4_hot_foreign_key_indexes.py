@@ -0,0 +1,65 @@
+"""hot foreign key indexes
+
+Revision ID: 94da32efb9c4
+Revises: 6070e9e0265c
+Create Date: 2026-10-18 14:05:12.418906
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '94da32efb9c4'
+down_revision = '6070e9e0265c'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_userroadmap_user_id_id', 'userroadmap', ['user_id', 'id']),
+    ('ix_userroadmap_roadmap_id', 'userroadmap', ['roadmap_id']),
+    (
+        'ix_referencepoint_roadmap_id_is_completed_order_execution',
+        'referencepoint',
+        ['roadmap_id', 'is_completed', 'order_execution'],
+    ),
+    ('ix_user_manager_id', 'user', ['manager_id']),
+    ('ix_question_test_id', 'question', ['test_id']),
+    (
+        'ix_dialog_sender_id_message_datetime',
+        'dialog',
+        ['sender_id', 'message_datetime'],
+    ),
+    (
+        'ix_dialog_recipient_id_message_datetime',
+        'dialog',
+        ['recipient_id', 'message_datetime'],
+    ),
+    (
+        'ix_templatereferencepoint_templateroadmap_id',
+        'templatereferencepoint',
+        ['templateroadmap_id'],
+    ),
+    (
+        'ix_templatequestion_templatetest_id',
+        'templatequestion',
+        ['templatetest_id'],
+    ),
+)
+
+
+def upgrade():
+    # индексы строим без блокировки записи в таблицы
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True,
+            )
@@ -0,0 +1,204 @@
+"""Скрипт проверки планов запросов CRUD на последовательное сканирование.
+
+Вызывает методы чтения из crud/, intern/utils.py и services/ на локальной
+БД внутри транзакции, которая затем откатывается. Для каждого запроса
+выполняет EXPLAIN и завершается с кодом 1, если план содержит Seq Scan
+по таблице, в которой больше --threshold строк. Чтобы проверка была
+осмысленной, БД нужно заполнить данными.
+
+    python check_query_plans.py --threshold 1000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any, Awaitable, Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud import (
+    invite_crud,
+    question_crud,
+    referencepoint_crud,
+    roadmap_crud,
+    template_notification_crud,
+    template_reference_point_crud,
+    user_crud,
+)
+from engine import engine
+from intern.utils import (
+    get_active_reference_point_for_user,
+    get_active_reference_points_for_user,
+)
+from services.progress import _load_intern_progress
+
+SAMPLE_ID = 1
+SAMPLE_TG_ID = 1
+EXPLAINED_PREFIXES = ('SELECT', 'WITH', 'UPDATE', 'DELETE')
+
+CHECKS: dict[str, Callable[[AsyncSession], Awaitable[Any]]] = {
+    'user_crud.get_user_by_tg_id': lambda session: (
+        user_crud.get_user_by_tg_id(session, SAMPLE_TG_ID)
+    ),
+    'user_crud.get_managers_interns': lambda session: (
+        user_crud.get_managers_interns(SAMPLE_ID, session)
+    ),
+    'user_crud.get_tgid_by_id': lambda session: (
+        user_crud.get_tgid_by_id(SAMPLE_ID, session)
+    ),
+    'user_crud.get_manager_id': lambda session: (
+        user_crud.get_manager_id(SAMPLE_TG_ID, session)
+    ),
+    'user_crud.get_manager': lambda session: (
+        user_crud.get_manager(SAMPLE_ID, session)
+    ),
+    'roadmap_crud.get_users_roadmap': lambda session: (
+        roadmap_crud.get_users_roadmap(SAMPLE_ID, session)
+    ),
+    'roadmap_crud.get_user_id_by_roadmap_id': lambda session: (
+        roadmap_crud.get_user_id_by_roadmap_id(SAMPLE_ID, session)
+    ),
+    'roadmap_crud.get_user_roadmap': lambda session: (
+        roadmap_crud.get_user_roadmap(SAMPLE_ID, session)
+    ),
+    'referencepoint_crud.get_current_user_point': lambda session: (
+        referencepoint_crud.get_current_user_point(SAMPLE_ID, session)
+    ),
+    'referencepoint_crud.get_reference_point_by_id': lambda session: (
+        referencepoint_crud.get_reference_point_by_id(SAMPLE_ID, session)
+    ),
+    'referencepoint_crud.claim_due_points': lambda session: (
+        referencepoint_crud.claim_due_points(1, session)
+    ),
+    'referencepoint_crud.claim_overdue_points': lambda session: (
+        referencepoint_crud.claim_overdue_points(1, session)
+    ),
+    'template_reference_point_crud.get_ref_point_id_by_name': (
+        lambda session: template_reference_point_crud.get_ref_point_id_by_name(
+            '', session,
+        )
+    ),
+    'template_notification_crud.get_by_referencepoint_id': lambda session: (
+        template_notification_crud.get_by_referencepoint_id(
+            SAMPLE_ID, session,
+        )
+    ),
+    'invite_crud.get_by_token': lambda session: (
+        invite_crud.get_by_token('', session)
+    ),
+    'question_crud.get_by_id': lambda session: (
+        question_crud.get_by_id(SAMPLE_ID, session)
+    ),
+    'get_active_reference_points_for_user': lambda session: (
+        get_active_reference_points_for_user(SAMPLE_ID, session)
+    ),
+    'get_active_reference_point_for_user': lambda session: (
+        get_active_reference_point_for_user(SAMPLE_ID, session)
+    ),
+    'services.progress.get_intern_progress': lambda session: (
+        _load_intern_progress(SAMPLE_ID, session)
+    ),
+}
+
+
+def iter_seq_scans(plan: dict[str, Any]) -> Iterator[str]:
+    """Возвращает имена таблиц, которые план читает через Seq Scan."""
+    if plan.get('Node Type') == 'Seq Scan':
+        yield plan['Relation Name']
+    for child in plan.get('Plans', ()):
+        yield from iter_seq_scans(child)
+
+
+def explain(cursor: Any, statement: str, parameters: Any) -> dict:
+    """Выполняет EXPLAIN запроса и возвращает корневой узел плана."""
+    cursor.execute(f'EXPLAIN (FORMAT JSON) {statement}', parameters)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']
+
+
+def table_rows(cursor: Any, table: str) -> int:
+    """Оценка количества строк в таблице по статистике Postgres."""
+    cursor.execute(
+        'SELECT reltuples::bigint FROM pg_class WHERE relname = $1',
+        (table,),
+    )
+    return max(cursor.fetchone()[0], 0)
+
+
+async def check_query_plans(threshold: int) -> list[str]:
+    """Прогоняет CHECKS и возвращает описания найденных проблем."""
+    problems = []
+    current = {'check': ''}
+
+    def on_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if executemany:
+            return
+        if not statement.lstrip().upper().startswith(EXPLAINED_PREFIXES):
+            return
+        explain_cursor = conn.connection.cursor()
+        try:
+            plan = explain(explain_cursor, statement, parameters)
+            for table in iter_seq_scans(plan):
+                rows = table_rows(explain_cursor, table)
+                if rows > threshold:
+                    problems.append(
+                        f'{current["check"]}: Seq Scan по {table} '
+                        f'({rows} строк)\n    {" ".join(statement.split())}',
+                    )
+        finally:
+            explain_cursor.close()
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        event.listen(
+            connection.sync_connection,
+            'before_cursor_execute',
+            on_execute,
+        )
+        # commit внутри CRUD фиксирует только точку сохранения
+        session = AsyncSession(
+            bind=connection,
+            join_transaction_mode='create_savepoint',
+            expire_on_commit=False,
+        )
+        try:
+            for name, check in CHECKS.items():
+                current['check'] = name
+                try:
+                    await check(session)
+                except Exception as e:
+                    problems.append(f'{name}: ошибка выполнения {str(e)}')
+                    await session.rollback()
+        finally:
+            await session.close()
+            await transaction.rollback()
+    await engine.dispose()
+    return problems
+
+
+def main() -> None:
+    """Точка входа проверки планов запросов."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threshold', type=int, default=1000)
+    args = parser.parse_args()
+    problems = asyncio.run(check_query_plans(args.threshold))
+    for problem in problems:
+        print(problem)
+    if problems:
+        sys.exit(1)
+    print(f'Проверено запросов CRUD: {len(CHECKS)}, Seq Scan не найден.')
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,2 @@
 from common.start_help_router import router as start_help_router  # noqa
+from common.inline_search import router as inline_search_router  # noqa
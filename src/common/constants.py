@@ -9,10 +9,12 @@ INVALID_ROLE_MESSAGE = 'Роль не определена!'
 ADMIN_HELP_TEXT = (
     'Доступные действия:\n\n'
     '— /create_user — создать пользователя\n'
+    '— /import_users — импортировать пользователей из CSV/XLSX\n'
     '— /edit_user — редактировать пользователя\n'
     '— /block_user — заблокировать пользователя\n\n'
     '— /assign_user — привязать пользователя к ресторану\n\n'
-    '— /gen_invite — сгенерировать приглашение\n\n'
+    '— /gen_invite — сгенерировать приглашение\n'
+    '— /restaurant_invites — приглашения всем стажёрам ресторана\n\n'
     '— /create_restaurant — создать ресторан\n'
     '— /edit_restaurant — редактировать ресторан\n'
     '— /block_restaurant — заблокировать ресторан\n\n'
@@ -20,6 +22,8 @@ ADMIN_HELP_TEXT = (
     '— /edit_roadmap_template — редактировать шаблон\n'
     '— /block_roadmap_template — заблокировать шаблон\n'
     '— /adapt_template_for_roadmap — привязать шаблон к ресторану\n\n'
+    'Для поиска пользователя, ресторана или шаблона наберите имя бота '
+    'через @ и запрос.\n\n'
     'Или просто нажмите одну из кнопок в меню ниже!.'
 )
 
@@ -31,3 +35,6 @@ INTERN_HELP_TEXT = (
     'прекращение прохождения дорожной карты\n'
     '• /status_roadmap – узнать статус дорожной карты\n'
 )
+
+SEARCH_OPEN = 'Открыть'
+SEARCH_RESULT_NOT_FOUND = 'Объект не найден или недоступен.'
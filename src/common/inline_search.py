@@ -0,0 +1,308 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from html import escape
+from typing import Any, Callable, Optional, Sequence
+
+from aiogram import Router
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    InlineQuery,
+    InlineQueryResultArticle,
+    InputTextMessageContent,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from crud import restaurant_crud, template_roadmap_crud, user_crud
+from crud.base import CRUDBase
+from manager.callbacks import (
+    ManagerInternCallback,
+    ManagerTemplateRoadmapCallback,
+)
+from models.constants import UserRole
+from models.models import Restaurant, TemplateRoadMap, User
+from services.sender import SendQueue
+from services.user_cache import CachedUser
+
+from .constants import SEARCH_OPEN, SEARCH_RESULT_NOT_FOUND
+
+router = Router(name='inline_search')
+
+
+class SearchCallback(CallbackData, prefix='search'):
+    """Класс обработки кнопки открытия результата поиска."""
+
+    kind: str
+    obj_id: int
+
+
+@dataclass(frozen=True, slots=True)
+class SearchScope:
+    """Что и по каким колонкам ищет пользователь с определённой ролью.
+
+    filters получает пользователя и ограничивает выдачу его объектами,
+    actions возвращает кнопки действий с найденным объектом.
+    """
+
+    kind: str
+    crud: CRUDBase
+    columns: Sequence[Any]
+    describe: Callable[[Any], tuple[str, str]]
+    actions: Callable[[Any], list[InlineKeyboardButton]]
+    filters: Callable[[CachedUser], Sequence[Any]] = lambda user: ()
+
+
+class QueryLRU:
+    """Последние ответы на inline-запросы пользователей.
+
+    Telegram присылает запрос почти на каждое нажатие клавиши, поэтому
+    повтор того же текста в течение SEARCH_CACHE_TTL секунд отдаётся
+    из памяти процесса без обращения к БД.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Инициализирует пустой кэш."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[float, list]] = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[list]:
+        """Возвращает сохранённые результаты или None."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: tuple, results: list) -> None:
+        """Сохраняет результаты, вытесняя самые старые записи."""
+        self._entries[key] = (time.monotonic() + self.ttl, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def _full_name(user: User) -> str:
+    """Фамилия и имя пользователя для выдачи поиска."""
+    return f'{user.last_name} {user.first_name}'
+
+
+def _callback_button(text: str, callback_data: str) -> InlineKeyboardButton:
+    """Кнопка с callback data."""
+    return InlineKeyboardButton(text=text, callback_data=callback_data)
+
+
+USERS = SearchScope(
+    kind='user',
+    crud=user_crud,
+    columns=(User.first_name, User.last_name, User.email, User.phone_number),
+    describe=lambda user: (
+        _full_name(user),
+        f'{user.role} | {user.email} | {user.phone_number}',
+    ),
+    actions=lambda user: [
+        _callback_button('Редактировать', f'edit_user_select:{user.tg_id}'),
+        _callback_button('Заблокировать', f'block_user_select:{user.tg_id}'),
+        _callback_button(
+            'Привязать к ресторану',
+            f'assign_user:{user.tg_id}',
+        ),
+    ],
+)
+RESTAURANTS = SearchScope(
+    kind='restaurant',
+    crud=restaurant_crud,
+    columns=(Restaurant.name, Restaurant.short_address),
+    describe=lambda restaurant: (
+        restaurant.name,
+        restaurant.short_address,
+    ),
+    actions=lambda restaurant: [
+        _callback_button(
+            'Редактировать',
+            f'edit_restaurant_select:{restaurant.id}',
+        ),
+        _callback_button(
+            'Заблокировать',
+            f'block_restaurant_select:{restaurant.id}',
+        ),
+    ],
+)
+TEMPLATES = SearchScope(
+    kind='template',
+    crud=template_roadmap_crud,
+    columns=(TemplateRoadMap.name,),
+    describe=lambda template: (
+        template.name,
+        'Шаблон дорожной карты',
+    ),
+    actions=lambda template: [
+        _callback_button(
+            'Редактировать',
+            f'edit_roadmap_template_select:{template.id}',
+        ),
+        _callback_button(
+            'Заблокировать',
+            f'block_roadmap_template_select:{template.id}',
+        ),
+        _callback_button(
+            'Привязать к ресторану',
+            f'adapt_roadmap_template_select:{template.id}',
+        ),
+    ],
+)
+INTERNS = SearchScope(
+    kind='intern',
+    crud=user_crud,
+    columns=(User.first_name, User.last_name, User.email, User.phone_number),
+    describe=lambda intern: (_full_name(intern), 'Стажёр'),
+    actions=lambda intern: [
+        _callback_button(
+            SEARCH_OPEN,
+            ManagerInternCallback(
+                action='manager_intern_actions',
+                intern_id=intern.id,
+            ).pack(),
+        ),
+    ],
+    filters=lambda user: (User.manager_id == user.id,),
+)
+RESTAURANT_TEMPLATES = SearchScope(
+    kind='restaurant_template',
+    crud=template_roadmap_crud,
+    columns=(TemplateRoadMap.name,),
+    describe=lambda template: (template.name, 'Шаблон дорожной карты'),
+    actions=lambda template: [
+        _callback_button(
+            SEARCH_OPEN,
+            ManagerTemplateRoadmapCallback(
+                templateroadmap_id=template.id,
+                action='select',
+            ).pack(),
+        ),
+    ],
+    filters=lambda user: (
+        TemplateRoadMap.restaurant_id == user.restaurant_id,
+    ),
+)
+
+# Области поиска повторяют права роутеров ролей в main.py.
+ROLE_SCOPES = {
+    UserRole.ADMIN: (USERS, RESTAURANTS, TEMPLATES),
+    UserRole.MANAGER: (INTERNS, RESTAURANT_TEMPLATES),
+}
+
+search_cache = QueryLRU(settings.SEARCH_CACHE_SIZE, settings.SEARCH_CACHE_TTL)
+
+
+def _scope(user: CachedUser, kind: str) -> SearchScope:
+    """Область поиска роли пользователя по её имени."""
+    for scope in ROLE_SCOPES.get(user.role, ()):
+        if scope.kind == kind:
+            return scope
+    raise PermissionError(f'Поиск {kind} недоступен роли {user.role}')
+
+
+async def _search(
+    query: str,
+    user: CachedUser,
+    session: AsyncSession,
+) -> list[InlineQueryResultArticle]:
+    """Ищет во всех областях роли и оставляет лучшие совпадения."""
+    found = []
+    for scope in ROLE_SCOPES.get(user.role, ()):
+        matches = await scope.crud.search(
+            session,
+            query,
+            scope.columns,
+            filters=scope.filters(user),
+        )
+        found.extend((score, scope, obj) for obj, score in matches)
+    found.sort(key=lambda item: item[0], reverse=True)
+    results = []
+    for _, scope, obj in found[:settings.SEARCH_RESULTS_LIMIT]:
+        title, description = scope.describe(obj)
+        results.append(
+            InlineQueryResultArticle(
+                id=f'{scope.kind}:{obj.id}',
+                title=title,
+                description=description,
+                input_message_content=InputTextMessageContent(
+                    message_text=title,
+                ),
+                reply_markup=InlineKeyboardMarkup(
+                    inline_keyboard=[[
+                        _callback_button(
+                            SEARCH_OPEN,
+                            SearchCallback(
+                                kind=scope.kind,
+                                obj_id=obj.id,
+                            ).pack(),
+                        ),
+                    ]],
+                ),
+            ),
+        )
+    return results
+
+
+@router.inline_query()
+async def inline_search(
+    inline_query: InlineQuery,
+    session: AsyncSession,
+    user: CachedUser,
+) -> None:
+    """Нечёткий поиск по пользователям, ресторанам и шаблонам."""
+    query = inline_query.query.strip()
+    if not query:
+        await inline_query.answer([], is_personal=True, cache_time=0)
+        return
+    key = (user.id, query.lower())
+    results = search_cache.get(key)
+    if results is None:
+        results = await _search(query, user, session)
+        search_cache.set(key, results)
+    await inline_query.answer(
+        results,
+        is_personal=True,
+        cache_time=settings.SEARCH_CACHE_TTL,
+    )
+
+
+@router.callback_query(SearchCallback.filter())
+async def open_search_result(
+    call: CallbackQuery,
+    callback_data: SearchCallback,
+    session: AsyncSession,
+    sender: SendQueue,
+    user: CachedUser,
+) -> None:
+    """Присылает найденный объект с кнопками действий.
+
+    Сообщение с результатом отправлено от имени пользователя, и его
+    нельзя редактировать, поэтому бот присылает новое сообщение.
+    """
+    scope = _scope(user, callback_data.kind)
+    objects = await scope.crud.get_multi_filtered(
+        session,
+        scope.crud.model.id == callback_data.obj_id,
+        *scope.filters(user),
+    )
+    if not objects:
+        await call.answer(SEARCH_RESULT_NOT_FOUND, show_alert=True)
+        return
+    obj = objects[0]
+    title, description = scope.describe(obj)
+    await sender.send_message(
+        call.from_user.id,
+        f'<b>{escape(title)}</b>\n{escape(description)}',
+        parse_mode='HTML',
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[[button] for button in scope.actions(obj)],
+        ),
+    )
+    await call.answer()
@@ -3,18 +3,14 @@ from datetime import datetime
 from aiogram import Router
 from aiogram.filters import Command, CommandObject, CommandStart
 from aiogram.types import Message
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from admin.keyboards import admin_keyboard
 from crud import invite_crud, user_crud
-from intern.handlers.notifications import handle_reference_point_type
 from intern.keyboards import intern_keyboard
-from intern.utils import get_active_reference_points_for_user
-from manager.handlers.interns import intern_missed_deadline
 from manager.handlers.manager_menu import manager_menu
 from models.constants import UserRole
-from models.models import User
+from services.user_cache import CachedUser
 
 from .constants import (
     ADMIN_HELP_TEXT,
@@ -36,7 +32,7 @@ async def cmd_start(
     message: Message,
     session: AsyncSession,
     command: CommandObject,
-    user: User,
+    user: CachedUser,
 ) -> Message:
     """Обрабатывает старт.
 
@@ -46,7 +42,7 @@ async def cmd_start(
     """
     args = command.args
     if args:
-        invit = await invite_crud.get(obj_id=args, session=session)
+        invit = await invite_crud.get_by_token(args, session)
         if invit and not invit.is_used and invit.expires_at > datetime.now():
             invited_user = await user_crud.get(invit.user_id, session)
             await user_crud.update(
@@ -77,50 +73,6 @@ async def cmd_start(
             await message.answer(MANAGER_WELCOME_MESSAGE)
             return await manager_menu(message)
         case UserRole.USER:
-            intern = await user_crud.get_user_by_tg_id(
-                session,
-                message.chat.id,
-            )
-            reference_points = await get_active_reference_points_for_user(
-                intern.id,
-                session,
-            )
-            if not reference_points:
-                return await message.answer(
-                    INTERN_WELCOME_MESSAGE,
-                    reply_markup=intern_keyboard,
-                )
-            scheduler = AsyncIOScheduler(timezone=intern.timezone)
-            for reference_point in reference_points:
-                scheduler.add_job(
-                    handle_reference_point_type,
-                    'date',
-                    run_date=reference_point.trigger_datetime,
-                    kwargs={
-                        'bot': message.bot,
-                        'reference_point': reference_point,
-                        'user': intern,
-                        'scheduler': scheduler,
-                    },
-                )
-                if reference_point.check_datetime:
-                    scheduler.add_job(
-                        intern_missed_deadline,
-                        'date',
-                        run_date=reference_point.check_datetime,
-                        kwargs={
-                            'bot': message.bot,
-                            'manager_tg_id': await user_crud.get_tgid_by_id(
-                                intern.manager_id,
-                                session,
-                            ),
-                            'reference_point_name': reference_point.name,
-                            'name': intern.first_name,
-                            'surname': intern.last_name,
-                        },
-                        id=str(reference_point.id),
-                    )
-            scheduler.start()
             return await message.answer(
                 INTERN_WELCOME_MESSAGE,
                 reply_markup=intern_keyboard,
@@ -132,7 +84,7 @@ async def cmd_start(
 @router.message(Command('help'))
 async def cmd_help(
     message: Message,
-    user: User,
+    user: CachedUser,
 ) -> Message:
     """Показывает доступные команды и меню."""
     if not user.is_active:
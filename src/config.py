@@ -14,6 +14,14 @@ class Settings(BaseSettings):
     WELCOME_MESSAGE: str = 'Привет! Я - твой помощник для онбординга.'
 
     TOKEN: str
+    TELEGRAM_API_URL: str = ''
+    BOT_MODE: str = 'polling'
+    WEBHOOK_BASE_URL: str = ''
+    WEBHOOK_PATH: str = '/webhook'
+    WEBHOOK_SECRET: str = ''
+    WEBHOOK_HOST: str = '0.0.0.0'
+    WEBHOOK_PORT: int = 8080
+    WEBHOOK_WORKERS: int = 1
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_NAME: str
@@ -22,6 +30,48 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: str
     REDIS_PASSWORD: str
+    DB_PROFILE: str = 'development'
+    DB_ECHO: bool = False
+    DB_DEBUG_QUERIES: bool = False
+    HANDLER_BUDGET_MS: int = 500
+    METRICS_HOST: str = '127.0.0.1'
+    METRICS_PORT: int = 9100
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    SCHEDULER_REDIS_DB: int = 1
+    SCHEDULER_TIMEZONE: str = 'Europe/Moscow'
+    DISPATCHER_INTERVAL_SECONDS: int = 30
+    DISPATCHER_BATCH_SIZE: int = 100
+    DISPATCHER_CONCURRENCY: int = 10
+    SEND_GLOBAL_RATE: float = 30
+    SEND_CHAT_RATE: float = 1
+    SEND_WORKERS: int = 8
+    SEND_MAX_RETRIES: int = 3
+    USER_CACHE_TTL: int = 300
+    USER_CACHE_LOCAL_TTL: int = 30
+    PROGRESS_CACHE_TTL: int = 300
+    CRUD_CACHE_TTL: int = 3600
+    PICKER_PAGE_SIZE: int = 10
+    SEARCH_RESULTS_LIMIT: int = 20
+    SEARCH_CACHE_SIZE: int = 1024
+    SEARCH_CACHE_TTL: int = 10
+    IMPORT_BATCH_SIZE: int = 500
+    DIALOG_PAGE_SIZE: int = 10
+    DIALOG_PARTITIONS_AHEAD: int = 2
+    DIALOG_RETENTION_MONTHS: int = 12
+    DIALOG_MAINTENANCE_HOURS: int = 24
+    DIALOG_BATCH_SIZE: int = 100
+    DIALOG_FLUSH_MS: int = 500
+    DIALOG_WRITE_RETRIES: int = 10
+    DIALOG_RETRY_MAX_MS: int = 30_000
+    TEST_ANSWERS_SWEEP_SECONDS: int = 60
+    TEST_ANSWERS_FLUSH_BATCH: int = 500
+    TEST_ANSWERS_CLAIM_SECONDS: int = 60
+    RENDER_CACHE_SIZE: int = 1024
     LOG_FORMAT: str = '%(asctime)s | %(levelname)s | %(message)s'
     DATETIME_FORMAT: str = '%Y-%m-%d  %H-%M-%S'
 
@@ -42,6 +92,42 @@ class Settings(BaseSettings):
             f'{self.POSTGRES_NAME}'
         )
 
+    @property
+    def webhook_url(self) -> str:
+        """Полный адрес вебхука, который регистрируется в Telegram."""
+        return f'{self.WEBHOOK_BASE_URL.rstrip("/")}{self.WEBHOOK_PATH}'
+
+    @property
+    def bot_processes(self) -> int:
+        """Количество процессов, обрабатывающих обновления бота."""
+        if self.BOT_MODE == 'webhook':
+            return self.WEBHOOK_WORKERS
+        return 1
+
+    @property
+    def database_engine_options(self) -> dict:
+        """Параметры движка БД для текущего профиля.
+
+        В профиле production asyncpg кэширует подготовленные запросы,
+        в development кэш выключен, чтобы не ловить ошибки устаревших
+        планов после миграций.
+        """
+        statement_cache_size = (
+            self.DB_STATEMENT_CACHE_SIZE
+            if self.DB_PROFILE == 'production' else 0
+        )
+        return {
+            'echo': self.DB_ECHO,
+            'pool_size': self.DB_POOL_SIZE,
+            'max_overflow': self.DB_MAX_OVERFLOW,
+            'pool_timeout': self.DB_POOL_TIMEOUT,
+            'pool_recycle': self.DB_POOL_RECYCLE,
+            'pool_pre_ping': self.DB_POOL_PRE_PING,
+            'connect_args': {
+                'prepared_statement_cache_size': statement_cache_size,
+            },
+        }
+
     @property
     def redis_url(self) -> str:
         """Настройка redis для dev и prod режимов."""
@@ -1,38 +1,66 @@
+from dataclasses import dataclass
 from typing import Any, Dict, Generic, Never, Optional, Sequence, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from config import settings
 from models.base import BaseModel
 from models.models import User
 
 T = TypeVar('T', bound=BaseModel)
+# Экранирование спецсимволов шаблона LIKE в тексте поиска.
+LIKE_ESCAPE = str.maketrans({'\\': '\\\\', '%': '\\%', '_': '\\_'})
+
+
+@dataclass(frozen=True, slots=True)
+class Page:
+    """Страница объектов модели, отсортированных по id."""
+
+    items: list
+    has_prev: bool
+    has_next: bool
 
 
 class CRUDBase:
-    """Базовый класс методов CRUD."""
+    """Базовый класс методов CRUD.
+
+    load_plans - именованные наборы опций загрузки связей модели.
+    Экран запрашивает план по имени и получает ровно те связи, которые
+    читают его генераторы текста и клавиатуры.
+    """
+
+    load_plans: Dict[str, Sequence[Any]] = {}
 
     def __init__(self, model: Generic[T]) -> None:
         """Инициализирует переменные класса CRUDBase."""
         self.model = model
 
+    def plan_options(self, plan: str) -> Sequence[Any]:
+        """Возвращает опции загрузки плана по его имени."""
+        if plan not in self.load_plans:
+            raise ValueError(
+                f'{self.model.__name__}: нет плана загрузки {plan!r}',
+            )
+        return self.load_plans[plan]
+
     async def get(
         self,
         obj_id: int,
         session: AsyncSession,
         *,
-        load_relations: bool = False,
+        plan: Optional[str] = None,
         relations_to_upload: Optional[list] = None,
     ) -> Optional[T] | None:
         """Метод возвращает объект модели для чтения.
 
-        load_relations = True загружает связанные объекты.
+        plan - имя плана загрузки связей из load_plans.
         """
         operation = select(self.model).where(self.model.id == obj_id)
 
-        if load_relations:
-            operation = operation.options(selectinload('*'))
+        if plan is not None:
+            operation = operation.options(*self.plan_options(plan))
 
         if relations_to_upload:
             for relation in relations_to_upload:
@@ -77,6 +105,74 @@ class CRUDBase:
             .all(),
         )
 
+    async def get_page(
+        self,
+        session: AsyncSession,
+        *,
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+        limit: int = settings.PICKER_PAGE_SIZE,
+        filters: Sequence[Any] = (),
+        options: Sequence[Any] = (),
+    ) -> Page:
+        """Метод возвращает страницу объектов модели по ключу id.
+
+        Следующая страница начинается после after_id, предыдущая
+        заканчивается перед before_id. Читается на одну запись больше
+        limit, чтобы узнать, есть ли страница дальше.
+        """
+        stmt = select(self.model).where(*filters).options(*options)
+        if before_id is not None:
+            stmt = stmt.where(self.model.id < before_id).order_by(
+                self.model.id.desc(),
+            )
+        else:
+            if after_id is not None:
+                stmt = stmt.where(self.model.id > after_id)
+            stmt = stmt.order_by(self.model.id)
+        items = list(
+            (await session.execute(stmt.limit(limit + 1))).scalars().all(),
+        )
+        has_more = len(items) > limit
+        items = items[:limit]
+        if before_id is not None:
+            items.reverse()
+            return Page(items, has_prev=has_more, has_next=True)
+        return Page(items, has_prev=after_id is not None, has_next=has_more)
+
+    async def search(
+        self,
+        session: AsyncSession,
+        text: str,
+        columns: Sequence[Any],
+        *,
+        limit: int = settings.SEARCH_RESULTS_LIMIT,
+        filters: Sequence[Any] = (),
+    ) -> list[tuple[T, float]]:
+        """Метод ищет объекты модели по похожести текста в колонках.
+
+        Колонка подходит, если похожа на text по триграммам pg_trgm
+        или содержит его. Оба условия используют GIN-индексы колонок.
+        Возвращает пары (объект, сходство) по убыванию сходства.
+        """
+        pattern = f'%{text.translate(LIKE_ESCAPE)}%'
+        score = func.greatest(
+            *(func.similarity(column, text) for column in columns),
+        )
+        stmt = (
+            select(self.model, score)
+            .where(
+                or_(
+                    *(column.op('%')(text) for column in columns),
+                    *(column.ilike(pattern) for column in columns),
+                ),
+                *filters,
+            )
+            .order_by(score.desc(), self.model.id)
+            .limit(limit)
+        )
+        return [tuple(row) for row in await session.execute(stmt)]
+
     async def create(
         self,
         obj_in: Dict[str, Any],
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+from redis.exceptions import RedisError
+from sqlalchemy import Date, DateTime, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from config import settings
+from crud.base import T
+from models.models import User
+from services.cache import redis_client
+from services.metrics import CRUD_CACHE_REQUESTS
+
+# Версия формата записей: при смене набора колонок старые ключи
+# перестают читаться без ручной очистки Redis.
+CACHE_FORMAT_VERSION = 1
+GENERATION_KEY = 'crud_cache:{table}:generation'
+ROWS_KEY = 'crud_cache:v{version}:{table}:{generation}:{query}'
+
+
+def _encode(value: Any) -> str:
+    """Сериализует даты, которые не умеет json."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'Тип {type(value)} не поддерживается кэшем')
+
+
+class CachedCRUDMixin:
+    """Кэш чтения для CRUD редко меняющихся моделей.
+
+    get, get_multi и get_multi_filtered без подгрузки связей читают
+    строки из Redis, а при промахе - из БД с сохранением в Redis.
+    Ключи содержат поколение модели, которое create, update и delete
+    увеличивают после commit, поэтому устаревшие записи не читаются,
+    а доживают свой CRUD_CACHE_TTL. Изменения модели в обход CRUD
+    должны вызывать invalidate_cache.
+
+    Объекты из кэша присоединяются к сессии без запроса к БД. Связи у
+    них не загружены, поэтому кэшировать можно только модели без
+    связей с lazy='selectin'.
+    """
+
+    def __init__(self, model: type[T]) -> None:
+        """Проверяет модель и готовит список кэшируемых колонок."""
+        super().__init__(model)
+        eager = [
+            relation.key
+            for relation in model.__mapper__.relationships
+            if relation.lazy != 'select'
+        ]
+        if eager:
+            raise ValueError(
+                f'{model.__name__}: связи {eager} загружаются сразу, '
+                'модель нельзя кэшировать',
+            )
+        self._table = model.__tablename__
+        self._columns = [attr.key for attr in model.__mapper__.column_attrs]
+        self._date_columns = {
+            attr.key: (
+                datetime if isinstance(attr.columns[0].type, DateTime)
+                else date
+            )
+            for attr in model.__mapper__.column_attrs
+            if isinstance(attr.columns[0].type, (Date, DateTime))
+        }
+        self._cache_hits = CRUD_CACHE_REQUESTS.labels(self._table, 'hit')
+        self._cache_misses = CRUD_CACHE_REQUESTS.labels(self._table, 'miss')
+        self._cache_errors = CRUD_CACHE_REQUESTS.labels(self._table, 'error')
+
+    async def get(
+        self,
+        obj_id: int,
+        session: AsyncSession,
+        *,
+        plan: Optional[str] = None,
+        relations_to_upload: Optional[list] = None,
+    ) -> Optional[T]:
+        """Возвращает объект из кэша, если не нужно подгружать связи."""
+        if plan is not None or relations_to_upload:
+            return await super().get(
+                obj_id,
+                session,
+                plan=plan,
+                relations_to_upload=relations_to_upload,
+            )
+        objects = await self._read_through(
+            f'get:{obj_id}',
+            session,
+            lambda: self._fetch(session, self.model.id == obj_id),
+        )
+        return objects[0] if objects else None
+
+    async def get_multi(
+        self,
+        session: AsyncSession,
+        *,
+        options: list[Any] = None,
+    ) -> Sequence[T]:
+        """Возвращает все объекты из кэша, если не заданы options."""
+        if options is not None:
+            return await super().get_multi(session, options=options)
+        return await self._read_through(
+            'multi',
+            session,
+            lambda: self._fetch(session),
+        )
+
+    async def get_multi_filtered(
+        self,
+        session: AsyncSession,
+        *filters: Any,
+    ) -> list[T]:
+        """Возвращает объекты с фильтрами из кэша."""
+        compiled = select(self.model).where(*filters).compile()
+        digest = hashlib.sha1(
+            (
+                str(compiled)
+                + json.dumps(compiled.params, default=str, sort_keys=True)
+            ).encode(),
+        ).hexdigest()
+        return await self._read_through(
+            f'filtered:{digest}',
+            session,
+            lambda: self._fetch(session, *filters),
+        )
+
+    async def create(
+        self,
+        obj_in: Dict[str, Any],
+        session: AsyncSession,
+        user: Optional[User] = None,
+    ) -> T:
+        """Создаёт объект и сбрасывает кэш модели."""
+        db_obj = await super().create(obj_in, session, user)
+        await self.invalidate_cache()
+        return db_obj
+
+    async def update(
+        self,
+        db_obj: T,
+        obj_in: Dict[str, Any],
+        session: AsyncSession,
+    ) -> T:
+        """Обновляет объект и сбрасывает кэш модели."""
+        db_obj = await super().update(db_obj, obj_in, session)
+        await self.invalidate_cache()
+        return db_obj
+
+    async def delete(self, db_obj: T, session: AsyncSession) -> T:
+        """Удаляет объект и сбрасывает кэш модели."""
+        db_obj = await super().delete(db_obj, session)
+        await self.invalidate_cache()
+        return db_obj
+
+    async def invalidate_cache(self) -> None:
+        """Переводит модель на новое поколение ключей кэша."""
+        try:
+            await redis_client.incr(GENERATION_KEY.format(table=self._table))
+        except RedisError as e:
+            logging.warning(f'Кэш CRUD недоступен: {str(e)}')
+
+    async def _fetch(self, session: AsyncSession, *filters: Any) -> list[T]:
+        """Читает объекты модели из БД."""
+        return list(
+            (
+                await session.execute(select(self.model).where(*filters))
+            ).scalars().all(),
+        )
+
+    async def _read_through(
+        self,
+        query: str,
+        session: AsyncSession,
+        load: Callable[[], Awaitable[list[T]]],
+    ) -> list[T]:
+        """Отдаёт объекты из Redis или загружает их и сохраняет."""
+        try:
+            generation = await redis_client.get(
+                GENERATION_KEY.format(table=self._table),
+            )
+            key = ROWS_KEY.format(
+                version=CACHE_FORMAT_VERSION,
+                table=self._table,
+                generation=int(generation or 0),
+                query=query,
+            )
+            raw = await redis_client.get(key)
+        except RedisError as e:
+            logging.warning(f'Кэш CRUD недоступен: {str(e)}')
+            self._cache_errors.inc()
+            return await load()
+
+        if raw is not None:
+            self._cache_hits.inc()
+            return [
+                await self._restore(values, session)
+                for values in json.loads(raw)
+            ]
+
+        self._cache_misses.inc()
+        objects = await load()
+        rows = [
+            [getattr(obj, column) for column in self._columns]
+            for obj in objects
+        ]
+        try:
+            await redis_client.set(
+                key,
+                json.dumps(rows, default=_encode, separators=(',', ':')),
+                ex=settings.CRUD_CACHE_TTL,
+            )
+        except RedisError as e:
+            logging.warning(f'Кэш CRUD недоступен: {str(e)}')
+        return objects
+
+    async def _restore(self, values: list, session: AsyncSession) -> T:
+        """Присоединяет объект из кэша к сессии без запроса к БД."""
+        data = dict(zip(self._columns, values))
+        for column, kind in self._date_columns.items():
+            if data[column] is not None:
+                data[column] = kind.fromisoformat(data[column])
+        obj = self.model(**data)
+        make_transient_to_detached(obj)
+        return await session.merge(obj, load=False)
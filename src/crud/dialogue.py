@@ -1,9 +1,92 @@
-from crud.base import CRUDBase
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Select, insert, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from config import settings
+from crud.base import CRUDBase, Page
 from models.models import Dialog
 
 
 class DialogueCRUD(CRUDBase):
     """CRUD модели dialog."""
 
+    @staticmethod
+    def _direction(
+        sender_id: int,
+        recipient_id: int,
+        before: Optional[tuple[datetime, int]],
+        limit: int,
+    ) -> Select:
+        """Последние сообщения одного направления переписки.
+
+        Запрос идёт по индексу (sender_id, recipient_id,
+        message_datetime, id) в обратном порядке и читает не больше
+        limit строк.
+        """
+        stmt = select(Dialog).where(
+            Dialog.sender_id == sender_id,
+            Dialog.recipient_id == recipient_id,
+        )
+        if before is not None:
+            stmt = stmt.where(
+                tuple_(Dialog.message_datetime, Dialog.id) < tuple_(*before),
+            )
+        return stmt.order_by(
+            Dialog.message_datetime.desc(),
+            Dialog.id.desc(),
+        ).limit(limit)
+
+    async def get_conversation_page(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        peer_id: int,
+        *,
+        before: Optional[tuple[datetime, int]] = None,
+        limit: int = settings.DIALOG_PAGE_SIZE,
+    ) -> Page:
+        """Страница переписки двух пользователей, листаемая назад.
+
+        before - ключ (message_datetime, id) самого старого сообщения
+        уже показанной страницы; без него возвращаются последние
+        сообщения. Оба направления читаются по индексу и сливаются,
+        поэтому стоимость не зависит от длины истории.
+        """
+        merged = union_all(
+            self._direction(user_id, peer_id, before, limit + 1),
+            self._direction(peer_id, user_id, before, limit + 1),
+        ).subquery()
+        message = aliased(Dialog, merged)
+        items = list(
+            (
+                await session.execute(
+                    select(message)
+                    .order_by(
+                        merged.c.message_datetime.desc(),
+                        merged.c.id.desc(),
+                    )
+                    .limit(limit + 1),
+                )
+            ).scalars().all(),
+        )
+        has_more = len(items) > limit
+        items = items[:limit]
+        items.reverse()
+        return Page(items, has_prev=has_more, has_next=before is not None)
+
+    async def bulk_create(
+        self,
+        rows: Sequence[dict[str, Any]],
+        session: AsyncSession,
+    ) -> None:
+        """Вставляет пачку сообщений одним INSERT."""
+        if not rows:
+            return
+        await session.execute(insert(self.model).values(list(rows)))
+        await session.commit()
+
 
 dialog_crud = DialogueCRUD(Dialog)
@@ -1,10 +1,18 @@
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Sequence
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from crud.base import CRUDBase
-from models.models import InvitationLink
+from models.constants import ATTEMPS_COUNT, UserRole
+from models.models import (
+    GET_UNIQUE_TOKEN_ERROR,
+    InvitationLink,
+    User,
+    generate_link_token,
+)
 
 
 class InvitationCRUD(CRUDBase):
@@ -23,5 +31,73 @@ class InvitationCRUD(CRUDBase):
         )
         return db_invitation.scalars().first()
 
+    async def issue(
+        self,
+        user_ids: Sequence[int],
+        expires_at: datetime,
+        session: AsyncSession,
+    ) -> list[InvitationLink]:
+        """Создаёт приглашения пользователям в одной транзакции.
+
+        Все приглашения вставляются одним INSERT ... ON CONFLICT DO
+        NOTHING без проверочных SELECT. Строки, токен которых совпал
+        с существующим, вставляются повторно с новыми токенами.
+        """
+        pending = list(dict.fromkeys(user_ids))
+        issued = []
+        for _ in range(ATTEMPS_COUNT):
+            if not pending:
+                break
+            created = (
+                await session.scalars(
+                    insert(InvitationLink)
+                    .values([
+                        {
+                            'user_id': user_id,
+                            'link_token': generate_link_token(),
+                            'expires_at': expires_at,
+                            'is_used': False,
+                        }
+                        for user_id in pending
+                    ])
+                    .on_conflict_do_nothing(
+                        index_elements=[InvitationLink.link_token],
+                    )
+                    .returning(InvitationLink),
+                )
+            ).all()
+            issued.extend(created)
+            created_ids = {invitation.user_id for invitation in created}
+            pending = [
+                user_id for user_id in pending if user_id not in created_ids
+            ]
+        if pending:
+            await session.rollback()
+            raise ValueError(GET_UNIQUE_TOKEN_ERROR)
+        await session.commit()
+        return issued
+
+    async def issue_for_restaurant(
+        self,
+        restaurant_id: int,
+        expires_at: datetime,
+        session: AsyncSession,
+    ) -> list[InvitationLink]:
+        """Создаёт приглашения всем активным стажёрам ресторана."""
+        user_ids = (
+            await session.scalars(
+                select(User.id)
+                .where(
+                    User.restaurant_id == restaurant_id,
+                    User.role == UserRole.USER,
+                    User.is_active,
+                )
+                .order_by(User.id),
+            )
+        ).all()
+        if not user_ids:
+            return []
+        return await self.issue(user_ids, expires_at, session)
+
 
 invite_crud = InvitationCRUD(InvitationLink)
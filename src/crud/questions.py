@@ -1,3 +1,4 @@
+from sqlalchemy import Integer, Row, column, func, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from crud.base import CRUDBase
@@ -25,5 +26,48 @@ class QuestionCRUD(CRUDBase):
         await session.refresh(question)
         return question
 
+    async def bulk_update_answers(
+        self,
+        test_id: int,
+        answers: dict[int, int],
+        session: AsyncSession,
+    ) -> None:
+        """Записывает ответы попытки теста одним UPDATE.
+
+        answers - номер ответа по id вопроса. Вопросы других тестов
+        не обновляются.
+        """
+        if not answers:
+            return
+        rows = values(
+            column('id', Integer),
+            column('answer', Integer),
+            name='answers',
+        ).data(list(answers.items()))
+        await session.execute(
+            update(Question)
+            .where(Question.id == rows.c.id, Question.test_id == test_id)
+            .values(user_answer=rows.c.answer)
+            .execution_options(synchronize_session=False),
+        )
+        await session.commit()
+
+    async def get_test_score(
+        self,
+        test_id: int,
+        session: AsyncSession,
+    ) -> Row:
+        """Число вопросов теста и верных ответов одним запросом."""
+        return (
+            await session.execute(
+                select(
+                    func.count().label('total'),
+                    func.count()
+                    .filter(Question.user_answer == Question.correct_answer)
+                    .label('correct'),
+                ).where(Question.test_id == test_id),
+            )
+        ).one()
+
 
 question_crud = QuestionCRUD(Question)
@@ -1,14 +1,30 @@
-from sqlalchemy import select
+from datetime import datetime, timedelta
+from typing import Any, Sequence
+
+from sqlalchemy import Row, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, raiseload, selectinload
 
 from crud.base import CRUDBase
-from models.models import ReferencePoint, RoadMap, Test, UserRoadMap
+from models.models import ReferencePoint, RoadMap, Test, User, UserRoadMap
+
+# Максимальное смещение часового пояса от UTC. Сроки точек хранятся
+# в локальном времени стажёра, поэтому индексный диапазон берём с запасом,
+# а точное сравнение делаем с учётом часового пояса пользователя.
+MAX_UTC_OFFSET = timedelta(hours=14)
 
 
 class ReferencePointCRUD(CRUDBase):
     """CRUD модели referencepoint."""
 
+    load_plans = {
+        # Редактор читает колонки точки и текст её уведомления.
+        'editor': (
+            selectinload(ReferencePoint.notification),
+            raiseload('*', sql_only=True),
+        ),
+    }
+
     async def get_current_user_point(
         self, intern_id: int, session: AsyncSession,
     ) -> list[RoadMap]:
@@ -42,6 +58,151 @@ class ReferencePointCRUD(CRUDBase):
             )
         ).scalars().one()
 
+    async def claim_due_points(
+        self,
+        limit: int,
+        session: AsyncSession,
+    ) -> list[Row[tuple[ReferencePoint, User]]]:
+        """Забирает на отправку пачку наступивших контрольных точек.
+
+        Точки помечаются отправленными одним UPDATE, строки блокируются
+        с SKIP LOCKED, поэтому несколько процессов не заберут одну точку.
+        Возвращает пары (контрольная точка, стажёр).
+        """
+        due_ids = (
+            select(self.model.id)
+            .join(
+                UserRoadMap,
+                UserRoadMap.roadmap_id == self.model.roadmap_id,
+            )
+            .join(User, User.id == UserRoadMap.user_id)
+            .where(
+                self.model.is_completed.is_(False),
+                self.model.trigger_datetime
+                <= datetime.utcnow() + MAX_UTC_OFFSET,
+                self.model.is_sent.is_(False),
+                self.model.is_blocked.is_(False),
+                User.is_active.is_(True),
+                func.timezone(User.timezone, self.model.trigger_datetime)
+                <= func.now(),
+            )
+            .order_by(self.model.trigger_datetime)
+            .limit(limit)
+            .with_for_update(of=self.model, skip_locked=True)
+        )
+        claimed_ids = await self._claim(
+            due_ids,
+            {'is_sent': True},
+            session,
+        )
+        if not claimed_ids:
+            return []
+        return list(
+            (
+                await session.execute(
+                    select(self.model, User)
+                    .join(
+                        UserRoadMap,
+                        UserRoadMap.roadmap_id == self.model.roadmap_id,
+                    )
+                    .join(User, User.id == UserRoadMap.user_id)
+                    .where(self.model.id.in_(claimed_ids))
+                    .order_by(self.model.trigger_datetime),
+                )
+            ).all(),
+        )
+
+    async def claim_overdue_points(
+        self,
+        limit: int,
+        session: AsyncSession,
+    ) -> list[Row[tuple[int, str, str, str, int]]]:
+        """Забирает пачку просроченных точек для уведомления менеджера.
+
+        Возвращает строки (id точки, название точки, имя и фамилия
+        стажёра, tg_id менеджера).
+        """
+        manager = aliased(User)
+        overdue_ids = (
+            select(self.model.id)
+            .join(
+                UserRoadMap,
+                UserRoadMap.roadmap_id == self.model.roadmap_id,
+            )
+            .join(User, User.id == UserRoadMap.user_id)
+            .where(
+                self.model.is_completed.is_(False),
+                self.model.check_datetime
+                <= datetime.utcnow() + MAX_UTC_OFFSET,
+                self.model.is_overdue_notified.is_(False),
+                User.manager_id.is_not(None),
+                func.timezone(User.timezone, self.model.check_datetime)
+                <= func.now(),
+            )
+            .order_by(self.model.check_datetime)
+            .limit(limit)
+            .with_for_update(of=self.model, skip_locked=True)
+        )
+        claimed_ids = await self._claim(
+            overdue_ids,
+            {'is_overdue_notified': True},
+            session,
+        )
+        if not claimed_ids:
+            return []
+        return list(
+            (
+                await session.execute(
+                    select(
+                        self.model.id,
+                        self.model.name,
+                        User.first_name,
+                        User.last_name,
+                        manager.tg_id,
+                    )
+                    .join(
+                        UserRoadMap,
+                        UserRoadMap.roadmap_id == self.model.roadmap_id,
+                    )
+                    .join(User, User.id == UserRoadMap.user_id)
+                    .join(manager, manager.id == User.manager_id)
+                    .where(self.model.id.in_(claimed_ids)),
+                )
+            ).all(),
+        )
+
+    async def release_points(
+        self,
+        point_ids: Sequence[int],
+        values: dict[str, Any],
+        session: AsyncSession,
+    ) -> None:
+        """Возвращает точки в очередь после неудачной отправки."""
+        await session.execute(
+            update(self.model)
+            .where(self.model.id.in_(point_ids))
+            .values(**values),
+        )
+        await session.commit()
+
+    async def _claim(
+        self,
+        ids_query: Any,
+        values: dict[str, Any],
+        session: AsyncSession,
+    ) -> list[int]:
+        """Помечает выбранные точки и возвращает их id."""
+        claimed_ids = (
+            await session.execute(
+                update(self.model)
+                .where(self.model.id.in_(ids_query.scalar_subquery()))
+                .values(**values)
+                .returning(self.model.id),
+            )
+        ).scalars().all()
+        await session.commit()
+        return list(claimed_ids)
+
 
 referencepoint_crud = ReferencePointCRUD(ReferencePoint)
 
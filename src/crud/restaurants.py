@@ -1,4 +1,10 @@
 from crud.base import CRUDBase
+from crud.cached import CachedCRUDMixin
 from models.models import Restaurant
 
-restaurant_crud = CRUDBase(Restaurant)
+
+class RestaurantCRUD(CachedCRUDMixin, CRUDBase):
+    """CRUD модели Restaurant с кэшем чтения."""
+
+
+restaurant_crud = RestaurantCRUD(Restaurant)
@@ -1,15 +1,46 @@
-from sqlalchemy import select
+from typing import Any
+
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
 
 from crud.base import CRUDBase
 from crud.users import user_crud
-from models.models import RoadMap, User, UserRoadMap
+from models.models import (
+    FeedbackRequest,
+    Notification,
+    Question,
+    ReferencePoint,
+    RoadMap,
+    TemplateReferencePoint,
+    TemplateRoadMap,
+    TemplateTest,
+    Test,
+    User,
+    UserRoadMap,
+)
+from services.progress import invalidate_intern_progress
 
 
 class RoadmapCRUD(CRUDBase):
     """CRUD модели roadmap."""
 
+    load_plans = {
+        # Только колонки: без каскада точек с их уведомлениями и тестами.
+        'columns': (raiseload('*', sql_only=True),),
+        # Редактор показывает количество точек и пишет стажёру карты.
+        'editor': (
+            selectinload(RoadMap.reference_points).options(
+                load_only(ReferencePoint.id),
+                raiseload('*', sql_only=True),
+            ),
+            selectinload(RoadMap.user_associations).options(
+                raiseload('*', sql_only=True),
+            ),
+            raiseload('*', sql_only=True),
+        ),
+    }
+
     async def get_users_roadmap(
         self,
         intern_id: int,
@@ -65,12 +96,168 @@ class RoadmapCRUD(CRUDBase):
     ) -> RoadMap | None:
         """Возвращает дорожную карту стажера."""
         result = await session.execute(
-            select(UserRoadMap)
+            select(RoadMap)
+            .join(UserRoadMap, UserRoadMap.roadmap_id == RoadMap.id)
             .where(UserRoadMap.user_id == intern_id)
-            .options(joinedload(UserRoadMap.roadmap)),
+            .options(*self.plan_options('editor'))
+            .limit(1),
         )
-        user_roadmap = result.scalars().first()
-        return user_roadmap.roadmap if user_roadmap else None
+        return result.scalars().first()
+
+    async def materialize_from_template(
+        self,
+        template_id: int,
+        intern_id: int,
+        schedule: dict[int, dict[str, Any]],
+        session: AsyncSession,
+    ) -> int:
+        """Создаёт дорожную карту стажёра из шаблона.
+
+        schedule сопоставляет id шаблонной точки со сроками точки
+        (trigger_datetime, check_datetime, reminder_days_before),
+        в карту попадают только точки из schedule в его порядке.
+        Шаблон со всеми точками и их содержимым читается одним запросом,
+        записи создаются пакетными insert, поэтому число обращений к БД
+        не зависит от длины карты. Возвращает id новой дорожной карты.
+        """
+        template = (
+            await session.execute(
+                select(TemplateRoadMap)
+                .where(TemplateRoadMap.id == template_id)
+                .options(
+                    joinedload(
+                        TemplateRoadMap.reference_points,
+                    ).joinedload(TemplateReferencePoint.notification),
+                    joinedload(
+                        TemplateRoadMap.reference_points,
+                    ).joinedload(TemplateReferencePoint.feedback_request),
+                    joinedload(TemplateRoadMap.reference_points)
+                    .joinedload(TemplateReferencePoint.test)
+                    .joinedload(TemplateTest.questions),
+                ),
+            )
+        ).unique().scalar_one()
+        template_points = {
+            point.id: point for point in template.reference_points
+        }
+        points = [
+            template_points[point_id]
+            for point_id in schedule
+            if point_id in template_points
+        ]
+
+        roadmap_id = (
+            await session.execute(
+                insert(RoadMap)
+                .values(
+                    name=template.name,
+                    description=template.description,
+                    is_active=True,
+                )
+                .returning(RoadMap.id),
+            )
+        ).scalar_one()
+        await session.execute(
+            insert(UserRoadMap).values(
+                user_id=intern_id,
+                roadmap_id=roadmap_id,
+            ),
+        )
+        if points:
+            await self._materialize_points(
+                roadmap_id,
+                points,
+                schedule,
+                session,
+            )
+        await session.commit()
+        await invalidate_intern_progress(intern_id)
+        return roadmap_id
+
+    async def _materialize_points(
+        self,
+        roadmap_id: int,
+        points: list[TemplateReferencePoint],
+        schedule: dict[int, dict[str, Any]],
+        session: AsyncSession,
+    ) -> None:
+        """Пакетно создаёт точки карты и их уведомления и тесты."""
+        point_ids = (
+            await session.execute(
+                insert(ReferencePoint).returning(
+                    ReferencePoint.id,
+                    sort_by_parameter_order=True,
+                ),
+                [
+                    {
+                        'name': point.name,
+                        'point_type': point.point_type,
+                        'order_execution': point.order_execution,
+                        'roadmap_id': roadmap_id,
+                        **schedule[point.id],
+                    }
+                    for point in points
+                ],
+            )
+        ).scalars().all()
+        created = list(zip(point_ids, points))
+
+        notifications = [
+            {
+                'text': point.notification.text,
+                'need_feedback': point.notification.need_feedback,
+                'feedbacks': point.notification.feedbacks or [],
+                'links': point.notification.links or [],
+                'servise_notes': point.notification.servise_notes or [],
+                'referencepoint_id': point_id,
+            }
+            for point_id, point in created
+            if point.notification
+        ]
+        if notifications:
+            await session.execute(insert(Notification), notifications)
+
+        feedback_requests = [
+            {
+                'text': point.feedback_request.text,
+                'reference_point_id': point_id,
+            }
+            for point_id, point in created
+            if point.feedback_request
+        ]
+        if feedback_requests:
+            await session.execute(insert(FeedbackRequest), feedback_requests)
+
+        with_tests = [
+            (point_id, point) for point_id, point in created if point.test
+        ]
+        if not with_tests:
+            return
+        test_ids = (
+            await session.execute(
+                insert(Test).returning(Test.id, sort_by_parameter_order=True),
+                [
+                    {
+                        'name': point.test.name,
+                        'time_respond': point.test.time_respond,
+                        'referencepoint_id': point_id,
+                    }
+                    for point_id, point in with_tests
+                ],
+            )
+        ).scalars().all()
+        questions = [
+            {
+                'text_question': question.text_question,
+                'correct_answer': question.correct_answer,
+                'answers': question.answers,
+                'test_id': test_id,
+            }
+            for test_id, (_, point) in zip(test_ids, with_tests)
+            for question in point.test.questions
+        ]
+        if questions:
+            await session.execute(insert(Question), questions)
 
 
 roadmap_crud = RoadmapCRUD(RoadMap)
@@ -1,6 +1,7 @@
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
 
 from crud.base import CRUDBase
 from models.models import TemplateReferencePoint
@@ -9,6 +10,14 @@ from models.models import TemplateReferencePoint
 class CRUDTemplateRefferencePoint(CRUDBase):
     """Расширение базового CRUD для модели шаблона КТ."""
 
+    load_plans = {
+        # Редактор читает колонки точки и текст её уведомления.
+        'editor': (
+            selectinload(TemplateReferencePoint.notification),
+            raiseload('*', sql_only=True),
+        ),
+    }
+
     async def get_ref_point_id_by_name(
         self,
         ref_point_name: str,
@@ -1,4 +1,23 @@
+from sqlalchemy.orm import load_only, raiseload, selectinload
+
 from crud.base import CRUDBase
-from models.models import TemplateRoadMap
+from crud.cached import CachedCRUDMixin
+from models.models import TemplateReferencePoint, TemplateRoadMap
+
+
+class TemplateRoadMapCRUD(CachedCRUDMixin, CRUDBase):
+    """CRUD модели TemplateRoadMap с кэшем чтения."""
+
+    load_plans = {
+        # Редактор показывает только количество контрольных точек.
+        'editor': (
+            selectinload(TemplateRoadMap.reference_points).options(
+                load_only(TemplateReferencePoint.id),
+                raiseload('*', sql_only=True),
+            ),
+            raiseload('*', sql_only=True),
+        ),
+    }
+
 
-template_roadmap_crud = CRUDBase(TemplateRoadMap)
+template_roadmap_crud = TemplateRoadMapCRUD(TemplateRoadMap)
@@ -1,15 +1,37 @@
-from typing import Optional
+from typing import Any, Dict, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from crud.base import CRUDBase
 from models.models import User
+from services.user_cache import user_cache
 
 
 class UserCRUD(CRUDBase):
     """CRUD модели user."""
 
+    async def update(
+        self,
+        db_obj: User,
+        obj_in: Dict[str, Any],
+        session: AsyncSession,
+    ) -> User:
+        """Обновляет пользователя и сбрасывает его запись в кэше."""
+        old_tg_id = db_obj.tg_id
+        user = await super().update(db_obj, obj_in, session)
+        await user_cache.invalidate(old_tg_id, user.tg_id)
+        return user
+
+    async def delete(self, db_obj: User, session: AsyncSession) -> User:
+        """Удаляет пользователя и его запись в кэше."""
+        tg_id = db_obj.tg_id
+        user = await super().delete(db_obj, session)
+        await user_cache.invalidate(tg_id)
+        return user
+
     async def get_user_by_tg_id(
         self,
         session: AsyncSession,
@@ -53,6 +75,7 @@ class UserCRUD(CRUDBase):
         session.add(intern)
         await session.commit()
         await session.refresh(intern)
+        await user_cache.invalidate(intern.tg_id)
         return intern
 
     async def ban_user(
@@ -66,6 +89,7 @@ class UserCRUD(CRUDBase):
         session.add(intern)
         await session.commit()
         await session.refresh(intern)
+        await user_cache.invalidate(intern.tg_id)
         return intern
 
     async def get_manager_id(
@@ -73,17 +97,51 @@ class UserCRUD(CRUDBase):
             user_tg_id: int,
             session: AsyncSession) -> int | None:
         """Получить Telegram ID менеджера по Telegram ID стажёра."""
+        manager = aliased(self.model)
         result = await session.execute(
-            select(self.model.manager_id)
+            select(manager.tg_id)
+            .join(self.model, self.model.manager_id == manager.id)
             .where(self.model.tg_id == user_tg_id),
         )
-        manager_id = result.scalar_one_or_none()
-        if manager_id is None:
-            return None
+        return result.scalar_one_or_none()
+
+    async def get_manager(
+        self,
+        user_id: int,
+        session: AsyncSession,
+    ) -> Optional[Row]:
+        """Получить id и Telegram ID менеджера стажёра одним запросом."""
+        manager = aliased(self.model)
         result = await session.execute(
-            select(self.model.tg_id).where(self.model.id == manager_id),
+            select(manager.id, manager.tg_id)
+            .join(self.model, self.model.manager_id == manager.id)
+            .where(self.model.id == user_id),
         )
-        return result.scalar_one_or_none()
+        return result.one_or_none()
+
+    async def bulk_create(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        session: AsyncSession,
+    ) -> list[Row]:
+        """Вставляет пачку пользователей одним INSERT ... ON CONFLICT.
+
+        Строки, конфликтующие с существующими пользователями по tg_id,
+        email или телефону, пропускаются. Возвращает id и tg_id
+        созданных пользователей: остальные строки пачки - конфликты.
+        """
+        if not rows:
+            return []
+        created = (
+            await session.execute(
+                insert(self.model)
+                .values(list(rows))
+                .on_conflict_do_nothing()
+                .returning(self.model.id, self.model.tg_id),
+            )
+        ).all()
+        await session.commit()
+        return created
 
 
 user_crud = UserCRUD(User)
@@ -1,10 +1,32 @@
+"""Загрузка фикстур из data/ в БД.
+
+Файлы читаются потоково и вставляются через COPY пачками по
+--chunk-size строк, поэтому объём данных ограничен только диском.
+Таблицы грузятся параллельно, как только загружены таблицы, на
+которые они ссылаются.
+
+id строки - её номер в файле плюс максимальный id таблицы перед
+первой загрузкой, как если бы строки вставлялись по одной. Смещения
+сохраняются в data/.load_progress.json: после сбоя повторный запуск
+досчитывает таблицы с места остановки, а после успешной загрузки
+файл удаляется.
+"""
+
+import argparse
 import asyncio
 import json
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Type, TypeVar
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from sqlalchemy import DateTime, Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
 
 from config import BASE_DIR
-from engine import session_maker
+from crud import restaurant_crud, template_roadmap_crud
+from engine import engine
 from models.models import (
     Dialog,
     FeedbackRequest,
@@ -24,94 +46,336 @@ from models.models import (
     User,
     UserRoadMap,
 )
+from services.dialog_partitions import create_partitions
 
 DATA_DIR = BASE_DIR / 'data'
-Model = TypeVar('Model')
+PROGRESS_FILENAME = '.load_progress.json'
+CHUNK_SIZE = 5000
+LOAD_CONCURRENCY = 4
+# Сколько символов файла читается за раз при разборе JSON.
+READ_SIZE = 1 << 16
+
+FILE_MODELS = {
+    'restaurants': Restaurant,
+    'users': User,
+
+    'templateroadmap': TemplateRoadMap,
+    'templatetests': TemplateTest,
+    'templatereferencepoints': TemplateReferencePoint,
+    'templatequestions': TemplateQuestion,
+    'templatenotifications': TemplateNotification,
+    'templatefeedbackrequests': TemplateFeedbackRequest,
+
+    'roadmaps': RoadMap,
+    'userroadmaps': UserRoadMap,
+    'referencepoints': ReferencePoint,
+    'tests': Test,
+    'feedbackrequests': FeedbackRequest,
+    'notifications': Notification,
+    'questions': Question,
+
+    'invitationlinks': InvitationLink,
+    'dialogs': Dialog,
+}
+
+_SEPARATORS = re.compile(r'[\s,]*')
+
+
+def iter_json_array(
+    path: Path,
+    read_size: int = READ_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """Построчно разбирает JSON-массив объектов, не читая файл целиком.
+
+    В памяти держится только непрочитанный хвост буфера: объект,
+    разрезанный границей чтения, дочитывается следующим куском.
+    """
+    decoder = json.JSONDecoder()
+    with path.open(encoding='utf-8') as file:
+        buffer = file.read(read_size)
+        pos = _SEPARATORS.match(buffer).end()
+        if not buffer.startswith('[', pos):
+            raise ValueError(f'{path.name}: ожидался JSON-массив')
+        pos += 1
+        while True:
+            pos = _SEPARATORS.match(buffer, pos).end()
+            if buffer.startswith(']', pos):
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                chunk = file.read(read_size)
+                if not chunk:
+                    raise
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield item
+
+
+def chunked(items: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    """Разбивает поток на списки не длиннее size."""
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+class LoadProgress:
+    """Смещения id и готовые таблицы, сохранённые между запусками."""
+
+    def __init__(self, path: Path) -> None:
+        """Читает прогресс прошлого запуска, если он был."""
+        self.path = path
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            self.tables = json.loads(path.read_text(encoding='utf-8'))
+
+    def save(self) -> None:
+        """Атомарно перезаписывает файл прогресса."""
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.tables, indent=4), encoding='utf-8')
+        tmp.replace(self.path)
+
+    def clear(self) -> None:
+        """Удаляет файл прогресса после полной загрузки."""
+        self.path.unlink(missing_ok=True)
+
+
+class TableCopy:
+    """Преобразование объектов из JSON в записи COPY для таблицы.
+
+    COPY не знает про значения по умолчанию из моделей, поэтому
+    пропущенные в файле поля заполняются ими здесь.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        base: int,
+        defaults: Dict[str, Callable[[], Any]],
+    ) -> None:
+        """Готовит порядок колонок и значения по умолчанию."""
+        self.table = table
+        self.base = base
+        self.defaults = defaults
+        self.columns = [column.name for column in table.columns]
+        self.datetime_columns = {
+            column.name for column in table.columns
+            if isinstance(column.type, DateTime)
+        }
+
+    def record(self, position: int, item: Dict[str, Any]) -> tuple:
+        """Запись для строки файла с порядковым номером position."""
+        unknown = item.keys() - set(self.columns)
+        if unknown:
+            raise ValueError(
+                f'{self.table.name}: неизвестные поля {sorted(unknown)}',
+            )
+        values = []
+        for name in self.columns:
+            if name == 'id':
+                value = self.base + position
+            elif name in item:
+                value = item[name]
+            elif name in self.defaults:
+                value = self.defaults[name]()
+            else:
+                value = None
+            if name in self.datetime_columns and isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            values.append(value)
+        return tuple(values)
+
+
+async def column_defaults(
+    conn: AsyncConnection,
+    table: Table,
+) -> Dict[str, Callable[[], Any]]:
+    """Значения по умолчанию колонок таблицы в виде функций.
+
+    SQL-выражения вроде now() вычисляются один раз на таблицу.
+    """
+    defaults = {}
+    for column in table.columns:
+        default = column.default
+        if default is None or column.primary_key:
+            continue
+        if default.is_callable:
+            defaults[column.name] = lambda arg=default.arg: arg(None)
+        elif default.is_clause_element:
+            value = await conn.scalar(select(default.arg))
+            defaults[column.name] = lambda value=value: value
+        else:
+            defaults[column.name] = lambda value=default.arg: value
+    return defaults
+
+
+async def advance_identity(
+    conn: AsyncConnection,
+    table: Table,
+    last_id: int,
+) -> None:
+    """Сдвигает счётчик id таблицы за строки, вставленные с явным id."""
+    if not last_id:
+        return
+    await conn.execute(
+        text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :id)"),
+        {
+            'table': conn.dialect.identifier_preparer.quote(table.name),
+            'id': last_id,
+        },
+    )
+    await conn.commit()
 
 
 class DataLoader:
-    """Класс для загрузки данных в базу данных с соблюдением принципов DRY."""
+    """Потоковая загрузка фикстур с COPY и продолжением после сбоя."""
 
-    @staticmethod
-    def load_json(filepath: str) -> List[Dict[str, Any]]:
-        """Загружает данные из JSON файла."""
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def __init__(
+        self,
+        data_dir: Path = DATA_DIR,
+        chunk_size: int = CHUNK_SIZE,
+        concurrency: int = LOAD_CONCURRENCY,
+    ) -> None:
+        """Настраивает каталог фикстур, размер пачки и параллельность."""
+        self.data_dir = data_dir
+        self.chunk_size = chunk_size
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.progress = LoadProgress(data_dir / PROGRESS_FILENAME)
 
     @staticmethod
-    def parse_datetime_fields(
-        data: Dict[str, Any],
-        datetime_fields: List[str],
-    ) -> Dict[str, Any]:
-        """Парсит указанные поля в datetime объекты."""
-        for field in datetime_fields:
-            if field in data and data[field]:
-                data[field] = datetime.strptime(data[field], "%Y-%m-%d")
-        return data
-
-    @classmethod
-    async def _bulk_insert(
-        cls,
-        session: Any,
-        model: Type[Model],
-        data: List[Dict[str, Any]],
-        datetime_fields: List[str] = None,
-    ) -> None:
-        """Вспомогательный метод для массовой вставки данных."""
-        if datetime_fields:
-            data = [
-                cls.parse_datetime_fields(
-                    item, datetime_fields) for item in data
-                ]
-
-        session.add_all([model(**item) for item in data])
-        await session.flush()
-
-    @classmethod
-    async def load_all_data(cls) -> None:
-        """Загружает все данные из JSON файлов в базу данных."""
-        file_mappings = {
-            'restaurants': Restaurant,
-            'users': User,
-
-            'templateroadmap': TemplateRoadMap,
-            'templatetests': TemplateTest,
-            'templatereferencepoints': TemplateReferencePoint,
-            'templatequestions': TemplateQuestion,
-            'templatenotifications': TemplateNotification,
-            'templatefeedbackrequests': TemplateFeedbackRequest,
-
-            'roadmaps': RoadMap,
-            'userroadmaps': UserRoadMap,
-            'referencepoints': (
-                ReferencePoint,
-                ['trigger_datetime', 'check_datetime', 'completion_datetime'],
-            ),
-            'tests': Test,
-            'feedbackrequests': FeedbackRequest,
-            'notifications': Notification,
-            'questions': Question,
-
-            'invitationlinks': (InvitationLink, ['expires_at', 'created_at']),
-            'dialogs': (Dialog, ['message_datetime']),
+    def dependencies(tables: List[Table]) -> Dict[Table, set]:
+        """Таблицы из списка, на которые ссылается каждая таблица.
+
+        Ссылки таблицы на саму себя не учитываются: такие строки
+        должны идти в файле после строк, на которые ссылаются.
+        """
+        return {
+            table: {
+                fk.column.table for fk in table.foreign_keys
+                if fk.column.table in tables and fk.column.table is not table
+            }
+            for table in tables
+        }
+
+    async def load_all_data(self) -> None:
+        """Загружает все файлы, соблюдая зависимости между таблицами."""
+        files = {
+            model.__table__: self.data_dir / f'{filename}.json'
+            for filename, model in FILE_MODELS.items()
         }
+        await self.prepare_dialog_partitions(files[Dialog.__table__])
+        loaded = {table: asyncio.Event() for table in files}
+        dependencies = self.dependencies(list(files))
+
+        async def load(table: Table) -> None:
+            for dependency in dependencies[table]:
+                await loaded[dependency].wait()
+            async with self.semaphore:
+                await self.load_table(table, files[table])
+            loaded[table].set()
+
+        async with asyncio.TaskGroup() as group:
+            for table in files:
+                group.create_task(load(table))
+        self.progress.clear()
+
+    async def prepare_dialog_partitions(self, path: Path) -> None:
+        """Создаёт месячные секции dialog под даты сообщений файла.
 
-        async with session_maker() as session:
-            async with session.begin():
-                for filename, model_info in file_mappings.items():
-                    if isinstance(model_info, tuple):
-                        model, datetime_fields = model_info
-                    else:
-                        model, datetime_fields = model_info, None
-                    data = cls.load_json(f'{DATA_DIR}/{filename}.json')
-                    await cls._bulk_insert(
-                        session, model, data, datetime_fields)
+        Без них переписка прошлых месяцев осела бы в секции по
+        умолчанию. Файл просматривается один раз до загрузки.
+        """
+        if self.progress.tables.get(Dialog.__tablename__, {}).get('done'):
+            return
+        first = last = None
+        for row in iter_json_array(path):
+            if not row.get('message_datetime'):
+                continue
+            moment = datetime.fromisoformat(row['message_datetime'])
+            first = moment if first is None else min(first, moment)
+            last = moment if last is None else max(last, moment)
+        if first is None:
+            return
+        async with engine.begin() as conn:
+            await create_partitions(conn, first, last)
+
+    async def _start(self, conn: AsyncConnection, table: Table) -> int:
+        """Смещение id таблицы: сохранённое или текущий максимум."""
+        state = self.progress.tables.get(table.name)
+        if state is None:
+            base = await conn.scalar(
+                select(func.coalesce(func.max(table.c.id), 0)),
+            )
+            state = self.progress.tables[table.name] = {
+                'base': base,
+                'done': False,
+            }
+            self.progress.save()
+        return state['base']
+
+    async def load_table(self, table: Table, path: Path) -> None:
+        """Загружает файл в таблицу пачками через COPY.
+
+        Каждая пачка - отдельная команда COPY вне транзакции, поэтому
+        после сбоя в таблице остаётся ровно несколько первых строк
+        файла, и их число видно по максимальному id.
+        """
+        if self.progress.tables.get(table.name, {}).get('done'):
+            return
+        async with engine.connect() as conn:
+            base = await self._start(conn, table)
+            last_id = await conn.scalar(
+                select(func.coalesce(func.max(table.c.id), base))
+                .where(table.c.id > base),
+            )
+            copier = TableCopy(
+                table,
+                base,
+                await column_defaults(conn, table),
+            )
+            await conn.commit()
+            driver = (await conn.get_raw_connection()).driver_connection
+            rows = enumerate(iter_json_array(path), start=1)
+            for chunk in chunked(islice(rows, last_id - base, None),
+                                 self.chunk_size):
+                await driver.copy_records_to_table(
+                    table.name,
+                    records=[copier.record(*row) for row in chunk],
+                    columns=copier.columns,
+                )
+                last_id = base + chunk[-1][0]
+            await self._finish(conn, table, last_id)
+
+    async def _finish(
+        self,
+        conn: AsyncConnection,
+        table: Table,
+        last_id: int,
+    ) -> None:
+        """Сдвигает счётчик id за загруженные строки и отмечает таблицу."""
+        await advance_identity(conn, table, last_id)
+        self.progress.tables[table.name]['done'] = True
+        self.progress.save()
 
 
-async def main() -> None:
+async def main(
+    data_dir: Path = DATA_DIR,
+    chunk_size: int = CHUNK_SIZE,
+    concurrency: int = LOAD_CONCURRENCY,
+) -> None:
     """Точка входа для загрузки данных."""
-    await DataLoader.load_all_data()
+    await DataLoader(data_dir, chunk_size, concurrency).load_all_data()
+    # строки вставлены в обход CRUD, кэш справочников нужно сбросить
+    await restaurant_crud.invalidate_cache()
+    await template_roadmap_crud.invalidate_cache()
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--concurrency', type=int, default=LOAD_CONCURRENCY)
+    args = parser.parse_args()
+    asyncio.run(main(args.data_dir, args.chunk_size, args.concurrency))
@@ -1,13 +1,62 @@
+import time
+from typing import Any
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
 
 from config import settings
 from models import BaseModel
+from services.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_HOLD_SECONDS,
+    DB_POOL_WAIT_SECONDS,
+)
+
+
+class MeteredPool(AsyncAdaptedQueuePool):
+    """Пул соединений, считающий время ожидания свободного соединения."""
+
+    def connect(self) -> PoolProxiedConnection:
+        """Выдаёт соединение из пула и учитывает время ожидания."""
+        started = time.perf_counter()
+        connection = super().connect()
+        DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
+        return connection
+
+
+engine = create_async_engine(
+    settings.database_url,
+    poolclass=MeteredPool,
+    **settings.database_engine_options,
+)
+
+
+@event.listens_for(engine.sync_engine, 'checkout')
+def _on_checkout(
+    dbapi_connection: Any,
+    connection_record: Any,
+    connection_proxy: Any,
+) -> None:
+    """Запоминает момент выдачи соединения из пула."""
+    connection_record.info['checked_out_at'] = time.perf_counter()
+    DB_POOL_CHECKED_OUT.inc()
+
+
+@event.listens_for(engine.sync_engine, 'checkin')
+def _on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+    """Учитывает, сколько соединение было занято."""
+    checked_out_at = connection_record.info.pop('checked_out_at', None)
+    if checked_out_at is None:
+        return
+    DB_POOL_CHECKED_OUT.dec()
+    DB_POOL_HOLD_SECONDS.observe(time.perf_counter() - checked_out_at)
+
 
-engine = create_async_engine(settings.database_url, echo=True)
 session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -0,0 +1,108 @@
+"""Локальная заглушка Telegram Bot API для прогона бота без Telegram.
+
+Бот подключается к ней через TELEGRAM_API_URL. Заглушка отвечает
+на вызовы методов API и запоминает их, а обновления, присланные
+на /updates, пересылает на зарегистрированный ботом вебхук.
+
+    python fake_telegram.py --port 8081
+"""
+
+import argparse
+import itertools
+import json
+import time
+from typing import Any
+
+from aiohttp import ClientSession, web
+
+FAKE_BOT = {
+    'id': 1,
+    'is_bot': True,
+    'first_name': 'fake',
+    'username': 'fake_bot',
+}
+
+_message_ids = itertools.count(1)
+_update_ids = itertools.count(1)
+
+
+def _fake_message(params: dict[str, Any]) -> dict[str, Any]:
+    """Формирует ответ на отправку или изменение сообщения."""
+    return {
+        'message_id': int(params.get('message_id') or next(_message_ids)),
+        'date': int(time.time()),
+        'chat': {'id': int(params.get('chat_id', 0)), 'type': 'private'},
+        'from': FAKE_BOT,
+        'text': params.get('text', ''),
+    }
+
+
+async def handle_method(request: web.Request) -> web.Response:
+    """Отвечает на вызов метода Bot API и запоминает его."""
+    method = request.match_info['method']
+    params = dict(await request.post())
+    request.app['calls'].append({'method': method, 'params': params})
+    if method == 'setWebhook':
+        request.app['webhook'].update(params)
+    match method:
+        case 'getMe':
+            result = FAKE_BOT
+        case 'sendMessage' | 'editMessageText':
+            result = _fake_message(params)
+        case _:
+            result = True
+    return web.json_response({'ok': True, 'result': result})
+
+
+async def handle_updates(request: web.Request) -> web.Response:
+    """Пересылает обновление или список обновлений на вебхук бота."""
+    webhook = request.app['webhook']
+    if not webhook:
+        return web.json_response(
+            {'ok': False, 'description': 'Вебхук не зарегистрирован'},
+            status=409,
+        )
+    updates = await request.json()
+    if isinstance(updates, dict):
+        updates = [updates]
+    headers = {}
+    if webhook.get('secret_token'):
+        headers['X-Telegram-Bot-Api-Secret-Token'] = webhook['secret_token']
+    statuses = []
+    async with ClientSession() as client:
+        for update in updates:
+            update.setdefault('update_id', next(_update_ids))
+            async with client.post(
+                webhook['url'],
+                data=json.dumps(update),
+                headers={'Content-Type': 'application/json', **headers},
+            ) as response:
+                statuses.append(response.status)
+    return web.json_response({'ok': True, 'statuses': statuses})
+
+
+async def handle_calls(request: web.Request) -> web.Response:
+    """Возвращает или очищает записанные вызовы Bot API."""
+    if request.method == 'DELETE':
+        request.app['calls'].clear()
+    return web.json_response(request.app['calls'])
+
+
+def build_app() -> web.Application:
+    """Создаёт приложение заглушки."""
+    app = web.Application()
+    app['calls'] = []
+    app['webhook'] = {}
+    app.router.add_post('/bot{token}/{method}', handle_method)
+    app.router.add_post('/updates', handle_updates)
+    app.router.add_get('/calls', handle_calls)
+    app.router.add_delete('/calls', handle_calls)
+    return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    args = parser.parse_args()
+    web.run_app(build_app(), host=args.host, port=args.port)
@@ -0,0 +1,538 @@
+"""Генератор синтетического набора данных для нагрузочных замеров.
+
+Строит рестораны с шаблонами дорожных карт, менеджеров и стажёров
+с их дорожными картами, тестами, приглашениями и историей диалогов.
+Результат детерминирован для заданного --seed. Набор пишется либо в
+JSON-файлы для data_script.py, либо сразу в БД через COPY (--copy).
+
+id строк не записываются: ссылки считаются от 1 в порядке строк,
+поэтому набор загружается в пустую схему (администратора из
+create_admin.py создайте после загрузки):
+
+    python generate_data.py --scale 10 --out data/generated
+    python data_script.py --data-dir data/generated
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass, fields
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from data_script import (
+    CHUNK_SIZE,
+    DATA_DIR,
+    FILE_MODELS,
+    TableCopy,
+    advance_identity,
+    column_defaults,
+)
+from engine import engine
+from models import BaseModel
+from models.constants import (
+    ACCEPTABLE_SYMBOLS,
+    TOKEN_LENGTH,
+    ReferencePointType,
+    UserRole,
+)
+from models.models import (
+    Dialog,
+    FeedbackRequest,
+    InvitationLink,
+    Notification,
+    Question,
+    ReferencePoint,
+    Restaurant,
+    RoadMap,
+    TemplateFeedbackRequest,
+    TemplateNotification,
+    TemplateQuestion,
+    TemplateReferencePoint,
+    TemplateRoadMap,
+    TemplateTest,
+    Test,
+    User,
+    UserRoadMap,
+)
+from services.dialog_partitions import create_partitions
+
+Row = tuple[Table, Dict[str, Any]]
+
+# Типы контрольных точек по кругу в порядке выполнения.
+POINT_TYPES = (
+    ReferencePointType.NOTIFICATION,
+    ReferencePointType.TEST,
+    ReferencePointType.FEEDBACK_REQUEST,
+)
+FIRST_NAMES = ('Иван', 'Елена', 'Матвей', 'Ольга', 'Пётр', 'Анна')
+LAST_NAMES = ('Иванов', 'Смирнова', 'Кузнецов', 'Попова', 'Соколов')
+PATRONYMICS = ('Алексеевич', 'Викторовна', 'Сергеевич', 'Андреевна')
+CITIES = ('Москва', 'Санкт-Петербург', 'Екатеринбург', 'Казань')
+ANSWERS_COUNT = 4
+WORKDAY_START_HOUR = 9
+WORKDAY_SECONDS = 9 * 60 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class Cardinalities:
+    """Размеры набора. --scale умножает число ресторанов."""
+
+    restaurants: int = 3
+    managers_per_restaurant: int = 2
+    interns_per_manager: int = 5
+    templates_per_restaurant: int = 2
+    points_per_roadmap: int = 9
+    questions_per_test: int = 4
+    dialog_months: int = 3
+    messages_per_day: int = 2
+
+
+class DatasetGenerator:
+    """Детерминированный обход набора: строки в порядке ссылок.
+
+    Каждая строка выдаётся после строк, на которые она ссылается, а
+    id считаются по порядку строк в таблице, как их назначит загрузка.
+    """
+
+    def __init__(
+        self,
+        sizes: Cardinalities,
+        seed: int,
+        end: datetime,
+    ) -> None:
+        """Настраивает размеры, зерно случайности и конец истории."""
+        self.sizes = sizes
+        self.rng = random.Random(seed)
+        self.end = end
+        self.start = end - timedelta(days=30 * sizes.dialog_months)
+        self._ids: Counter = Counter()
+
+    def _row(self, model: type[BaseModel], values: Dict[str, Any]) -> Row:
+        """Новая строка таблицы модели; её id - в self.last(model)."""
+        self._ids[model.__table__] += 1
+        return model.__table__, values
+
+    def last(self, model: type[BaseModel]) -> int:
+        """Номер последней выданной строки таблицы модели, он же её id."""
+        return self._ids[model.__table__]
+
+    def rows(self) -> Iterator[Row]:
+        """Все строки набора."""
+        for number in range(1, self.sizes.restaurants + 1):
+            yield from self._restaurant(number)
+
+    def _restaurant(self, number: int) -> Iterator[Row]:
+        """Ресторан, его шаблоны и персонал."""
+        city = CITIES[number % len(CITIES)]
+        yield self._row(Restaurant, {
+            'name': f'Ресторан {number}',
+            'full_address': f'г. {city}, ул. Тестовая, д. {number}',
+            'short_address': f'{city}, Тестовая {number}',
+            'contact_information': f'+7900{number:07d}',
+        })
+        restaurant_id = self.last(Restaurant)
+        template_names = []
+        for _ in range(self.sizes.templates_per_restaurant):
+            template_names.append(f'Шаблон {self.last(TemplateRoadMap) + 1}')
+            yield from self._template_roadmap(restaurant_id)
+        for _ in range(self.sizes.managers_per_restaurant):
+            yield from self._manager(restaurant_id, template_names)
+
+    def _template_roadmap(self, restaurant_id: int) -> Iterator[Row]:
+        """Шаблон дорожной карты с контрольными точками."""
+        template_id = self.last(TemplateRoadMap) + 1
+        yield self._row(TemplateRoadMap, {
+            'name': f'Шаблон {template_id}',
+            'description': f'Адаптация по шаблону {template_id}',
+            'restaurant_id': restaurant_id,
+        })
+        for order in range(1, self.sizes.points_per_roadmap + 1):
+            yield from self._template_point(restaurant_id, template_id, order)
+
+    def _template_point(
+        self,
+        restaurant_id: int,
+        template_id: int,
+        order: int,
+    ) -> Iterator[Row]:
+        """Шаблон контрольной точки с тестом, уведомлением или запросом."""
+        point_type = POINT_TYPES[(order - 1) % len(POINT_TYPES)]
+        values = {
+            'name': f'Шаблон точки {self.last(TemplateReferencePoint) + 1}',
+            'templateroadmap_id': template_id,
+            'restaurant_id': restaurant_id,
+            'order_execution': order,
+            'point_type': point_type,
+        }
+        if point_type == ReferencePointType.TEST:
+            yield self._row(TemplateTest, {
+                'name': f'Шаблон теста {self.last(TemplateTest) + 1}',
+                'restaurant_id': restaurant_id,
+            })
+            values['test_id'] = self.last(TemplateTest)
+            for _ in range(self.sizes.questions_per_test):
+                yield self._row(TemplateQuestion, {
+                    **self._question(),
+                    'templatetest_id': values['test_id'],
+                })
+        yield self._row(TemplateReferencePoint, values)
+        point_id = self.last(TemplateReferencePoint)
+        if point_type == ReferencePointType.NOTIFICATION:
+            yield self._row(TemplateNotification, {
+                **self._notification(),
+                'referencepoint_id': point_id,
+            })
+        elif point_type == ReferencePointType.FEEDBACK_REQUEST:
+            yield self._row(TemplateFeedbackRequest, {
+                'text': 'Как прошёл этот этап?',
+                'reference_point_id': point_id,
+            })
+
+    def _question(self) -> Dict[str, Any]:
+        """Вопрос теста со случайным правильным ответом."""
+        return {
+            'text_question': f'Вопрос {self.rng.randrange(10 ** 6)}',
+            'correct_answer': self.rng.randrange(1, ANSWERS_COUNT + 1),
+            'answers': [
+                f'Ответ {number}' for number in range(1, ANSWERS_COUNT + 1)
+            ],
+        }
+
+    def _notification(self) -> Dict[str, Any]:
+        """Текст уведомления контрольной точки."""
+        return {
+            'text': 'Изучите материалы этапа',
+            'need_feedback': self.rng.random() < 0.3,
+            'feedbacks': ['Понятно', 'Есть вопросы'],
+            'links': ['https://example.com/materials'],
+            'servise_notes': ['Посмотри материалы'],
+        }
+
+    def _user(
+        self,
+        role: UserRole,
+        restaurant_id: int,
+        manager_id: Optional[int] = None,
+    ) -> Row:
+        """Пользователь с уникальными tg_id, email и телефоном."""
+        number = self.last(User) + 1
+        return self._row(User, {
+            'first_name': self.rng.choice(FIRST_NAMES),
+            'last_name': self.rng.choice(LAST_NAMES),
+            'patronymic': self.rng.choice(PATRONYMICS),
+            'role': role,
+            'tg_id': 10 ** 9 + number,
+            'email': f'user{number}@example.com',
+            'phone_number': f'+79{number:09d}',
+            'restaurant_id': restaurant_id,
+            'manager_id': manager_id,
+        })
+
+    def _manager(
+        self,
+        restaurant_id: int,
+        template_names: list[str],
+    ) -> Iterator[Row]:
+        """Менеджер и его стажёры."""
+        yield self._user(UserRole.MANAGER, restaurant_id)
+        manager_id = self.last(User)
+        for _ in range(self.sizes.interns_per_manager):
+            yield self._user(UserRole.USER, restaurant_id, manager_id)
+            intern_id = self.last(User)
+            hired = self.start + timedelta(
+                days=self.rng.randrange(30 * self.sizes.dialog_months),
+            )
+            yield self._row(InvitationLink, {
+                'link_token': ''.join(
+                    self.rng.choices(ACCEPTABLE_SYMBOLS, k=TOKEN_LENGTH),
+                ),
+                'user_id': intern_id,
+                'created_at': hired - timedelta(days=1),
+                'expires_at': hired + timedelta(days=6),
+                'is_used': True,
+            })
+            yield from self._roadmap(
+                intern_id,
+                self.rng.choice(template_names),
+                hired,
+            )
+            yield from self._dialogs(manager_id, intern_id, hired)
+
+    def _roadmap(
+        self,
+        intern_id: int,
+        template_name: str,
+        hired: datetime,
+    ) -> Iterator[Row]:
+        """Дорожная карта стажёра с частично пройденными точками."""
+        roadmap_id = self.last(RoadMap) + 1
+        yield self._row(RoadMap, {
+            'name': f'{template_name}: карта {roadmap_id}',
+            'description': f'Адаптация стажёра #{intern_id}',
+        })
+        yield self._row(UserRoadMap, {
+            'user_id': intern_id,
+            'roadmap_id': roadmap_id,
+        })
+        elapsed = (self.end - hired).days
+        for order in range(1, self.sizes.points_per_roadmap + 1):
+            trigger = hired + timedelta(days=order)
+            yield from self._point(
+                roadmap_id,
+                order,
+                trigger,
+                completed=order < elapsed and self.rng.random() < 0.9,
+            )
+
+    def _point(
+        self,
+        roadmap_id: int,
+        order: int,
+        trigger: datetime,
+        completed: bool,
+    ) -> Iterator[Row]:
+        """Контрольная точка стажёра с тестом, уведомлением или запросом."""
+        point_type = POINT_TYPES[(order - 1) % len(POINT_TYPES)]
+        yield self._row(ReferencePoint, {
+            'name': f'Точка {self.last(ReferencePoint) + 1}',
+            'roadmap_id': roadmap_id,
+            'order_execution': order,
+            'point_type': point_type,
+            'trigger_datetime': trigger,
+            'check_datetime': trigger + timedelta(days=1),
+            'completion_datetime': trigger if completed else None,
+            'is_completed': completed,
+            'is_sent': trigger <= self.end,
+        })
+        point_id = self.last(ReferencePoint)
+        if point_type == ReferencePointType.TEST:
+            yield self._row(Test, {
+                'name': f'Тест {self.last(Test) + 1}',
+                'referencepoint_id': point_id,
+            })
+            for _ in range(self.sizes.questions_per_test):
+                question = self._question()
+                yield self._row(Question, {
+                    **question,
+                    'test_id': self.last(Test),
+                    'user_answer': (
+                        question['correct_answer'] if completed else None
+                    ),
+                })
+        elif point_type == ReferencePointType.NOTIFICATION:
+            yield self._row(Notification, {
+                **self._notification(),
+                'referencepoint_id': point_id,
+            })
+        else:
+            yield self._row(FeedbackRequest, {
+                'text': 'Как прошёл этот этап?',
+                'reference_point_id': point_id,
+                'user_answer': 'Всё понятно' if completed else None,
+            })
+
+    def _dialogs(
+        self,
+        manager_id: int,
+        intern_id: int,
+        hired: datetime,
+    ) -> Iterator[Row]:
+        """Переписка менеджера и стажёра с найма до конца истории."""
+        day = hired.replace(hour=WORKDAY_START_HOUR, minute=0, second=0)
+        while day < self.end:
+            moments = sorted(
+                self.rng.randrange(WORKDAY_SECONDS)
+                for _ in range(self.sizes.messages_per_day)
+            )
+            for number, moment in enumerate(moments):
+                sender, recipient = (
+                    (intern_id, manager_id) if number % 2
+                    else (manager_id, intern_id)
+                )
+                yield self._row(Dialog, {
+                    'message': f'Сообщение {self.last(Dialog) + 1}',
+                    'message_datetime': day + timedelta(seconds=moment),
+                    'sender_id': sender,
+                    'recipient_id': recipient,
+                })
+            day += timedelta(days=1)
+
+
+class JsonWriter:
+    """Пишет строки в JSON-массивы по файлу на таблицу, как в data/."""
+
+    def __init__(self, out_dir: Path, stack: ExitStack) -> None:
+        """Открывает файлы всех таблиц в каталоге out_dir."""
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.files: Dict[Table, TextIO] = {}
+        self.counts: Counter = Counter()
+        for filename, model in FILE_MODELS.items():
+            file = stack.enter_context(
+                (out_dir / f'{filename}.json').open('w', encoding='utf-8'),
+            )
+            file.write('[')
+            self.files[model.__table__] = file
+        stack.callback(self.close)
+
+    def write(self, table: Table, values: Dict[str, Any]) -> None:
+        """Дописывает строку в массив таблицы."""
+        file = self.files[table]
+        file.write(',\n' if self.counts[table] else '\n')
+        file.write(json.dumps(
+            values,
+            ensure_ascii=False,
+            default=datetime.isoformat,
+        ))
+        self.counts[table] += 1
+
+    def close(self) -> None:
+        """Закрывает массивы всех таблиц."""
+        for file in self.files.values():
+            file.write('\n]\n')
+
+
+class CopyWriter:
+    """Пишет строки сразу в БД через COPY пачками.
+
+    Перед каждой отправкой сбрасываются буферы всех таблиц в порядке
+    внешних ключей: строки генератора ссылаются только на выданные
+    раньше, поэтому их родители к этому моменту уже в БД.
+    """
+
+    def __init__(self, conn: AsyncConnection, chunk_size: int) -> None:
+        """Запоминает соединение и размер пачки."""
+        self.conn = conn
+        self.chunk_size = chunk_size
+        loaded = {model.__table__ for model in FILE_MODELS.values()}
+        self.tables = [
+            table for table in BaseModel.metadata.sorted_tables
+            if table in loaded
+        ]
+        self.buffers: Dict[Table, list] = {table: [] for table in self.tables}
+        self.counts: Counter = Counter()
+        self.copiers: Dict[Table, TableCopy] = {}
+        self.pending = 0
+
+    async def start(self) -> None:
+        """Проверяет, что таблицы пусты, и готовит преобразование строк."""
+        for table in self.tables:
+            if await self.conn.scalar(select(table.c.id).limit(1)):
+                raise SystemExit(
+                    f'Таблица {table.name} не пуста: набор ссылается '
+                    'на id с 1, загружайте его в пустую схему.',
+                )
+            self.copiers[table] = TableCopy(
+                table,
+                0,
+                await column_defaults(self.conn, table),
+            )
+        await self.conn.commit()
+        raw = await self.conn.get_raw_connection()
+        self.driver = raw.driver_connection
+
+    async def write(self, table: Table, values: Dict[str, Any]) -> None:
+        """Добавляет строку в буфер и отправляет буферы при заполнении."""
+        self.counts[table] += 1
+        self.buffers[table].append(
+            self.copiers[table].record(self.counts[table], values),
+        )
+        self.pending += 1
+        if self.pending >= self.chunk_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Отправляет буферы всех таблиц, родительские первыми."""
+        for table in self.tables:
+            if self.buffers[table]:
+                await self.driver.copy_records_to_table(
+                    table.name,
+                    records=self.buffers[table],
+                    columns=self.copiers[table].columns,
+                )
+                self.buffers[table] = []
+        self.pending = 0
+
+    async def finish(self) -> None:
+        """Отправляет остаток и сдвигает счётчики id таблиц."""
+        await self.flush()
+        for table in self.tables:
+            await advance_identity(self.conn, table, self.counts[table])
+
+
+def write_json(generator: DatasetGenerator, out_dir: Path) -> Counter:
+    """Пишет набор в JSON-файлы для data_script.py."""
+    with ExitStack() as stack:
+        writer = JsonWriter(out_dir, stack)
+        for table, values in generator.rows():
+            writer.write(table, values)
+    return writer.counts
+
+
+async def copy_to_database(
+    generator: DatasetGenerator,
+    chunk_size: int,
+) -> Counter:
+    """Пишет набор сразу в БД через COPY.
+
+    Месячные секции dialog под всю историю создаются до записи, иначе
+    переписка прошлых месяцев осела бы в секции по умолчанию.
+    """
+    async with engine.connect() as conn:
+        await create_partitions(conn, generator.start, generator.end)
+        writer = CopyWriter(conn, chunk_size)
+        await writer.start()
+        for table, values in generator.rows():
+            await writer.write(table, values)
+        await writer.finish()
+    await engine.dispose()
+    return writer.counts
+
+
+def main() -> None:
+    """Точка входа генератора."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    for field in fields(Cardinalities):
+        parser.add_argument(
+            f'--{field.name.replace("_", "-")}',
+            type=int,
+            default=field.default,
+        )
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--end',
+        type=datetime.fromisoformat,
+        default=datetime.combine(date.today(), time()),
+        help='конец истории диалогов (ISO-дата, по умолчанию сегодня)',
+    )
+    parser.add_argument('--out', type=Path, default=DATA_DIR / 'generated')
+    parser.add_argument('--copy', action='store_true')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+    values = {
+        field.name: getattr(args, field.name)
+        for field in fields(Cardinalities)
+    }
+    values['restaurants'] *= args.scale
+    generator = DatasetGenerator(Cardinalities(**values), args.seed, args.end)
+    if args.copy:
+        counts = asyncio.run(copy_to_database(generator, args.chunk_size))
+    else:
+        counts = write_json(generator, args.out)
+    for table, count in sorted(counts.items(), key=lambda item: item[0].name):
+        print(f'{table.name}: {count}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+from aiogram.filters.callback_data import CallbackData
+
+
+class DialogHistoryCallback(CallbackData, prefix='dialog'):
+    """Класс обработки кнопок листания истории переписки.
+
+    before и before_id - ключ самого старого показанного сообщения:
+    время в микросекундах от начала эпохи и id. Нули означают
+    последние сообщения.
+    """
+
+    peer_id: int
+    before: int = 0
+    before_id: int = 0
@@ -1,5 +1,6 @@
 from aiogram import Router
 
+from .dialog_history import dialog_history_router  # noqa
 from .dialogue import dialogue_router
 from .notifications import notifications_router  # noqa
 from .status_checkpoint import status_point_router  # noqa
@@ -11,6 +12,7 @@ intern_router = Router()
 intern_router.include_routers(
     status_roadmap_router,
     term_roadmap_router,
+    dialog_history_router,
     dialogue_router,
     notifications_router,
     status_point_router,
@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta
+from html import escape
+from typing import Optional
+
+from aiogram import F, Router
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud import dialog_crud, user_crud
+from crud.base import Page
+from intern.callbacks import DialogHistoryCallback
+from manager.callbacks import ManagerInternCallback
+from manager.constants import BACK
+from models.models import User
+from services.user_cache import CachedUser
+
+dialog_history_router = Router()
+
+EPOCH = datetime(1970, 1, 1)
+MESSAGE_PREVIEW = 300
+OLDER_PAGE = '⬅️ Ранее'
+LATEST_PAGE = 'К последним'
+NO_MESSAGES = 'Сообщений пока нет.'
+
+
+def encode_before(moment: datetime) -> int:
+    """Время сообщения в микросекундах для кнопки листания."""
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def decode_before(
+    callback_data: DialogHistoryCallback,
+) -> Optional[tuple[datetime, int]]:
+    """Ключ листания из кнопки или None для последних сообщений."""
+    if not callback_data.before_id:
+        return None
+    return (
+        EPOCH + timedelta(microseconds=callback_data.before),
+        callback_data.before_id,
+    )
+
+
+async def get_peer(
+    user: CachedUser,
+    peer_id: int,
+    session: AsyncSession,
+) -> Optional[User]:
+    """Собеседник, если пользователь вправе читать переписку с ним.
+
+    Переписка доступна стажёру и его менеджеру.
+    """
+    peer = await user_crud.get(peer_id, session)
+    if peer is None:
+        return None
+    if peer.manager_id == user.id:
+        return peer
+    me = await user_crud.get(user.id, session)
+    if me is not None and me.manager_id == peer.id:
+        return peer
+    return None
+
+
+def render_history(page: Page, user_id: int, peer: User) -> str:
+    """Текст страницы переписки, от старых сообщений к новым."""
+    title = f'<b>Переписка: {escape(peer.first_name)}</b>'
+    if not page.items:
+        return f'{title}\n\n{NO_MESSAGES}'
+    lines = [title, '']
+    for dialog in page.items:
+        author = 'Вы' if dialog.sender_id == user_id else peer.first_name
+        text = dialog.message
+        if len(text) > MESSAGE_PREVIEW:
+            text = text[:MESSAGE_PREVIEW] + '…'
+        lines.append(
+            f'[{dialog.message_datetime:%d.%m %H:%M}] '
+            f'<b>{escape(author)}</b>: {escape(text)}',
+        )
+    return '\n'.join(lines)
+
+
+def history_keyboard(
+    page: Page,
+    user_id: int,
+    peer: User,
+) -> InlineKeyboardMarkup:
+    """Кнопки листания истории назад и возврата к последним."""
+    buttons = []
+    if page.has_prev:
+        oldest = page.items[0]
+        buttons.append(
+            InlineKeyboardButton(
+                text=OLDER_PAGE,
+                callback_data=DialogHistoryCallback(
+                    peer_id=peer.id,
+                    before=encode_before(oldest.message_datetime),
+                    before_id=oldest.id,
+                ).pack(),
+            ),
+        )
+    if page.has_next:
+        buttons.append(
+            InlineKeyboardButton(
+                text=LATEST_PAGE,
+                callback_data=DialogHistoryCallback(peer_id=peer.id).pack(),
+            ),
+        )
+    rows = [buttons] if buttons else []
+    if peer.manager_id == user_id:
+        rows.append([
+            InlineKeyboardButton(
+                text=BACK,
+                callback_data=ManagerInternCallback(
+                    action='manager_intern_actions',
+                    intern_id=peer.id,
+                ).pack(),
+            ),
+        ])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+@dialog_history_router.message(F.text == 'История переписки с менеджером')
+async def show_manager_dialog(
+    message: Message,
+    user: CachedUser,
+    session: AsyncSession,
+) -> None:
+    """Последние сообщения переписки стажёра с менеджером."""
+    me = await user_crud.get(user.id, session)
+    manager = None
+    if me is not None and me.manager_id is not None:
+        manager = await user_crud.get(me.manager_id, session)
+    if manager is None:
+        await message.answer('❗️Вы не прикреплены к менеджеру.')
+        return
+    page = await dialog_crud.get_conversation_page(
+        session, user.id, manager.id,
+    )
+    await message.answer(
+        render_history(page, user.id, manager),
+        parse_mode='HTML',
+        reply_markup=history_keyboard(page, user.id, manager),
+    )
+
+
+@dialog_history_router.callback_query(DialogHistoryCallback.filter())
+async def turn_dialog_page(
+    callback: CallbackQuery,
+    callback_data: DialogHistoryCallback,
+    user: CachedUser,
+    session: AsyncSession,
+) -> None:
+    """Страница переписки по кнопке листания или из карточки стажёра."""
+    peer = await get_peer(user, callback_data.peer_id, session)
+    if peer is None:
+        await callback.answer('Переписка недоступна.', show_alert=True)
+        return
+    page = await dialog_crud.get_conversation_page(
+        session,
+        user.id,
+        peer.id,
+        before=decode_before(callback_data),
+    )
+    await callback.message.edit_text(
+        render_history(page, user.id, peer),
+        parse_mode='HTML',
+        reply_markup=history_keyboard(page, user.id, peer),
+    )
+    await callback.answer()
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import (
@@ -10,54 +12,84 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from crud.users import user_crud
 from intern.states import InternReply, ManagerReply
-from intern.utils import save_message
+from services.dialog_writer import DialogWriter
+from services.sender import SendQueue
+from services.user_cache import CachedUser
 
 dialogue_router = Router()
 
 
+def reply_button(action: str, user: CachedUser) -> InlineKeyboardMarkup:
+    """Кнопка «Ответить» с Telegram ID и id автора сообщения."""
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text='✉️ Ответить',
+                    callback_data=f'{action}:{user.tg_id}:{user.id}',
+                ),
+            ],
+        ],
+    )
+
+
+async def get_reply_target(
+    data: str,
+    session: AsyncSession,
+) -> Optional[tuple[int, int]]:
+    """Telegram ID и id собеседника из кнопки «Ответить».
+
+    В кнопках, отправленных до появления id в callback, есть только
+    Telegram ID, для них id находится запросом.
+    """
+    _, tg_id, *user_id = data.split(':')
+    if user_id:
+        return int(tg_id), int(user_id[0])
+    user = await user_crud.get_user_by_tg_id(session, int(tg_id))
+    if user is None:
+        return None
+    return user.tg_id, user.id
+
+
 @dialogue_router.message(F.text == 'Отправить сообщение менеджеру')
 async def start_send_message_to_manager(
     message: Message,
     state: FSMContext,
     session: AsyncSession,
+    user: CachedUser,
 ) -> None:
     """Начинаем процесс отправки сообщения менеджеру."""
-    sender_id = message.from_user.id
-    receiver_id = await user_crud.get_manager_id(sender_id, session)
-    if receiver_id is None:
+    manager = await user_crud.get_manager(user.id, session)
+    if manager is None:
         await message.answer('❗️Вы не прикреплены к менеджеру.')
         await state.clear()
         return
+    await state.update_data(manager_id=manager.id, manager_tg_id=manager.tg_id)
     await state.set_state(InternReply.entering_message_to_manager)
     await message.answer('Введите сообщение для отправки менеджеру:')
 
 
-@dialogue_router.message(InternReply.entering_message_to_manager)
+@dialogue_router.message(InternReply.entering_message_to_manager, F.text)
 async def send_message_to_manager(
     message: Message,
     state: FSMContext,
-    session: AsyncSession,
+    sender: SendQueue,
+    dialog_writer: DialogWriter,
+    user: CachedUser,
 ) -> None:
     """Отправляет сообщение менеджеру."""
-    sender_id = message.from_user.id
-    receiver_id = await user_crud.get_manager_id(sender_id, session)
+    data = await state.get_data()
+    if not data.get('manager_tg_id'):
+        await message.answer('Ошибка: не найден ID менеджера.')
+        await state.clear()
+        return
     text = message.text
-    reply_button = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text='✉️ Ответить',
-                    callback_data=f'reply_to_intern:{sender_id}',
-                ),
-            ],
-        ],
-    )
-    await message.bot.send_message(
-        chat_id=receiver_id,
+    await sender.send_message(
+        chat_id=data['manager_tg_id'],
         text=f'💬 Новое сообщение от стажёра:\n\n{text}',
-        reply_markup=reply_button,
+        reply_markup=reply_button('reply_to_intern', user),
     )
-    await save_message(sender_id, receiver_id, text, session)
+    dialog_writer.write(user.id, data['manager_id'], text)
     await message.answer('Сообщение менеджеру отправлено.')
     await state.clear()
 
@@ -66,95 +98,67 @@ async def send_message_to_manager(
 async def handle_reply_to_intern(
     callback: CallbackQuery,
     state: FSMContext,
+    session: AsyncSession,
 ) -> None:
     """Начало ввода ответа менеджера стажёру."""
     await callback.answer()
-    intern_id = int(callback.data.split(':')[1])
-    await state.update_data(intern_id=intern_id)
+    target = await get_reply_target(callback.data, session)
+    if target is None:
+        await callback.message.answer('Ошибка: не найден ID стажёра.')
+        return
+    intern_tg_id, intern_id = target
+    await state.update_data(intern_id=intern_id, intern_tg_id=intern_tg_id)
     await state.set_state(ManagerReply.entering_reply_text)
     await callback.message.edit_reply_markup(reply_markup=None)
     await callback.message.answer('Введите ответ стажёру:')
 
 
-@dialogue_router.message(ManagerReply.entering_reply_text)
+@dialogue_router.message(ManagerReply.entering_reply_text, F.text)
 async def handle_manager_reply(
     message: Message,
     state: FSMContext,
-    session: AsyncSession,
+    sender: SendQueue,
+    dialog_writer: DialogWriter,
+    user: CachedUser,
 ) -> None:
     """Обработка текста ответа менеджера стажёру."""
     data = await state.get_data()
-    intern_id = data.get('intern_id')
-    if not intern_id:
+    if not data.get('intern_tg_id'):
         await message.answer('Ошибка: не найден ID стажёра.')
         await state.clear()
         return
     reply_text = message.text
-    sender_id = message.from_user.id
-    reply_button = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text='✉️ Ответить',
-                    callback_data=f'reply_to_manager:{sender_id}',
-                ),
-            ],
-        ],
-    )
-    await message.bot.send_message(
-        chat_id=intern_id,
+    await sender.send_message(
+        chat_id=data['intern_tg_id'],
         text=f'💬 Ответ от менеджера:\n\n{reply_text}',
-        reply_markup=reply_button,
+        reply_markup=reply_button('reply_to_manager', user),
     )
-    await save_message(sender_id, intern_id, reply_text, session)
+    dialog_writer.write(user.id, data['intern_id'], reply_text)
     await message.answer('Ответ отправлен стажёру.')
     await state.clear()
 
 
+@dialogue_router.message(InternReply.entering_message_to_manager)
+@dialogue_router.message(ManagerReply.entering_reply_text)
+async def handle_not_text_message(message: Message) -> None:
+    """Напоминает, что пересылается только текст."""
+    await message.answer('Отправьте сообщение текстом:')
+
+
 @dialogue_router.callback_query(F.data.startswith('reply_to_manager'))
 async def handle_reply_to_manager(
     callback: CallbackQuery,
     state: FSMContext,
+    session: AsyncSession,
 ) -> None:
     """Начало ввода ответа стажёра менеджеру."""
     await callback.answer()
-    manager_id = int(callback.data.split(':')[1])
-    await state.update_data(manager_id=manager_id)
+    target = await get_reply_target(callback.data, session)
+    if target is None:
+        await callback.message.answer('Ошибка: не найден ID менеджера.')
+        return
+    manager_tg_id, manager_id = target
+    await state.update_data(manager_id=manager_id, manager_tg_id=manager_tg_id)
     await state.set_state(InternReply.entering_message_to_manager)
     await callback.message.edit_reply_markup(reply_markup=None)
     await callback.message.answer('Введите ответ менеджеру:')
-
-
-@dialogue_router.message(InternReply.entering_message_to_manager)
-async def handle_intern_reply(
-    message: Message,
-    state: FSMContext,
-    session: AsyncSession,
-) -> None:
-    """Обработка текста ответа стажёра менеджеру."""
-    data = await state.get_data()
-    manager_id = data.get('manager_id')
-    if not manager_id:
-        await message.answer('Ошибка: не найден ID менеджера.')
-        await state.clear()
-        return
-    reply_text = message.text
-    sender_id = message.from_user.id
-    reply_button = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text='✉️ Ответить',
-                    callback_data=f'reply_to_manager:{sender_id}',
-                ),
-            ],
-        ],
-    )
-    await message.bot.send_message(
-        chat_id=manager_id,
-        text=f'💬 Ответ от стажёра:\n\n{reply_text}',
-        reply_markup=reply_button,
-    )
-    await save_message(sender_id, manager_id, reply_text, session)
-    await message.answer('Ответ отправлен менеджеру.')
-    await state.clear()
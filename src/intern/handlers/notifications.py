@@ -1,7 +1,8 @@
 import json
-from typing import List
+import logging
+from typing import Any, List
 
-from aiogram import Bot, F, Router
+from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import (
     CallbackQuery,
@@ -9,7 +10,7 @@ from aiogram.types import (
     InlineKeyboardMarkup,
     Message,
 )
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from crud.questions import question_crud
@@ -19,10 +20,22 @@ from intern.states import FeedbackStates
 from intern.utils import (
     complete_ref_point,
 )
-from models import ReferencePoint, User
+from models import ReferencePoint, Test, User
+from services.sender import SendPriority, SendQueue
+from services.test_answers import (
+    AttemptStep,
+    finish_attempt,
+    save_answer,
+    start_attempt,
+)
 
 notifications_router = Router()
 
+RESULT_MESSAGE = (
+    '🏁 Тест завершён!\n'
+    'Правильных ответов: {correct} из {total}'
+)
+
 
 def extract_questions(quiz_items: List[str]) -> List[str]:
     """Возвращает список вопросов из списка json-строк."""
@@ -30,10 +43,9 @@ def extract_questions(quiz_items: List[str]) -> List[str]:
 
 
 async def handle_reference_point_type(
-    bot: Bot,
+    sender: SendQueue,
     reference_point: ReferencePoint,
     user: User,
-    scheduler: AsyncIOScheduler,
 ) -> None:
     """Обрабатывает тип контрольной точки и отправляет уведомление."""
     user_id = user.tg_id
@@ -50,21 +62,23 @@ async def handle_reference_point_type(
                     ],
                 ],
             )
-            await bot.send_message(
+            await sender.send_message(
                 user_id,
                 'Вам необходимо пройти тест, вы готовы?',
                 reply_markup=start_preview_keyboard,
+                priority=SendPriority.REMINDER,
             )
 
         elif reference_point.point_type == 'NOTIFICATION':
-            await bot.send_message(
+            await sender.send_message(
                 user_id,
                 (
                     '📩 Вам уведомление с контрольной точки:\n'
                     f'{reference_point.notification.text}'
                 ),
+                priority=SendPriority.REMINDER,
             )
-            await complete_ref_point(reference_point, scheduler, session)
+            await complete_ref_point(reference_point, session)
 
         elif reference_point.point_type == 'FEEDBACK_REQUEST':
             feedback_keyboard = InlineKeyboardMarkup(
@@ -77,10 +91,11 @@ async def handle_reference_point_type(
                     ],
                 ],
             )
-            await bot.send_message(
+            await sender.send_message(
                 user_id,
                 '📩 Пожалуйста, оставьте обратную связь.',
                 reply_markup=feedback_keyboard,
+                priority=SendPriority.REMINDER,
             )
         else:
             raise ValueError('Похоже, контрольная точка не задана!')
@@ -152,40 +167,143 @@ async def handle_cancel_reason(callback: CallbackQuery) -> None:
         await callback.message.answer('❌ Отмена действия.')
 
 
-@notifications_router.callback_query(
-    lambda c: c.data.startswith('handle_start_test:'),
-)
-async def handle_start(
-    callback: CallbackQuery,
+def question_text(question: dict[str, Any]) -> str:
+    """Текст вопроса попытки с его номером."""
+    return (
+        f'Вопрос {question["number"]} из {question["total"]}\n\n'
+        f'{question["text"]}'
+    )
+
+
+def question_keyboard(
+    test_id: int,
+    question: dict[str, Any],
+) -> InlineKeyboardMarkup:
+    """Кнопки вариантов ответа на вопрос попытки."""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(
+            text=answer,
+            callback_data=f'answer:{test_id}:{question["id"]}:{i + 1}',
+        )]
+        for i, answer in enumerate(question['answers'])
+    ])
+
+
+async def show_step(
+    message: Message,
+    test_id: int,
+    step: AttemptStep,
     session: AsyncSession,
 ) -> None:
-    """Обработчик старта теста."""
-    ref_point_id = int(callback.data.split(':')[1])
-    ref_point = await referencepoint_crud.get_reference_point_by_id(
-        ref_point_id, session,
+    """Показывает в том же сообщении следующий вопрос или итог теста."""
+    if step.question is not None:
+        await message.edit_text(
+            question_text(step.question),
+            reply_markup=question_keyboard(test_id, step.question),
+        )
+        return
+    result = await finish_attempt(test_id, session)
+    if result is None:
+        # Попытку уже завершает другой обработчик, итог покажет он.
+        return
+    await message.edit_text(
+        RESULT_MESSAGE.format(correct=result.correct, total=result.total),
     )
-    questions = ref_point.test.questions
 
-    for question in questions:
+
+async def send_all_questions(message: Message, test: Test) -> None:
+    """Отправляет все вопросы сразу с записью ответов прямо в БД.
+
+    Запасной вариант на случай недоступности Redis.
+    """
+    for question in test.questions:
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(
-                text=answer, callback_data=f'answer:{question.id}:{i + 1}')]
+                text=answer,
+                callback_data=f'answer:{question.id}:{i + 1}',
+            )]
             for i, answer in enumerate(question.answers)
         ])
-        await callback.message.answer(
+        await message.answer(
             f'{question.text_question}',
             reply_markup=keyboard,
         )
 
 
+@notifications_router.callback_query(
+    lambda c: c.data.startswith('handle_start_test:'),
+)
+async def handle_start(
+    callback: CallbackQuery,
+    session: AsyncSession,
+) -> None:
+    """Обработчик старта теста.
+
+    Вопросы показываются по одному в сообщении с подтверждением,
+    повторный старт продолжает ту же попытку.
+    """
+    ref_point_id = int(callback.data.split(':')[1])
+    ref_point = await referencepoint_crud.get_reference_point_by_id(
+        ref_point_id, session,
+    )
+    if ref_point.is_completed:
+        await callback.answer('Тест уже пройден.', show_alert=True)
+        await callback.message.edit_reply_markup(reply_markup=None)
+        return
+    await callback.answer()
+    step = await start_attempt(ref_point, callback.message.chat.id)
+    if step is None:
+        await callback.message.edit_reply_markup(reply_markup=None)
+        await send_all_questions(callback.message, ref_point.test)
+        return
+    await show_step(callback.message, ref_point.test.id, step, session)
+
+
 @notifications_router.callback_query(lambda c: c.data.startswith('answer:'))
 async def handle_answer_callback(
     callback: CallbackQuery, session: AsyncSession,
 ) -> None:
-    """Сохранение ответа на тест."""
-    _, question_id_str, answer_index_str = callback.data.split(':')
-    question_id = int(question_id_str)
-    answer_index = int(answer_index_str)
+    """Сохранение ответа на тест.
+
+    Ответ записывается в попытку в Redis, в БД попытка пишется
+    целиком после последнего ответа или по истечении времени теста.
+    Кнопки без id теста остались от запасного режима без Redis.
+    """
+    *test_id, question_id, answer_index = map(
+        int, callback.data.split(':')[1:],
+    )
+    if not test_id:
+        await save_answer_directly(
+            callback, question_id, answer_index, session,
+        )
+        return
+    try:
+        step = await save_answer(test_id[0], question_id, answer_index)
+    except RedisError as e:
+        logging.warning(f'Хранилище попыток недоступно: {str(e)}')
+        await callback.answer(
+            'Ошибка при сохранении ответа ❌, попробуйте ещё раз',
+            show_alert=True,
+        )
+        return
+    if step is None:
+        await callback.answer(
+            'Время на тест истекло, ответ не принят ⌛',
+            show_alert=True,
+        )
+        await callback.message.edit_reply_markup(reply_markup=None)
+        return
+    await callback.answer('Ответ сохранён ✅')
+    await show_step(callback.message, test_id[0], step, session)
+
+
+async def save_answer_directly(
+    callback: CallbackQuery,
+    question_id: int,
+    answer_index: int,
+    session: AsyncSession,
+) -> None:
+    """Сохраняет ответ сразу в БД (запасной режим без Redis)."""
     updated_question = await question_crud.update_user_answer(
         question_id, answer_index, session,
     )
@@ -6,8 +6,8 @@ from aiogram.types import (
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from crud.roadmap import roadmap_crud
-from models.models import User
+from services.progress import get_intern_progress
+from services.user_cache import CachedUser
 
 status_roadmap_router = Router()
 
@@ -16,21 +16,18 @@ status_roadmap_router = Router()
 async def status_roadmap_handler(
     message: Message,
     session: AsyncSession,
-    user: User,
+    user: CachedUser,
 ) -> None:
     """Информирование стажера о статусе дорожной карты."""
-    roadmap = await roadmap_crud.get_user_roadmap(
-        intern_id=user.id,
-        session=session,
-    )
-    if not roadmap:
+    progress = await get_intern_progress(user.id, session)
+    if not progress or progress.roadmap_id is None:
         await message.answer(' У пользователя нет назначенной дорожной карты.')
         return
 
     lines = []
 
-    lines.append(f'📌 Дорожная карта: {roadmap.name}')
-    for index, point in enumerate(roadmap.reference_points, start=1):
+    lines.append(f'📌 Дорожная карта: {progress.roadmap_name}')
+    for index, point in enumerate(progress.points, start=1):
         point_type = point.point_type
         is_completed = point.is_completed
         check_datetime = point.check_datetime
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from crud.users import user_crud
 from intern.keyboards import additionally_keyboard, intern_keyboard
 from intern.states import TerminationRoadMap
+from services.sender import SendQueue
 
 term_roadmap_router = Router()
 
@@ -83,6 +84,7 @@ async def handle_send_reason(
     callback: CallbackQuery,
     state: FSMContext,
     session: AsyncSession,
+    sender: SendQueue,
 ) -> None:
     """Обработка нажатия кнопки отправки причины отмены."""
     await callback.answer()
@@ -98,7 +100,7 @@ async def handle_send_reason(
     if manager_id is None:
         await callback.message.answer('⚠️ Не удалось найти менеджера.')
         return
-    await callback.bot.send_message(
+    await sender.send_message(
         chat_id=manager_id,
         text=(
             f'Стажёр @{callback.from_user.username} желает прекратить '
@@ -5,6 +5,7 @@ intern_keyboard = ReplyKeyboardMarkup(
         [KeyboardButton(text='Посмотреть статус дорожной карты')],
         [KeyboardButton(text='Посмотреть текущую контрольную точку')],
         [KeyboardButton(text='Отправить сообщение менеджеру')],
+        [KeyboardButton(text='История переписки с менеджером')],
         [KeyboardButton(text='Дополнительно')],
 
     ],
@@ -1,20 +1,20 @@
 from datetime import datetime
 from typing import Optional
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession  # noqa
 from sqlalchemy.orm import selectinload
 
 from crud.users import user_crud
 from models.models import (
-    Dialog,
     ReferencePoint,
-    RoadMap,
     Test,
-    User,
     UserRoadMap,
 )
+from services.progress import (
+    get_intern_progress,
+    invalidate_roadmap_progress,
+)
 
 user_set = {
     'user': {
@@ -95,32 +95,14 @@ async def get_status_road_map(
     session: AsyncSession,
 ) -> dict:
     """Получаем объект дорожной карты интерна."""
-    stmt = (
-        select(User)
-        .where(User.tg_id == user_tg_id)
-        .options(
-            selectinload(User.roadmaps)
-            .selectinload(UserRoadMap.roadmap)
-            .selectinload(RoadMap.reference_points),
-        )
-    )
-    result = await session.execute(stmt)
-    user = result.scalar_one_or_none()
-
+    user = await user_crud.get_user_by_tg_id(session, user_tg_id)
     if user is None:
         return {'error': 'Пользователь не найден'}
 
-    user_roadmap = next(
-        (ur for ur in user.roadmaps if ur.roadmap and ur.roadmap.is_active),
-        None,
-    )
-
-    if not user_roadmap or not user_roadmap.roadmap:
+    progress = await get_intern_progress(user.id, session)
+    if progress is None or progress.roadmap_id is None:
         return {'error': 'Нет дорожной карты'}
 
-    roadmap = user_roadmap.roadmap
-    referencepoints = roadmap.reference_points
-
     checkpoints = [
         {
             'id': rp.id,
@@ -132,27 +114,26 @@ async def get_status_road_map(
             'type': rp.point_type,
             'auto_closing': rp.auto_closing,
         }
-        for rp in referencepoints
+        for rp in progress.points
     ]
 
     return {
-        'roadmap_id': roadmap.id,
-        'roadmap_name': roadmap.name,
+        'roadmap_id': progress.roadmap_id,
+        'roadmap_name': progress.roadmap_name,
         'checkpoints': checkpoints,
     }
 
 
 async def complete_ref_point(
     reference_point: ReferencePoint,
-    scheduler: AsyncIOScheduler,
     session: AsyncSession,
 ) -> None:
     """Ставит галочку выполнено контрольной точке."""
     reference_point.is_completed = True
     reference_point.completion_datetime = datetime.now()
-    scheduler.remove_job(str(reference_point.id))
     session.add(reference_point)
     await session.commit()
+    await invalidate_roadmap_progress(reference_point.roadmap_id)
 
 
 async def get_active_reference_points_for_user(
@@ -200,22 +181,3 @@ async def get_active_reference_point_for_user(
         .limit(1),
     )
     return result.scalars().first()
-
-
-async def save_message(
-        sender_id: int,
-        recipient_id: int,
-        text: str,
-        session: AsyncSession,
-) -> None:
-    """Сохранить сообщение в БД."""
-    sender = await user_crud.get_user_by_tg_id(session, sender_id)
-    receiver = await user_crud.get_user_by_tg_id(session, recipient_id)
-    dialog = Dialog(
-        sender_id=sender.id,
-        recipient_id=receiver.id,
-        message=text,
-        message_datetime=datetime.now(),
-    )
-    session.add(dialog)
-    await session.commit()
@@ -0,0 +1,487 @@
+"""Нагрузочный прогон бота синтетическими обновлениями.
+
+Собирает Dispatcher из main.py и подаёт ему сообщения и нажатия кнопок
+по реальным сценариям: /start по приглашению, проверка статуса
+стажёром, назначение дорожной карты менеджером и прохождение теста.
+Запросы бота к Telegram API принимает заглушка fake_telegram.py,
+запущенная в этом же процессе по адресу TELEGRAM_API_URL. Нужны
+локальные Postgres и Redis с БД, заполненной фикстурами data_script.py.
+Сценарии меняют данные, поэтому прогон запускают на отдельной БД.
+
+Отчёт: пропускная способность, p50/p99 времени обработки обновления
+и среднее число SQL-запросов на обновление по каждому сценарию.
+
+    export TELEGRAM_API_URL=http://127.0.0.1:8081
+    python load_test.py --updates 5000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import sys
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from aiogram.types import ErrorEvent
+from aiohttp import web
+from sqlalchemy import and_, event, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import aliased
+from yarl import URL
+
+from config import settings
+from engine import engine, session_maker
+from fake_telegram import build_app
+from main import bot, dp
+from manager.callbacks import (
+    ManagerAssignRoadmapCallback,
+    ManagerInternCallback,
+)
+from manager.constants import DATETIME_FORMAT
+from models.constants import UserRole
+from models.models import (
+    InvitationLink,
+    Question,
+    ReferencePoint,
+    TemplateReferencePoint,
+    TemplateRoadMap,
+    Test,
+    User,
+    UserRoadMap,
+)
+
+ACTORS_LIMIT = 1000
+PERCENTILES = (50, 99)
+
+_update_ids = itertools.count(1)
+_message_ids = itertools.count(1)
+# SQL-запросы текущего обновления, считаются только внутри прогона.
+_statements: ContextVar[Optional[list[int]]] = ContextVar(
+    '_statements',
+    default=None,
+)
+
+# Ошибки хендлеров текущего обновления. Обработчик ошибок из main.py
+# помечает их обработанными, и feed_raw_update их не поднимает.
+_errors: ContextVar[Optional[list[int]]] = ContextVar(
+    '_errors',
+    default=None,
+)
+
+
+@event.listens_for(engine.sync_engine, 'after_cursor_execute')
+def _count_statement(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    """Учитывает SQL-запрос в счётчике текущего обновления."""
+    counter = _statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+async def _count_error(
+    handler: Callable[[ErrorEvent, dict[str, Any]], Awaitable[Any]],
+    event: ErrorEvent,
+    data: dict[str, Any],
+) -> Any:
+    """Учитывает ошибку хендлера до обработчиков ошибок бота."""
+    counter = _errors.get()
+    if counter is not None:
+        counter[0] += 1
+    return await handler(event, data)
+
+
+dp.errors.outer_middleware(_count_error)
+
+
+@dataclass
+class Actors:
+    """Пользователи и объекты БД, от имени которых идут сценарии."""
+
+    interns: list[int]
+    invitations: list[tuple[int, str]]
+    assignments: list[tuple[int, int, int]]
+    tests: list[tuple[int, int, int, list[tuple[int, int]]]]
+
+
+@dataclass
+class ScenarioStats:
+    """Результаты обработки обновлений одного сценария."""
+
+    latencies: list[float] = field(default_factory=list)
+    statements: list[int] = field(default_factory=list)
+    errors: int = 0
+
+
+def _user(tg_id: int) -> dict[str, Any]:
+    """Отправитель обновления."""
+    return {'id': tg_id, 'is_bot': False, 'first_name': f'load{tg_id}'}
+
+
+def _chat_message(tg_id: int, text: str) -> dict[str, Any]:
+    """Сообщение в личном чате с ботом."""
+    return {
+        'message_id': next(_message_ids),
+        'date': int(time.time()),
+        'chat': {'id': tg_id, 'type': 'private'},
+        'from': _user(tg_id),
+        'text': text,
+    }
+
+
+def message_update(tg_id: int, text: str) -> dict[str, Any]:
+    """Обновление с текстовым сообщением пользователя."""
+    return {
+        'update_id': next(_update_ids),
+        'message': _chat_message(tg_id, text),
+    }
+
+
+def callback_update(tg_id: int, data: str) -> dict[str, Any]:
+    """Обновление с нажатием inline-кнопки под сообщением бота."""
+    return {
+        'update_id': next(_update_ids),
+        'callback_query': {
+            'id': str(next(_update_ids)),
+            'from': _user(tg_id),
+            'chat_instance': str(tg_id),
+            'message': _chat_message(tg_id, 'load'),
+            'data': data,
+        },
+    }
+
+
+def start_invitation(
+    actors: Actors,
+    rng: random.Random,
+) -> tuple[int, list[dict]]:
+    """Переход по пригласительной ссылке."""
+    tg_id, token = rng.choice(actors.invitations)
+    return tg_id, [message_update(tg_id, f'/start {token}')]
+
+
+def intern_status(
+    actors: Actors,
+    rng: random.Random,
+) -> tuple[int, list[dict]]:
+    """Стажёр смотрит статус дорожной карты и текущую точку."""
+    tg_id = rng.choice(actors.interns)
+    return tg_id, [
+        message_update(tg_id, 'Посмотреть статус дорожной карты'),
+        message_update(tg_id, 'Посмотреть текущую контрольную точку'),
+    ]
+
+
+def manager_assign_roadmap(
+    actors: Actors,
+    rng: random.Random,
+) -> tuple[int, list[dict]]:
+    """Менеджер начинает назначать стажёру карту и отменяет ввод сроков."""
+    tg_id, intern_id, template_id = rng.choice(actors.assignments)
+    trigger_time = (datetime.now() + timedelta(days=1)).strftime(
+        DATETIME_FORMAT,
+    )
+    return tg_id, [
+        callback_update(tg_id, ManagerInternCallback(
+            action='manager_intern_create_roadmap',
+            intern_id=intern_id,
+        ).pack()),
+        callback_update(tg_id, ManagerAssignRoadmapCallback(
+            templateroadmap_id=template_id,
+            intern_id=intern_id,
+            action='assign_roadmap',
+        ).pack()),
+        message_update(tg_id, trigger_time),
+        callback_update(tg_id, ManagerInternCallback(
+            action='cancel_roadmap',
+            intern_id=intern_id,
+        ).pack()),
+    ]
+
+
+def test_attempt(
+    actors: Actors,
+    rng: random.Random,
+) -> tuple[int, list[dict]]:
+    """Стажёр начинает тест и отвечает на все вопросы по порядку.
+
+    Пройденный тест второй раз не начать, поэтому каждая контрольная
+    точка берётся в прогон один раз.
+    """
+    tg_id, ref_point_id, test_id, questions = actors.tests.pop(
+        rng.randrange(len(actors.tests)),
+    )
+    return tg_id, [
+        callback_update(tg_id, f'handle_start_test:{ref_point_id}'),
+        *(
+            callback_update(
+                tg_id,
+                f'answer:{test_id}:{question_id}:{rng.randint(1, answers)}',
+            )
+            for question_id, answers in questions
+        ),
+    ]
+
+
+# Сценарий: (вес при выборе, поле Actors, генератор обновлений).
+SCENARIOS: dict[
+    str,
+    tuple[int, str, Callable[[Actors, random.Random], tuple[int, list]]],
+] = {
+    'start_invitation': (1, 'invitations', start_invitation),
+    'intern_status': (4, 'interns', intern_status),
+    'manager_assign_roadmap': (2, 'assignments', manager_assign_roadmap),
+    'test_attempt': (3, 'tests', test_attempt),
+}
+
+
+async def load_actors() -> Actors:
+    """Выбирает из БД пользователей для сценариев."""
+    intern = aliased(User)
+    async with session_maker() as session:
+        interns = (await session.execute(
+            select(User.tg_id)
+            .join(UserRoadMap, UserRoadMap.user_id == User.id)
+            .where(User.role == UserRole.USER, User.is_active)
+            .limit(ACTORS_LIMIT),
+        )).scalars().all()
+        invitations = (await session.execute(
+            select(User.tg_id, InvitationLink.link_token)
+            .join(InvitationLink, InvitationLink.user_id == User.id)
+            .limit(ACTORS_LIMIT),
+        )).all()
+        assignments = (await session.execute(
+            select(User.tg_id, intern.id, TemplateRoadMap.id)
+            .join(intern, intern.manager_id == User.id)
+            .join(
+                TemplateRoadMap,
+                and_(
+                    TemplateRoadMap.restaurant_id == User.restaurant_id,
+                    TemplateRoadMap.is_blocked.is_(False),
+                ),
+            )
+            .where(
+                User.role == UserRole.MANAGER,
+                User.is_active,
+                select(TemplateReferencePoint.id)
+                .where(
+                    TemplateReferencePoint.templateroadmap_id
+                    == TemplateRoadMap.id,
+                )
+                .exists(),
+            )
+            .limit(ACTORS_LIMIT),
+        )).all()
+        tests = (await session.execute(
+            select(
+                User.tg_id,
+                ReferencePoint.id,
+                Test.id,
+                func.array_agg(aggregate_order_by(Question.id, Question.id)),
+                func.array_agg(
+                    aggregate_order_by(
+                        func.cardinality(Question.answers),
+                        Question.id,
+                    ),
+                ),
+            )
+            .join(UserRoadMap, UserRoadMap.user_id == User.id)
+            .join(
+                ReferencePoint,
+                ReferencePoint.roadmap_id == UserRoadMap.roadmap_id,
+            )
+            .join(Test, Test.referencepoint_id == ReferencePoint.id)
+            .join(Question, Question.test_id == Test.id)
+            .where(ReferencePoint.is_completed.is_(False))
+            .group_by(User.tg_id, ReferencePoint.id, Test.id)
+            .limit(ACTORS_LIMIT),
+        )).all()
+    return Actors(
+        interns=list(interns),
+        invitations=[tuple(row) for row in invitations],
+        assignments=[tuple(row) for row in assignments],
+        tests=[
+            (tg_id, ref_point_id, test_id, list(zip(question_ids, answers)))
+            for tg_id, ref_point_id, test_id, question_ids, answers in tests
+        ],
+    )
+
+
+def plan_runs(
+    actors: Actors,
+    updates: int,
+    rng: random.Random,
+) -> list[tuple[str, int, list[dict]]]:
+    """Составляет очередь сценариев на заданное число обновлений."""
+    available = {
+        name: (weight, build)
+        for name, (weight, source, build) in SCENARIOS.items()
+        if getattr(actors, source)
+    }
+    for name in SCENARIOS.keys() - available.keys():
+        print(f'Сценарий {name} пропущен: в БД нет подходящих данных')
+    if not available:
+        return []
+    runs = []
+    planned = 0
+    while planned < updates and available:
+        names = list(available)
+        weights = [available[name][0] for name in names]
+        name = rng.choices(names, weights)[0]
+        tg_id, scenario_updates = available[name][1](actors, rng)
+        runs.append((name, tg_id, scenario_updates))
+        planned += len(scenario_updates)
+        if not getattr(actors, SCENARIOS[name][1]):
+            # Сценарий израсходовал свои данные (тесты проходят один раз).
+            del available[name]
+    return runs
+
+
+async def feed(update: dict, stats: ScenarioStats) -> None:
+    """Передаёт обновление диспетчеру и учитывает время и запросы."""
+    counter = [0]
+    errors = [0]
+    token = _statements.set(counter)
+    errors_token = _errors.set(errors)
+    started = time.perf_counter()
+    try:
+        await dp.feed_raw_update(bot, update)
+    except Exception:
+        # Ошибка, не обработанная ботом, уже учтена в _count_error.
+        errors[0] = max(errors[0], 1)
+    finally:
+        stats.latencies.append(time.perf_counter() - started)
+        stats.statements.append(counter[0])
+        stats.errors += errors[0]
+        _statements.reset(token)
+        _errors.reset(errors_token)
+
+
+async def run_load(
+    runs: list[tuple[str, int, list[dict]]],
+    concurrency: int,
+) -> dict[str, ScenarioStats]:
+    """Прогоняет сценарии в concurrency параллельных потоках.
+
+    Обновления одного пользователя идут строго по очереди, как в
+    Telegram, иначе сценарии с FSM мешали бы друг другу.
+    """
+    results: dict[str, ScenarioStats] = defaultdict(ScenarioStats)
+    locks: dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+    queue: asyncio.Queue = asyncio.Queue()
+    for run in runs:
+        queue.put_nowait(run)
+
+    async def worker() -> None:
+        while not queue.empty():
+            name, tg_id, updates = queue.get_nowait()
+            async with locks[tg_id]:
+                for update in updates:
+                    await feed(update, results[name])
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+def percentile(values: list[float], percent: int) -> float:
+    """Перцентиль по ближайшему рангу."""
+    ordered = sorted(values)
+    index = max(0, -(-len(ordered) * percent // 100) - 1)
+    return ordered[index]
+
+
+def report(results: dict[str, ScenarioStats], elapsed: float) -> None:
+    """Печатает результаты прогона по сценариям и в целом."""
+    total = ScenarioStats()
+    for stats in results.values():
+        total.latencies.extend(stats.latencies)
+        total.statements.extend(stats.statements)
+        total.errors += stats.errors
+    header = f'{"сценарий":<24}{"обновл.":>9}{"ошибок":>8}'
+    header += ''.join(f'{f"p{p}, мс":>11}' for p in PERCENTILES)
+    header += f'{"SQL/обновл.":>13}'
+    print(header)
+    for name, stats in [*sorted(results.items()), ('всего', total)]:
+        if not stats.latencies:
+            continue
+        line = (
+            f'{name:<24}{len(stats.latencies):>9}{stats.errors:>8}'
+        )
+        line += ''.join(
+            f'{percentile(stats.latencies, p) * 1000:>11.1f}'
+            for p in PERCENTILES
+        )
+        line += f'{sum(stats.statements) / len(stats.statements):>13.2f}'
+        print(line)
+    print(
+        f'Пропускная способность: '
+        f'{len(total.latencies) / elapsed:.1f} обновлений/с '
+        f'за {elapsed:.1f} с',
+    )
+
+
+async def load_test(updates: int, concurrency: int, seed: int) -> int:
+    """Запускает заглушку API и бота, прогоняет сценарии.
+
+    Возвращает число обновлений, завершившихся ошибкой.
+    """
+    api_url = URL(settings.TELEGRAM_API_URL)
+    runner = web.AppRunner(build_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, api_url.host, api_url.port).start()
+    workflow_data = {
+        'dispatcher': dp,
+        'bots': [bot],
+        **dp.workflow_data,
+        'is_primary_worker': False,
+    }
+    await dp.emit_startup(bot=bot, **workflow_data)
+    try:
+        actors = await load_actors()
+        runs = plan_runs(actors, updates, random.Random(seed))
+        started = time.perf_counter()
+        results = await run_load(runs, concurrency)
+        elapsed = time.perf_counter() - started
+    finally:
+        await dp.emit_shutdown(bot=bot, **workflow_data)
+        await bot.session.close()
+        await runner.cleanup()
+        await engine.dispose()
+    if not results:
+        print('Нет данных для сценариев, заполните БД: data_script.py')
+        return 0
+    report(results, elapsed)
+    return sum(stats.errors for stats in results.values())
+
+
+def main() -> None:
+    """Точка входа нагрузочного прогона."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--updates', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if not settings.TELEGRAM_API_URL:
+        sys.exit('Укажите TELEGRAM_API_URL, например http://127.0.0.1:8081')
+    errors = asyncio.run(
+        load_test(args.updates, args.concurrency, args.seed),
+    )
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,28 +1,80 @@
 import asyncio
 import logging
+from typing import Optional
 
 from aiogram import Bot, Dispatcher, types
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.fsm.storage.redis import RedisStorage
+from aiohttp import web
 
 from admin.routers import admin_router
-from common import start_help_router
+from common import inline_search_router, start_help_router
 from config import configure_logging, settings
 from intern.handlers import intern_router
 from manager.handlers import manager_router
-from middlewares import DataBaseSession, RoleCheckMiddleware
+from middlewares import (
+    DataBaseSession,
+    HandlerNameMiddleware,
+    RoleCheckMiddleware,
+    TelegramApiStatsMiddleware,
+    UpdateStatsMiddleware,
+)
 from models.constants import UserRole
+from services.dialog_writer import DialogWriter
+from services.metrics import start_metrics_server
+from services.scheduler import ReferencePointScheduler
+from services.sender import SendQueue
+from services.webhook import run_webhook, set_webhook
 
 redis_storage_url = settings.redis_url
 
-bot = Bot(settings.TOKEN)
-dp = Dispatcher(storage=RedisStorage.from_url(url=redis_storage_url))
+# TELEGRAM_API_URL позволяет подключить бота к локальной заглушке API
+bot = Bot(
+    settings.TOKEN,
+    session=AiohttpSession(
+        api=TelegramAPIServer.from_base(settings.TELEGRAM_API_URL),
+    ) if settings.TELEGRAM_API_URL else None,
+)
+# все исходящие сообщения идут через очередь с лимитами Telegram,
+# в хендлерах она доступна как sender
+sender = SendQueue(bot, processes=settings.bot_processes)
+# один планировщик на все процессы бота, раз в тик запускает диспетчер точек
+scheduler = ReferencePointScheduler(sender)
+# переписка пишется в БД пачками, в хендлерах доступна как dialog_writer
+dialog_writer = DialogWriter()
+dp = Dispatcher(
+    storage=RedisStorage.from_url(url=redis_storage_url),
+    sender=sender,
+    dialog_writer=dialog_writer,
+    is_primary_worker=True,
+    worker_index=0,
+)
 
+# стоимость обработки обновления: SQL, Telegram API и общее время
+dp.update.outer_middleware(UpdateStatsMiddleware())
+dp.message.middleware(HandlerNameMiddleware())
+dp.callback_query.middleware(HandlerNameMiddleware())
+dp.inline_query.middleware(HandlerNameMiddleware())
+bot.session.middleware(TelegramApiStatsMiddleware())
 dp.update.middleware(DataBaseSession())
 
 # общие команды только для зарегистрированных в БД пользователей
 start_help_router.message.middleware(RoleCheckMiddleware())
 start_help_router.callback_query.middleware(RoleCheckMiddleware())
 
+# поиск в inline-режиме для админа и манагера, выдача зависит от роли
+inline_search_router.inline_query.middleware(
+    RoleCheckMiddleware(
+        allowed_roles=[UserRole.ADMIN, UserRole.MANAGER],
+    ),
+)
+inline_search_router.callback_query.middleware(
+    RoleCheckMiddleware(
+        allowed_roles=[UserRole.ADMIN, UserRole.MANAGER],
+    ),
+)
+
 # команды манагера только для манагера
 manager_router.message.middleware(
     RoleCheckMiddleware(
@@ -67,6 +119,7 @@ dp.include_router(start_help_router)
 dp.include_router(intern_router)
 dp.include_router(manager_router)
 dp.include_router(admin_router)
+dp.include_router(inline_search_router)
 
 
 @dp.errors()
@@ -81,6 +134,8 @@ async def handle_unauthorized_error(
             await event.update.message.answer(
                 '⛔️ Доступ запрещён',
             )
+        elif event.update.inline_query:
+            await event.update.inline_query.answer([], is_personal=True)
         return True
 
     configure_logging()
@@ -92,6 +147,32 @@ async def handle_unauthorized_error(
     return False
 
 
+@dp.startup()
+async def on_startup(is_primary_worker: bool, worker_index: int) -> None:
+    """Запускает очередь отправки, планировщик и сервер метрик."""
+    sender.start()
+    dp['metrics_runner'] = await start_metrics_server(worker_index)
+    if is_primary_worker:
+        scheduler.start()
+        if settings.BOT_MODE == 'webhook':
+            await set_webhook(dp, bot)
+
+
+@dp.shutdown()
+async def on_shutdown(
+    metrics_runner: Optional[web.AppRunner] = None,
+) -> None:
+    """Останавливает планировщик, очередь отправки и сервер метрик.
+
+    Недописанная переписка сохраняется в БД.
+    """
+    scheduler.shutdown()
+    await sender.close()
+    await dialog_writer.close()
+    if metrics_runner is not None:
+        await metrics_runner.cleanup()
+
+
 async def main() -> None:
     """Главная функция создающая базу данных и асинхронные сессии.
 
@@ -102,7 +183,10 @@ async def main() -> None:
 
 # Временное решение: прерывание бота с Ctrl+C.
 if __name__ == '__main__':
-    try:
-        asyncio.run(main())
-    except KeyboardInterrupt:
-        print('Бот остановлен.')
+    if settings.BOT_MODE == 'webhook':
+        run_webhook(dp, bot)
+    else:
+        try:
+            asyncio.run(main())
+        except KeyboardInterrupt:
+            print('Бот остановлен.')
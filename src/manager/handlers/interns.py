@@ -1,8 +1,7 @@
-from aiogram import Bot, F, Router, types
+from aiogram import F, Router, types
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from crud.roadmap import roadmap_crud
 from crud.users import user_crud
 from manager.callbacks import (
     ManagerInternCallback,
@@ -24,8 +23,14 @@ from manager.keyboards.interns import (
     get_intern_keyboard,
     get_interns_actions_keyboard,
 )
+from manager.render import edit_text_if_changed
 from manager.states import ManagerMessage
 from models.models import User
+from services.dialog_writer import DialogWriter
+from services.pagination import PageCallback, page_bounds, page_buttons
+from services.progress import get_intern_progress
+from services.sender import SendPriority, SendQueue
+from services.user_cache import CachedUser
 
 router = Router()
 
@@ -36,21 +41,54 @@ router = Router()
 async def get_interns(
     callback: types.CallbackQuery,
     session: AsyncSession,
-    user: User,
+    user: CachedUser,
 ) -> None:
     """Обработка кнопки управления Стажёрами."""
-    interns = await user_crud.get_managers_interns(user.id, session)
+    page = await user_crud.get_page(
+        session,
+        filters=(User.manager_id == user.id,),
+    )
 
-    if not interns:
+    if not page.items:
         text = ('<b>За Вами не закреплены Стажёры!</b>\n\n'
                 'Обратитесь к администратору.')
     else:
         text = 'Выберите Стажёра\n\n<b>Ваши Стажёры:</b>'
 
-    await callback.message.edit_text(
+    await edit_text_if_changed(
+        callback.message,
         text,
         parse_mode='HTML',
-        reply_markup=get_intern_keyboard(interns),
+        reply_markup=get_intern_keyboard(
+            page.items,
+            page_buttons('manager_interns', page),
+        ),
+    )
+    await callback.answer()
+
+
+@router.callback_query(PageCallback.filter(F.picker == 'manager_interns'))
+async def turn_interns_page(
+    callback: types.CallbackQuery,
+    callback_data: PageCallback,
+    session: AsyncSession,
+    user: CachedUser,
+) -> None:
+    """Листание списка Стажёров."""
+    page = await user_crud.get_page(
+        session,
+        filters=(User.manager_id == user.id,),
+        **page_bounds(callback_data),
+    )
+    if not page.items:
+        await callback.answer()
+        return
+
+    await callback.message.edit_reply_markup(
+        reply_markup=get_intern_keyboard(
+            page.items,
+            page_buttons('manager_interns', page),
+        ),
     )
     await callback.answer()
 
@@ -73,7 +111,8 @@ async def process_intern_select(
     if not intern:
         return
 
-    await callback.message.edit_text(
+    await edit_text_if_changed(
+        callback.message,
         text=CHOOSE_ACTION_STRING.format(
             name=intern.first_name,
             surname=intern.last_name,
@@ -108,7 +147,8 @@ async def write_message_to_intern(
 
     if not intern:
         return
-    await callback.message.edit_text(
+    await edit_text_if_changed(
+        callback.message,
         text=ENTER_YOUR_MESSAGE,
         parse_mode='HTML',
         reply_markup=get_intern_answer_on_action(
@@ -119,6 +159,7 @@ async def write_message_to_intern(
     )
     await callback.answer()
     await state.update_data(
+        intern_id=callback_data.intern_id,
         intern_tg_id=intern_tg_id,
         intern_first_name=intern.first_name,
         intern_last_name=intern.last_name,
@@ -128,14 +169,18 @@ async def write_message_to_intern(
 
 @router.message(ManagerMessage.message, F.text)
 async def get_manager_message(
-    message: types.Message, state: FSMContext,
+    message: types.Message,
+    state: FSMContext,
+    sender: SendQueue,
+    dialog_writer: DialogWriter,
+    user: CachedUser,
 ) -> None:
     """Метод отправляет сообщения менеджера стажеру."""
     await state.update_data(message=message.text)
     manager_message = await state.get_data()
     await state.clear()
     await message.delete()
-    await message.bot.send_message(
+    await sender.send_message(
         manager_message['intern_tg_id'],
         INTERN_MESSAGE.format(
             name=manager_message['intern_first_name'],
@@ -143,6 +188,11 @@ async def get_manager_message(
             message=manager_message['message'],
         ),
     )
+    dialog_writer.write(
+        user.id,
+        manager_message['intern_id'],
+        manager_message['message'],
+    )
     await message.answer('Сообщение было успешно отправлено!')
 
 
@@ -163,7 +213,8 @@ async def management_intern(
     if not intern:
         return
 
-    await callback.message.edit_text(
+    await edit_text_if_changed(
+        callback.message,
         text=CHOOSE_ACTION_STRING.format(
             name=intern.first_name,
             surname=intern.last_name,
@@ -191,7 +242,8 @@ async def ban_intern(
     )
     if not intern:
         return
-    await callback.message.edit_text(
+    await edit_text_if_changed(
+        callback.message,
         text=INTERN_BANNED.format(
             name=intern.first_name,
             surname=intern.last_name,
@@ -222,7 +274,8 @@ async def end_education_intern(
     )
     if not intern:
         return
-    await callback.message.edit_text(
+    await edit_text_if_changed(
+        callback.message,
         text=INTERN_END_EDUCATION.format(
             name=intern.first_name,
             surname=intern.last_name,
@@ -246,17 +299,11 @@ async def education_progress(
     session: AsyncSession,
 ) -> None:
     """Метод проверки прогресса обучения стажера."""
-    roadmap = await roadmap_crud.get_users_roadmap(
-        callback_data.intern_id, session,
-    )
-    intern = await user_crud.get(
-            obj_id=callback_data.intern_id,
-            session=session,
-        )
+    intern = await get_intern_progress(callback_data.intern_id, session)
     if not intern:
         return
 
-    if not roadmap:
+    if intern.roadmap_id is None:
         list_of_points = INTERN_HASNT_EDUCATION.format(
             name=intern.first_name,
             surname=intern.last_name,
@@ -265,10 +312,10 @@ async def education_progress(
         list_of_points = INTERN_SCALE_ROADMAP.format(
             name=intern.first_name,
             surname=intern.last_name,
-            roadmap_name=roadmap.name,
+            roadmap_name=intern.roadmap_name,
         )
 
-        for reference_point in roadmap.get_all_points:
+        for reference_point in intern.points:
             list_of_points = (
                 ' '.join((
                     list_of_points,
@@ -281,7 +328,8 @@ async def education_progress(
                 ))
             )
 
-    await callback.message.edit_text(
+    await edit_text_if_changed(
+        callback.message,
         text=list_of_points,
         parse_mode='HTML',
         reply_markup=get_intern_answer_on_action(
@@ -294,17 +342,18 @@ async def education_progress(
 
 
 async def intern_missed_deadline(
-    bot: Bot,
+    sender: SendQueue,
     manager_tg_id: int,
     reference_point_name: str,
     name: str,
     surname: str,
 ) -> types.Message:
     """Отправляет уведомление менеджеру, что стажер просрочил задание."""
-    await bot.send_message(
+    await sender.send_message(
         manager_tg_id, INTERN_MISSED_DEADLINE.format(
             name=name,
             surname=surname,
             reference_point_name=reference_point_name,
         ),
+        priority=SendPriority.DEADLINE,
     )
@@ -2,6 +2,7 @@ from aiogram import F, Router, types
 
 from manager.callbacks import ManagerStartCallback
 from manager.keyboards.manager_menu import get_manager_start_menu
+from manager.render import edit_text_if_changed
 
 router = Router()
 
@@ -19,7 +20,8 @@ async def manager_menu(
             reply_markup=get_manager_start_menu(),
         )
     else:
-        await target.message.edit_text(
+        await edit_text_if_changed(
+            target.message,
             text,
             parse_mode='HTML',
             reply_markup=get_manager_start_menu(),
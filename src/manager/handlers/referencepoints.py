@@ -16,6 +16,7 @@ from manager.keyboards.referencepoints import (
     referencepoint_editor_cancel_keyboard,
     select_referencepoint_keyboard,
 )
+from manager.render import edit_message_text
 from manager.states import EditReferencepointStates
 from manager.utils import (
     generate_datetime_prompt,
@@ -24,6 +25,7 @@ from manager.utils import (
 )
 from models.constants import ReferencePointType
 from models.models import Notification, ReferencePoint
+from services.progress import invalidate_roadmap_progress
 
 router = Router()
 
@@ -72,7 +74,7 @@ async def manager_select_referencepoint(
     referencepoint = await referencepoint_crud.get(
         callback_data.referencepoint_id,
         session,
-        load_relations=True,
+        plan='editor',
     )
 
     if not referencepoint:
@@ -153,7 +155,7 @@ async def manager_block_referencepoint(
     referencepoint = await referencepoint_crud.get(
         callback_data.referencepoint_id,
         session,
-        relations_to_upload=[ReferencePoint.notification],
+        plan='editor',
     )
 
     if not referencepoint:
@@ -162,6 +164,7 @@ async def manager_block_referencepoint(
     new_block_status = not referencepoint.is_blocked
     referencepoint.is_blocked = new_block_status
     await session.commit()
+    await invalidate_roadmap_progress(referencepoint.roadmap_id)
 
     await state.update_data(is_blocked=new_block_status)
     state_data = await state.get_data()
@@ -198,7 +201,7 @@ async def manager_edit_notification_text(
     referencepoint = await referencepoint_crud.get(
         callback_data.referencepoint_id,
         session,
-        relations_to_upload=[ReferencePoint.notification],
+        plan='editor',
     )
 
     if not referencepoint:
@@ -255,7 +258,7 @@ async def manager_process_new_referencepoint_name(
     referencepoint = await referencepoint_crud.get(
         obj_id=data['referencepoint_id'],
         session=session,
-        relations_to_upload=[ReferencePoint.notification],
+        plan='editor',
     )
 
     if not referencepoint or not message.text:
@@ -265,9 +268,11 @@ async def manager_process_new_referencepoint_name(
     new_name = message.text.strip()
     referencepoint.name = new_name
     await session.commit()
+    await invalidate_roadmap_progress(referencepoint.roadmap_id)
     await message.delete()
 
-    await message.bot.edit_message_text(
+    await edit_message_text(
+        message.bot,
         chat_id=message.chat.id,
         message_id=data['editor_message_id'],
         text=generate_referencepoint_text(
@@ -297,7 +302,7 @@ async def manager_process_new_notification_text(
     referencepoint = await referencepoint_crud.get(
         data['referencepoint_id'],
         session,
-        relations_to_upload=[ReferencePoint.notification],
+        plan='editor',
     )
 
     if not referencepoint or not message.text:
@@ -313,7 +318,8 @@ async def manager_process_new_notification_text(
     await session.commit()
     await message.delete()
 
-    await message.bot.edit_message_text(
+    await edit_message_text(
+        message.bot,
         chat_id=message.chat.id,
         message_id=data['editor_message_id'],
         text=generate_referencepoint_text(
@@ -434,7 +440,7 @@ async def manager_process_trigger_datetime(
     referencepoint = await referencepoint_crud.get(
         obj_id=data['referencepoint_id'],
         session=session,
-        relations_to_upload=[ReferencePoint.notification],
+        plan='editor',
     )
 
     if not referencepoint:
@@ -459,7 +465,8 @@ async def manager_process_trigger_datetime(
             changes=True,
         )
 
-        await message.bot.edit_message_text(
+        await edit_message_text(
+            message.bot,
             chat_id=message.chat.id,
             message_id=data['editor_message_id'],
             text=text,
@@ -481,7 +488,8 @@ async def manager_process_trigger_datetime(
             '<i>Введите новую дату в формате ДД.ММ.ГГГГ ЧЧ:ММ</i>'
             '\n\n❌ Неверный формат даты'
         )
-        await message.bot.edit_message_text(
+        await edit_message_text(
+            message.bot,
             chat_id=message.chat.id,
             message_id=data['editor_message_id'],
             text=error_text,
@@ -506,7 +514,7 @@ async def manager_process_check_datetime(
     referencepoint = await referencepoint_crud.get(
         obj_id=data['referencepoint_id'],
         session=session,
-        relations_to_upload=[ReferencePoint.notification],
+        plan='editor',
     )
 
     if not referencepoint:
@@ -541,7 +549,8 @@ async def manager_process_check_datetime(
             changes=True,
         )
 
-        await message.bot.edit_message_text(
+        await edit_message_text(
+            message.bot,
             chat_id=message.chat.id,
             message_id=data['editor_message_id'],
             text=text,
@@ -564,7 +573,8 @@ async def manager_process_check_datetime(
             f'<i>Или введите "{SKIP_COMMAND}" чтобы оставить пустым</i>'
             '\n\n❌ Неверный формат даты'
         )
-        await message.bot.edit_message_text(
+        await edit_message_text(
+            message.bot,
             chat_id=message.chat.id,
             message_id=data['editor_message_id'],
             text=error_text,
@@ -587,7 +597,7 @@ async def manager_process_reminder_days(
     referencepoint = await referencepoint_crud.get(
         obj_id=data['referencepoint_id'],
         session=session,
-        relations_to_upload=[ReferencePoint.notification],
+        plan='editor',
     )
 
     if not referencepoint:
@@ -608,7 +618,8 @@ async def manager_process_reminder_days(
             changes=True,
         )
 
-        await message.bot.edit_message_text(
+        await edit_message_text(
+            message.bot,
             chat_id=message.chat.id,
             message_id=data['editor_message_id'],
             text=text,
@@ -627,7 +638,8 @@ async def manager_process_reminder_days(
             '<i>Введите число от 0 до 365:</i>'
             '\n\n❌ Некорректное значение'
         )
-        await message.bot.edit_message_text(
+        await edit_message_text(
+            message.bot,
             chat_id=message.chat.id,
             message_id=data['editor_message_id'],
             text=error_text,
@@ -654,6 +666,12 @@ async def update_referencepoint_from_data(
     await update_datetime_field(referencepoint, 'trigger_datetime', data)
     await update_datetime_field(referencepoint, 'check_datetime', data)
 
+    # Новые сроки снова ставят точку в очередь диспетчера.
+    if 'trigger_datetime' in data:
+        referencepoint.is_sent = False
+    if 'check_datetime' in data:
+        referencepoint.is_overdue_notified = False
+
     if (referencepoint.point_type == ReferencePointType.NOTIFICATION
             and 'new_notification_text' in data):
         if not referencepoint.notification:
@@ -693,7 +711,7 @@ async def manager_save_referencepoint(
     referencepoint = await referencepoint_crud.get(
         callback_data.referencepoint_id,
         session,
-        relations_to_upload=[ReferencePoint.notification],
+        plan='editor',
     )
 
     if not referencepoint:
@@ -703,6 +721,7 @@ async def manager_save_referencepoint(
     await update_referencepoint_from_data(referencepoint, data)
 
     await session.commit()
+    await invalidate_roadmap_progress(referencepoint.roadmap_id)
     await state.clear()
 
     await callback.answer('✅ Изменения сохранены!', show_alert=True)
@@ -710,7 +729,7 @@ async def manager_save_referencepoint(
     referencepoint = await referencepoint_crud.get(
         callback_data.referencepoint_id,
         session,
-        relations_to_upload=[ReferencePoint.notification],
+        plan='editor',
     )
 
     text = generate_referencepoint_text(
@@ -2,26 +2,20 @@ from datetime import datetime
 
 from aiogram import F, Router, types
 from aiogram.fsm.context import FSMContext
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy import false
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from crud import (
     roadmap_crud,
-    template_notification_crud,
     template_reference_point_crud,
     template_roadmap_crud,
-    user_crud,
 )
-from intern.handlers.notifications import handle_reference_point_type
-from intern.utils import get_active_reference_point_for_user
 from manager.callbacks import (
     ManagerAssignRoadmapCallback,
     ManagerInternCallback,
     ManagerRoadmapCallback,
 )
 from manager.constants import DATETIME_FORMAT, ERROR_MESSAGES, SKIP_COMMAND
-from manager.handlers.interns import intern_missed_deadline
 from manager.keyboards.roadmaps import (
     assign_templateroadmap_keyboard,
     get_roadmap_editor_menu_keyboard,
@@ -29,6 +23,7 @@ from manager.keyboards.roadmaps import (
     referencepoints_finish_upload_keyboard,
     roadmap_editor_cancel_keyboard,
 )
+from manager.render import edit_message_text
 from manager.states import AssignRoadmapStates, EditRoadmapStates
 from manager.utils import (
     generate_referencepoint_creator_text,
@@ -39,16 +34,9 @@ from manager.utils import (
     process_roadmap_field_update,
     send_or_edit_message,
 )
-from models.constants import ReferencePointType
-from models.models import (
-    Notification,
-    ReferencePoint,
-    RoadMap,
-    TemplateReferencePoint,
-    TemplateRoadMap,
-    User,
-    UserRoadMap,
-)
+from models.models import TemplateReferencePoint, TemplateRoadMap
+from services.progress import invalidate_roadmap_progress
+from services.user_cache import CachedUser
 
 from .interns import process_intern_select
 
@@ -62,7 +50,7 @@ async def manager_select_templateroadmap(
     callback: types.CallbackQuery,
     callback_data: ManagerInternCallback,
     session: AsyncSession,
-    user: User,
+    user: CachedUser,
 ) -> None:
     """Выбор доступного шаблона дорожной карты для назначения Стажёру."""
     templateroadmaps = (
@@ -108,6 +96,7 @@ async def manager_assign_roadmap_to_intern(
         callback_data.templateroadmap_id,
         session,
         callback=callback,
+        plan=None,
     )
 
     if not templateroadmap:
@@ -152,7 +141,8 @@ async def referencepoint_data_input(
         )
         text += '\n✅ Все точки успешно добавлены!'
 
-        await message.bot.edit_message_text(
+        await edit_message_text(
+            message.bot,
             chat_id=message.chat.id,
             message_id=data['last_bot_message_id'],
             text=text,
@@ -185,7 +175,8 @@ async def referencepoint_data_input(
         current_field=current_field,
     )
 
-    await message.bot.edit_message_text(
+    await edit_message_text(
+        message.bot,
         chat_id=message.chat.id,
         message_id=data['last_bot_message_id'],
         text=text,
@@ -265,7 +256,8 @@ async def process_reminder_days_input(
             current_field='reminder_days_before',
             error_message=ERROR_MESSAGES[current_error],
         )
-        await message.bot.edit_message_text(
+        await edit_message_text(
+            message.bot,
             chat_id=message.chat.id,
             message_id=data['last_bot_message_id'],
             text=text,
@@ -311,25 +303,9 @@ async def manager_save_roadmap_to_intern(
     data = await state.get_data()
     entered_data = data.get('entered_data', {})
 
-    new_roadmap = RoadMap(
-        name=data['roadmap_name'],
-        description=data['roadmap_description'],
-        is_active=True,
-    )
-    session.add(new_roadmap)
-    await session.flush()
-
-    session.add(UserRoadMap(
-        user_id=data['intern_id'],
-        roadmap=new_roadmap,
-    ))
-
+    schedule = {}
     for index, (point_id, _) in enumerate(data['points_to_process']):
         point_data = entered_data.get(str(index), {})
-        template_point = await template_reference_point_crud.get(
-            point_id,
-            session,
-        )
 
         trigger_time = datetime.strptime(
             point_data['trigger_time'],
@@ -350,76 +326,20 @@ async def manager_save_roadmap_to_intern(
             else None
         )
 
-        reference_point = ReferencePoint(
-            name=template_point.name,
-            point_type=template_point.point_type,
-            order_execution=template_point.order_execution,
-            trigger_datetime=trigger_time,
-            check_datetime=check_datetime,
-            reminder_days_before=reminder_days,
-            roadmap_id=new_roadmap.id,
-        )
-        session.add(reference_point)
-        await session.flush()
-
-        if template_point.point_type == ReferencePointType.NOTIFICATION:
-            template_notification = (
-                await template_notification_crud.get_by_referencepoint_id(
-                    referencepoint_id=template_point.id,
-                    session=session,
-                )
-            )
-
-            if template_notification:
-                new_notification = Notification(
-                    text=template_notification.text,
-                    need_feedback=template_notification.need_feedback,
-                    feedbacks=template_notification.feedbacks or [],
-                    links=template_notification.links or [],
-                    servise_notes=template_notification.servise_notes or [],
-                    referencepoint_id=reference_point.id,
-                )
-                session.add(new_notification)
-
-        intern = await roadmap_crud.get_user_id_by_roadmap_id(
-            new_roadmap.id, session,
-        )
-        new_reference_point = await get_active_reference_point_for_user(
-            intern.id,
-            session,
-        )
-        scheduler = AsyncIOScheduler(timezone=intern.timezone)
-        scheduler.add_job(
-            handle_reference_point_type,
-            'date',
-            run_date=new_reference_point.trigger_datetime,
-            kwargs={
-                'bot': callback.bot,
-                'reference_point': new_reference_point,
-                'user': intern,
-                'scheduler': scheduler,
-            },
-        )
-        if new_reference_point.check_datetime:
-            scheduler.add_job(
-                intern_missed_deadline,
-                'date',
-                run_date=new_reference_point.check_datetime,
-                kwargs={
-                    'bot': callback.message.bot,
-                    'manager_tg_id': await user_crud.get_tgid_by_id(
-                        intern.manager_id, session,
-                    ),
-                    'reference_point_name': new_reference_point.name,
-                    'name':intern.first_name,
-                    'surname': intern.last_name,
-                },
-                id=str(new_reference_point.id),
-            )
-        scheduler.start()
-        await session.commit()
-        await callback.answer('✅ Дорожная карта сохранена!', show_alert=True)
-        await state.clear()
+        schedule[point_id] = {
+            'trigger_datetime': trigger_time,
+            'check_datetime': check_datetime,
+            'reminder_days_before': reminder_days,
+        }
+
+    await roadmap_crud.materialize_from_template(
+        template_id=data['templateroadmap_id'],
+        intern_id=data['intern_id'],
+        schedule=schedule,
+        session=session,
+    )
+    await callback.answer('✅ Дорожная карта сохранена!', show_alert=True)
+    await state.clear()
 
 
 @router.callback_query(
@@ -511,7 +431,7 @@ async def manager_edit_roadmap_name(
     roadmap = await roadmap_crud.get(
         data['roadmap_id'],
         session,
-        load_relations=True,
+        plan='columns',
     )
 
     if not roadmap:
@@ -632,7 +552,11 @@ async def manager_save_roadmap_changes(
 ) -> None:
     """Сохранение изменений дорожной карты стажёра."""
     data = await state.get_data()
-    roadmap = await roadmap_crud.get(data['roadmap_id'], session)
+    roadmap = await roadmap_crud.get(
+        data['roadmap_id'],
+        session,
+        plan='columns',
+    )
 
     if not roadmap:
         await callback.answer(
@@ -647,13 +571,18 @@ async def manager_save_roadmap_changes(
         roadmap.description = data['new_description']
 
     await session.commit()
+    await invalidate_roadmap_progress(roadmap.id)
     await state.clear()
     await callback.answer(
         '✅ Изменения сохранены!',
         show_alert=True,
     )
 
-    roadmap = await roadmap_crud.get(data['roadmap_id'], session)
+    roadmap = await roadmap_crud.get(
+        data['roadmap_id'],
+        session,
+        plan='editor',
+    )
     text = generate_roadmap_editor_text(
         roadmap=roadmap,
         state_data={},
@@ -12,6 +12,7 @@ from manager.keyboards.template_referencepoints import (
     select_templatereferencepoint_keyboard,
     templatereferencepoint_editor_cancel_keyboard,
 )
+from manager.render import edit_message_text
 from manager.states import EditTemplateReferencepointStates
 from manager.utils import (
     generate_referencepoint_text,
@@ -78,7 +79,7 @@ async def manager_select_templatereferencepoint(
     templatereferencepoint = await template_reference_point_crud.get(
         callback_data.templatereferencepoint_id,
         session,
-        load_relations=True,
+        plan='editor',
     )
 
     if not templatereferencepoint:
@@ -159,7 +160,7 @@ async def manager_block_templatereferencepoint(
     templatereferencepoint = await template_reference_point_crud.get(
         callback_data.templatereferencepoint_id,
         session,
-        load_relations=True,
+        plan='editor',
     )
 
     if not templatereferencepoint:
@@ -205,7 +206,7 @@ async def manager_edit_templatenotification_text(
     templatereferencepoint = await template_reference_point_crud.get(
         callback_data.templatereferencepoint_id,
         session,
-        relations_to_upload=[TemplateReferencePoint.notification],
+        plan='editor',
     )
 
     if not templatereferencepoint:
@@ -263,7 +264,7 @@ async def manager_process_new_templatereferencepoint_name(
     templatereferencepoint = await template_reference_point_crud.get(
         obj_id=point_id,
         session=session,
-        relations_to_upload=[TemplateReferencePoint.notification],
+        plan='editor',
     )
 
     if not templatereferencepoint or not message.text:
@@ -275,7 +276,8 @@ async def manager_process_new_templatereferencepoint_name(
     await session.commit()
     await message.delete()
 
-    await message.bot.edit_message_text(
+    await edit_message_text(
+        message.bot,
         chat_id=message.chat.id,
         message_id=data['editor_message_id'],
         text=generate_referencepoint_text(
@@ -304,7 +306,7 @@ async def manager_process_new_notification_text(
     templatereferencepoint = await template_reference_point_crud.get(
         data['templatereferencepoint_id'],
         session,
-        relations_to_upload=[TemplateReferencePoint.notification],
+        plan='editor',
     )
 
     if not templatereferencepoint or not message.text:
@@ -320,7 +322,8 @@ async def manager_process_new_notification_text(
     await session.commit()
     await message.delete()
 
-    await message.bot.edit_message_text(
+    await edit_message_text(
+        message.bot,
         chat_id=message.chat.id,
         message_id=data['editor_message_id'],
         text=generate_referencepoint_text(
@@ -353,7 +356,7 @@ async def manager_save_templatereferencepoint_changes(
     templatereferencepoint = await template_reference_point_crud.get(
         callback_data.templatereferencepoint_id,
         session,
-        relations_to_upload=[TemplateReferencePoint.notification],
+        plan='editor',
     )
 
     if not templatereferencepoint:
@@ -391,7 +394,7 @@ async def manager_save_templatereferencepoint_changes(
     templatereferencepoint = await template_reference_point_crud.get(
         callback_data.templatereferencepoint_id,
         session,
-        load_relations=True,
+        plan='editor',
     )
 
     if not templatereferencepoint:
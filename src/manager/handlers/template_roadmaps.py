@@ -20,7 +20,8 @@ from manager.utils import (
     process_templateroadmap_field_update,
     send_or_edit_message,
 )
-from models.models import TemplateRoadMap, User
+from models.models import TemplateRoadMap
+from services.user_cache import CachedUser
 
 router = Router()
 
@@ -31,7 +32,7 @@ router = Router()
 async def manager_get_templateroadmaps(
     callback: types.CallbackQuery,
     session: AsyncSession,
-    user: User,
+    user: CachedUser,
 ) -> None:
     """Обработка кнопки Управления Шаблонами дорожных карт.
 
@@ -162,6 +163,7 @@ async def manager_edit_templateroadmap_name(
         callback_data.templateroadmap_id,
         session,
         callback=callback,
+        plan=None,
     )
 
     if not templateroadmap:
@@ -206,6 +208,7 @@ async def manager_edit_templateroadmap_description(
         callback_data.templateroadmap_id,
         session,
         callback=callback,
+        plan=None,
     )
     if not templateroadmap:
         return
@@ -313,6 +316,7 @@ async def manager_block_templateroadmap(
     new_block_status = not templateroadmap.is_blocked
     templateroadmap.is_blocked = new_block_status
     await session.commit()
+    await template_roadmap_crud.invalidate_cache()
 
     await state.update_data(is_blocked=new_block_status)
     state_data = await state.get_data()
@@ -353,7 +357,6 @@ async def manager_save_templateroadmap_changes(
     templateroadmap = await template_roadmap_crud.get(
         callback_data.templateroadmap_id,
         session,
-        load_relations=True,
     )
 
     if not templateroadmap:
@@ -371,6 +374,7 @@ async def manager_save_templateroadmap_changes(
         templateroadmap.is_blocked = data['is_blocked']
 
     await session.commit()
+    await template_roadmap_crud.invalidate_cache()
     await state.clear()
     await callback.answer(
         '✅ Изменения сохранены!',
@@ -380,7 +384,7 @@ async def manager_save_templateroadmap_changes(
     templateroadmap = await template_roadmap_crud.get(
         callback_data.templateroadmap_id,
         session,
-        load_relations=True,
+        plan='editor',
     )
 
     if not templateroadmap:
@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Optional
 
-from aiogram.types import InlineKeyboardMarkup
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from intern.callbacks import DialogHistoryCallback
 from manager.callbacks import (
     ManagerInternCallback,
     ManagerStartCallback,
@@ -11,10 +12,14 @@ from manager.constants import (
     BACK,
     BACK_TO_MENU,
 )
+from manager.render import cached_keyboard
 from models.models import User
 
 
-def get_intern_keyboard(interns: List[User]) -> InlineKeyboardMarkup:
+def get_intern_keyboard(
+    interns: List[User],
+    nav_buttons: Optional[List[InlineKeyboardButton]] = None,
+) -> InlineKeyboardMarkup:
     """Клавиатура для выбора Стажёра."""
     builder = InlineKeyboardBuilder()
 
@@ -27,18 +32,24 @@ def get_intern_keyboard(interns: List[User]) -> InlineKeyboardMarkup:
             ),
         )
 
-    builder.button(
-        text=BACK_TO_MENU,
-        callback_data=ManagerStartCallback(
-            action='back_to_menu',
+    builder.adjust(1)
+
+    if nav_buttons:
+        builder.row(*nav_buttons)
+
+    builder.row(
+        InlineKeyboardButton(
+            text=BACK_TO_MENU,
+            callback_data=ManagerStartCallback(
+                action='back_to_menu',
+            ).pack(),
         ),
     )
 
-    builder.adjust(1)
-
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_interns_actions_keyboard(
     intern_id: int,
     intern_has_roadmap: bool = False,
@@ -62,6 +73,11 @@ def get_interns_actions_keyboard(
         ),
     )
 
+    builder.button(
+        text='История переписки',
+        callback_data=DialogHistoryCallback(peer_id=intern_id),
+    )
+
     if intern_has_roadmap:
         builder.button(
             text='Редактировать Дорожную карту',
@@ -105,6 +121,7 @@ def get_interns_actions_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_ban_or_end_education_keyboard(
     intern_id: int,
 ) -> InlineKeyboardMarkup:
@@ -146,6 +163,7 @@ def get_ban_or_end_education_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_intern_answer_on_action(
     intern_id: int, name: str, surname: str,
 ) -> InlineKeyboardMarkup:
@@ -2,8 +2,10 @@ from aiogram.types import InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from manager.callbacks import ManagerStartCallback
+from manager.render import cached_keyboard
 
 
+@cached_keyboard
 def get_manager_start_menu() -> InlineKeyboardMarkup:
     """Стартовая клавиатура Менеджера."""
     builder = InlineKeyboardBuilder()
@@ -14,6 +14,7 @@ from manager.constants import (
     BACK_TO_MENU,
     POINT_TYPE_NAMES,
 )
+from manager.render import cached_keyboard, memoized, snapshot
 from models.constants import ReferencePointType
 from models.models import ReferencePoint
 
@@ -58,6 +59,20 @@ def select_referencepoint_keyboard(
     return builder.as_markup()
 
 
+def _referencepoint_menu_key(
+    referencepoint: ReferencePoint,
+    intern_id: int,
+    changes: bool = False,
+) -> tuple:
+    """Ключ кэша клавиатуры редактора контрольной точки."""
+    return (
+        snapshot(referencepoint, 'is_blocked', 'point_type', 'roadmap_id'),
+        intern_id,
+        changes,
+    )
+
+
+@memoized(_referencepoint_menu_key)
 def get_referencepoint_menu_keyboard(
     referencepoint: ReferencePoint,
     intern_id: int,
@@ -159,6 +174,7 @@ def get_referencepoint_menu_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard
 def referencepoint_editor_cancel_keyboard(
     referencepoint_id: int,
     intern_id: int,
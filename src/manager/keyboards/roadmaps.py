@@ -13,6 +13,7 @@ from manager.constants import (
     BACK,
     BACK_TO_MENU,
 )
+from manager.render import cached_keyboard, memoized, snapshot
 from models.models import RoadMap, TemplateRoadMap
 
 
@@ -52,6 +53,7 @@ def assign_templateroadmap_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard
 def referencepoint_cancel_upload_keyboard(
     intern_id: int,
 ) -> InlineKeyboardMarkup:
@@ -70,6 +72,7 @@ def referencepoint_cancel_upload_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard
 def referencepoints_finish_upload_keyboard(
     intern_id: int,
 ) -> InlineKeyboardMarkup:
@@ -111,6 +114,16 @@ def referencepoints_finish_upload_keyboard(
     return builder.as_markup()
 
 
+def _roadmap_editor_menu_key(
+    roadmap: RoadMap,
+    intern_id: int,
+    changes: bool = False,
+) -> tuple:
+    """Ключ кэша клавиатуры редактора дорожной карты."""
+    return snapshot(roadmap), intern_id, changes
+
+
+@memoized(_roadmap_editor_menu_key)
 def get_roadmap_editor_menu_keyboard(
     roadmap: RoadMap,
     intern_id: int,
@@ -182,6 +195,7 @@ def get_roadmap_editor_menu_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard
 def roadmap_editor_cancel_keyboard(
     intern_id: int,
 
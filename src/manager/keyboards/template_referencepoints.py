@@ -13,6 +13,7 @@ from manager.constants import (
     BACK_TO_MENU,
     POINT_TYPE_NAMES,
 )
+from manager.render import cached_keyboard, memoized, snapshot
 from models.constants import ReferencePointType
 from models.models import TemplateReferencePoint
 
@@ -65,6 +66,23 @@ def select_templatereferencepoint_keyboard(
     return builder.as_markup()
 
 
+def _templatereferencepoint_menu_key(
+        templatereferencepoint: TemplateReferencePoint,
+        changes: bool = False,
+) -> tuple:
+    """Ключ кэша клавиатуры редактора шаблона контрольной точки."""
+    return (
+        snapshot(
+            templatereferencepoint,
+            'is_blocked',
+            'point_type',
+            'templateroadmap_id',
+        ),
+        changes,
+    )
+
+
+@memoized(_templatereferencepoint_menu_key)
 def get_templatereferencepoint_menu_keyboard(
         templatereferencepoint: TemplateReferencePoint,
         changes: bool = False,
@@ -141,6 +159,7 @@ def get_templatereferencepoint_menu_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard
 def templatereferencepoint_editor_cancel_keyboard(
     templatereferencepoint_id: int,
 ) -> InlineKeyboardMarkup:
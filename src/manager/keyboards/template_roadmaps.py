@@ -11,6 +11,7 @@ from manager.constants import (
     BACK,
     BACK_TO_MENU,
 )
+from manager.render import cached_keyboard, memoized, snapshot
 from models.models import TemplateRoadMap
 
 
@@ -43,6 +44,14 @@ def select_templateroadmap_keyboard(
     return builder.as_markup()
 
 
+def _templateroadmap_menu_key(
+        templateroadmap: TemplateRoadMap,
+) -> tuple:
+    """Ключ кэша клавиатуры шаблона дорожной карты."""
+    return snapshot(templateroadmap)
+
+
+@memoized(_templateroadmap_menu_key)
 def get_templateroadmap_menu_keyboard(
         templateroadmap: TemplateRoadMap,
 ) -> InlineKeyboardMarkup:
@@ -83,6 +92,15 @@ def get_templateroadmap_menu_keyboard(
     return builder.as_markup()
 
 
+def _templateroadmap_editor_menu_key(
+        templateroadmap: TemplateRoadMap,
+        changes: bool = False,
+) -> tuple:
+    """Ключ кэша клавиатуры редактора шаблона дорожной карты."""
+    return snapshot(templateroadmap, 'is_blocked'), changes
+
+
+@memoized(_templateroadmap_editor_menu_key)
 def get_templateroadmap_editor_menu_keyboard(
         templateroadmap: TemplateRoadMap,
         changes: bool = False,
@@ -146,6 +164,7 @@ def get_templateroadmap_editor_menu_keyboard(
     return builder.as_markup()
 
 
+@cached_keyboard
 def templateroadmap_editor_cancel_keyboard(
         templateroadmap_id: int,
 ) -> InlineKeyboardMarkup:
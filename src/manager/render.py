@@ -0,0 +1,113 @@
+"""Кэш отрисовки редакторов менеджера.
+
+Текст и клавиатура редактора зависят только от отображаемых полей
+объекта и несохранённых изменений в состоянии FSM. Результат
+запоминается по ключу из id объекта, значений этих полей и изменений,
+поэтому строки и клавиатуры (вместе с упакованными callback data)
+строятся один раз. Отдельной колонки версии у моделей нет, и её
+роль играют сами значения полей: любое изменение даёт новый ключ.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from typing import Any, Callable, Hashable, Iterable, Optional, TypeVar
+
+from aiogram import Bot, types
+from aiogram.exceptions import TelegramBadRequest
+
+from config import settings
+
+Render = TypeVar('Render', bound=Callable[..., Any])
+
+NOT_MODIFIED = 'message is not modified'
+
+# Клавиатуры, зависящие только от id и флагов, кэшируются по аргументам.
+cached_keyboard = lru_cache(maxsize=settings.RENDER_CACHE_SIZE)
+
+
+def snapshot(obj: Any, *fields: str) -> tuple:
+    """Версия объекта для ключа: модель, id и значения полей."""
+    return (
+        type(obj).__name__,
+        obj.id,
+        *(getattr(obj, field, None) for field in fields),
+    )
+
+
+def state_diff(state_data: Optional[dict], keys: Iterable[str]) -> tuple:
+    """Несохранённые изменения из состояния FSM для ключа."""
+    state_data = state_data or {}
+    return tuple(
+        (key, state_data[key]) for key in keys if key in state_data
+    )
+
+
+def memoized(key: Callable[..., Hashable]) -> Callable[[Render], Render]:
+    """Запоминает результат отрисовки по ключу от её аргументов.
+
+    key принимает те же аргументы, что и функция отрисовки. Хранится
+    не больше RENDER_CACHE_SIZE последних результатов; если ключ
+    нельзя захешировать, результат просто строится заново.
+    """
+    def decorator(render: Render) -> Render:
+        cache: OrderedDict = OrderedDict()
+
+        @wraps(render)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache_key = key(*args, **kwargs)
+            try:
+                cache.move_to_end(cache_key)
+                return cache[cache_key]
+            except KeyError:
+                pass
+            except TypeError:
+                return render(*args, **kwargs)
+            result = cache[cache_key] = render(*args, **kwargs)
+            if len(cache) > settings.RENDER_CACHE_SIZE:
+                cache.popitem(last=False)
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def is_unchanged(
+    message: types.Message,
+    text: str,
+    reply_markup: Optional[types.InlineKeyboardMarkup],
+    parse_mode: Optional[str] = None,
+) -> bool:
+    """Сообщение уже показывает этот текст и эти кнопки."""
+    current = message.html_text if parse_mode == 'HTML' else message.text
+    return current == text and message.reply_markup == reply_markup
+
+
+async def edit_text_if_changed(
+    message: types.Message,
+    text: str,
+    reply_markup: Optional[types.InlineKeyboardMarkup] = None,
+    **kwargs: Any,
+) -> None:
+    """Редактирует сообщение, только если результат отличается.
+
+    Совпадение проверяется по самому сообщению из обновления, поэтому
+    неизменный экран не стоит запроса к Telegram API.
+    """
+    if is_unchanged(message, text, reply_markup, kwargs.get('parse_mode')):
+        return
+    try:
+        await message.edit_text(text=text, reply_markup=reply_markup, **kwargs)
+    except TelegramBadRequest as e:
+        if NOT_MODIFIED not in e.message:
+            raise
+
+
+async def edit_message_text(bot: Bot, **kwargs: Any) -> None:
+    """Редактирует сообщение по id, пропуская ошибку «не изменено»."""
+    try:
+        await bot.edit_message_text(**kwargs)
+    except TelegramBadRequest as e:
+        if NOT_MODIFIED not in e.message:
+            raise
@@ -18,6 +18,13 @@ from manager.keyboards.roadmaps import (
 from manager.keyboards.template_roadmaps import (
     get_templateroadmap_editor_menu_keyboard,
 )
+from manager.render import (
+    edit_message_text,
+    edit_text_if_changed,
+    memoized,
+    snapshot,
+    state_diff,
+)
 from models.constants import ReferencePointType
 from models.models import (
     ReferencePoint,
@@ -26,6 +33,17 @@ from models.models import (
     TemplateRoadMap,
 )
 
+ROADMAP_STATE_KEYS = ('new_name', 'new_description', 'is_blocked')
+REFERENCEPOINT_STATE_KEYS = (
+    'new_name',
+    'new_point_type',
+    'is_blocked',
+    'trigger_datetime',
+    'check_datetime',
+    'reminder_days_before',
+    'new_notification_text',
+)
+
 
 async def send_or_edit_message(
     callback: types.CallbackQuery,
@@ -36,7 +54,7 @@ async def send_or_edit_message(
         callback.message,
         types.InaccessibleMessage,
     ):
-        await callback.message.edit_text(**message)
+        await edit_text_if_changed(callback.message, **message)
     else:
         await callback.answer(**message)
 
@@ -46,12 +64,16 @@ async def get_templateroadmap(
     session: AsyncSession,
     callback: Optional[types.CallbackQuery] = None,
     message: Optional[types.Message] = None,
+    plan: Optional[str] = 'editor',
 ) -> Optional[TemplateRoadMap]:
-    """Получение Шаблона дорожной карты."""
+    """Получение Шаблона дорожной карты.
+
+    plan - план загрузки связей, None читает только колонки из кэша.
+    """
     templateroadmap = await template_roadmap_crud.get(
         templateroadmap_id,
         session,
-        load_relations=True,
+        plan=plan,
     )
 
     if not templateroadmap:
@@ -82,6 +104,23 @@ async def get_intern_roadmap(
     return roadmap
 
 
+def _roadmap_editor_text_key(
+    roadmap: Union[RoadMap, TemplateRoadMap],
+    state_data: dict,
+    changes: bool = False,
+    edit_mode: bool = False,
+) -> tuple:
+    """Ключ кэша текста редактора дорожной карты."""
+    return (
+        snapshot(roadmap, 'name', 'description', 'is_blocked'),
+        len(roadmap.reference_points),
+        state_diff(state_data, ROADMAP_STATE_KEYS),
+        changes,
+        edit_mode,
+    )
+
+
+@memoized(_roadmap_editor_text_key)
 def generate_roadmap_editor_text(
     roadmap: Union[RoadMap, TemplateRoadMap],
     state_data: dict,
@@ -164,7 +203,8 @@ async def process_templateroadmap_field_update(
         changes=True,
     )
 
-    await message.bot.edit_message_text(
+    await edit_message_text(
+        message.bot,
         text=text,
         parse_mode='HTML',
         chat_id=message.chat.id,
@@ -189,7 +229,7 @@ async def process_roadmap_field_update(
     roadmap = await roadmap_crud.get(
         data['roadmap_id'],
         session,
-        relations_to_upload=[RoadMap.user_associations],
+        plan='editor',
     )
     if not roadmap or not roadmap.user_associations:
         return
@@ -213,7 +253,8 @@ async def process_roadmap_field_update(
 
     intern_id = roadmap.user_associations[0].user_id
 
-    await message.bot.edit_message_text(
+    await edit_message_text(
+        message.bot,
         chat_id=message.chat.id,
         message_id=data['editor_message_id'],
         text=text,
@@ -226,6 +267,40 @@ async def process_roadmap_field_update(
     )
 
 
+def _referencepoint_text_key(
+    point: Union[TemplateReferencePoint, ReferencePoint],
+    state_data: Optional[dict] = None,
+    changes: bool = False,
+    edit_mode: bool = False,
+) -> tuple:
+    """Ключ кэша текста редактора контрольной точки.
+
+    Текст уведомления входит в ключ только у точек-уведомлений:
+    у остальных связь может быть не загружена.
+    """
+    point_type = (state_data or {}).get('new_point_type', point.point_type)
+    notification_text = None
+    if point_type == ReferencePointType.NOTIFICATION:
+        notification = getattr(point, 'notification', None)
+        notification_text = notification and notification.text
+    return (
+        snapshot(
+            point,
+            'name',
+            'point_type',
+            'is_blocked',
+            'trigger_datetime',
+            'check_datetime',
+            'reminder_days_before',
+        ),
+        notification_text,
+        state_diff(state_data, REFERENCEPOINT_STATE_KEYS),
+        changes,
+        edit_mode,
+    )
+
+
+@memoized(_referencepoint_text_key)
 def generate_referencepoint_text(
     point: Union[TemplateReferencePoint, ReferencePoint],
     state_data: Optional[dict] = None,
@@ -425,7 +500,8 @@ async def process_datetime_input(
             error_message=error_message,
         )
 
-        await message.bot.edit_message_text(
+        await edit_message_text(
+            message.bot,
             chat_id=message.chat.id,
             message_id=data['last_bot_message_id'],
             text=text,
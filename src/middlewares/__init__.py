@@ -1,3 +1,8 @@
 from .db import DataBaseSession  # noqa
 from .permissions import RoleCheckMiddleware  # noqa
 from .cancel import cancel_middleware  # noqa
+from .query_stats import (  # noqa
+    HandlerNameMiddleware,
+    TelegramApiStatsMiddleware,
+    UpdateStatsMiddleware,
+)
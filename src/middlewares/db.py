@@ -1,10 +1,140 @@
-from typing import Any, Awaitable, Callable, Dict
+import re
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql.elements import TextClause
 
 from engine import session_maker
 
+# Текстовые запросы, которые точно ничего не меняют; остальные text()
+# считаются изменением данных.
+READ_ONLY_SQL = re.compile(r'\s*(select|show|explain)\b', re.IGNORECASE)
+
+
+def is_write(statement: Any) -> bool:
+    """Может ли запрос изменить данные."""
+    if isinstance(statement, TextClause):
+        return not READ_ONLY_SQL.match(statement.text)
+    return bool(getattr(statement, 'is_dml', False))
+
+
+class LazySession:
+    """Заместитель AsyncSession, открывающий сессию при первом обращении.
+
+    Хендлеры, не работающие с БД, не создают сессию и не занимают
+    соединение из пула. Запросы на изменение данных (insert, update,
+    delete и text() кроме чтения) во всех способах выполнения
+    запоминаются, чтобы middleware знал, нужен ли commit. Сырое
+    соединение из connection() и run_sync тоже считаются изменением.
+    Изменения ORM-объектов учитываются по событию after_flush: autoflush
+    перед SELECT очищает new и dirty, хотя INSERT и UPDATE уже отправлены.
+    """
+
+    def __init__(self, factory: async_sessionmaker[AsyncSession]) -> None:
+        """Инициализирует заместитель без открытой сессии."""
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+        self._has_writes = False
+
+    @property
+    def session(self) -> AsyncSession:
+        """Возвращает сессию, создавая её при первом обращении."""
+        if self._session is None:
+            self._session = self._factory()
+            event.listen(
+                self._session.sync_session,
+                'after_flush',
+                self._on_flush,
+            )
+        return self._session
+
+    def _on_flush(self, session: Any, flush_context: Any) -> None:
+        """Отмечает, что flush отправил изменения в БД."""
+        self._has_writes = True
+
+    @property
+    def is_used(self) -> bool:
+        """Была ли сессия создана."""
+        return self._session is not None
+
+    @property
+    def has_changes(self) -> bool:
+        """Есть ли в сессии незафиксированные изменения."""
+        if self._session is None:
+            return False
+        return self._has_writes or bool(
+            self._session.new or self._session.dirty or self._session.deleted,
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        """Передаёт остальные обращения настоящей сессии."""
+        return getattr(self.session, name)
+
+    def _track(self, statement: Any) -> None:
+        """Отмечает запрос на изменение данных."""
+        if is_write(statement):
+            self._has_writes = True
+
+    async def execute(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        """Выполняет запрос, отмечая запросы на изменение данных."""
+        self._track(statement)
+        return await self.session.execute(statement, *args, **kwargs)
+
+    async def scalars(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        """Выполняет запрос и возвращает скаляры, отмечая изменения."""
+        self._track(statement)
+        return await self.session.scalars(statement, *args, **kwargs)
+
+    async def scalar(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        """Выполняет запрос и возвращает скаляр, отмечая изменения."""
+        self._track(statement)
+        return await self.session.scalar(statement, *args, **kwargs)
+
+    async def stream(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        """Выполняет потоковый запрос, отмечая изменения."""
+        self._track(statement)
+        return await self.session.stream(statement, *args, **kwargs)
+
+    async def stream_scalars(
+        self,
+        statement: Any,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Выполняет потоковый запрос скаляров, отмечая изменения."""
+        self._track(statement)
+        return await self.session.stream_scalars(statement, *args, **kwargs)
+
+    async def connection(self, *args: Any, **kwargs: Any) -> Any:
+        """Отдаёт соединение сессии; запросы по нему не отследить."""
+        self._has_writes = True
+        return await self.session.connection(*args, **kwargs)
+
+    async def run_sync(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Выполняет синхронный код с сессией; его запросы не отследить."""
+        self._has_writes = True
+        return await self.session.run_sync(fn, *args, **kwargs)
+
+    async def commit(self) -> None:
+        """Фиксирует транзакцию."""
+        await self.session.commit()
+        self._has_writes = False
+
+    async def rollback(self) -> None:
+        """Откатывает транзакцию."""
+        if self._session is not None:
+            await self._session.rollback()
+        self._has_writes = False
+
+    async def close(self) -> None:
+        """Закрывает сессию, если она была открыта."""
+        if self._session is not None:
+            await self._session.close()
+        self._has_writes = False
+
 
 class DataBaseSession(BaseMiddleware):
     """Middleware, создающий асинхронную сессию для подключения к бд."""
@@ -15,17 +145,22 @@ class DataBaseSession(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        """Метод для добавления сессий в существующие хендлеры."""
-        async with session_maker() as session:
-            try:
-                data['session'] = session
-                result = await handler(event, data)
+        """Метод для добавления сессий в существующие хендлеры.
+
+        Сессия открывается только при первом обращении к ней,
+        commit выполняется только при наличии изменений.
+        """
+        session = LazySession(session_maker)
+        try:
+            data['session'] = session
+            result = await handler(event, data)
+            if session.has_changes:
                 await session.commit()
-                return result
+            return result
 
-            except Exception as e:
-                await session.rollback()
-                raise e
+        except Exception as e:
+            await session.rollback()
+            raise e
 
-            finally:
-                await session.close()
+        finally:
+            await session.close()
@@ -5,6 +5,7 @@ from aiogram.types import TelegramObject
 
 from crud.users import user_crud
 from models.constants import UserRole
+from services.user_cache import CachedUser, user_cache
 
 
 class RoleCheckMiddleware(BaseMiddleware):
@@ -23,16 +24,22 @@ class RoleCheckMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        """Метод для добавления проверки идентификации."""
-        session = data['session']
+        """Метод для добавления проверки идентификации.
 
-        user = await user_crud.get_user_by_tg_id(
-            session=session,
-            tg_id=event.from_user.id,
-        )
+        Пользователь берётся из кэша, в БД идём только при промахе.
+        """
+        tg_id = event.from_user.id
+        user = await user_cache.get(tg_id)
 
         if user is None:
-            raise PermissionError('Пользователь не найден в системе')
+            db_user = await user_crud.get_user_by_tg_id(
+                session=data['session'],
+                tg_id=tg_id,
+            )
+            if db_user is None:
+                raise PermissionError('Пользователь не найден в системе')
+            user = CachedUser.from_user(db_user)
+            await user_cache.set(user)
 
         if self.allowed_roles and user.role not in self.allowed_roles:
             raise PermissionError(
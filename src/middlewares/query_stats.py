@@ -0,0 +1,163 @@
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject, Update
+from sqlalchemy import event
+
+from config import settings
+from engine import engine
+from services.metrics import (
+    API_SECONDS,
+    DB_SECONDS,
+    DB_STATEMENTS,
+    HANDLER_SECONDS,
+)
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Запросы к БД и Telegram API, выполненные при обработке обновления."""
+
+    handler: str = 'unhandled'
+    statements: int = 0
+    rows: int = 0
+    db_seconds: float = 0.0
+    api_seconds: float = 0.0
+
+
+# Счётчик текущего обновления; вне UpdateStatsMiddleware ничего не считается.
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    'query_stats',
+    default=None,
+)
+
+
+@event.listens_for(engine.sync_engine, 'before_cursor_execute')
+def _before_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    """Запоминает момент начала запроса."""
+    if query_stats.get() is not None:
+        conn.info['query_started'] = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, 'after_cursor_execute')
+def _after_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    """Учитывает выполненный запрос, его время и число строк."""
+    started = conn.info.pop('query_started', None)
+    stats = query_stats.get()
+    if stats is None or started is None:
+        return
+    stats.statements += 1
+    stats.rows += max(cursor.rowcount, 0)
+    stats.db_seconds += time.perf_counter() - started
+
+
+class TelegramApiStatsMiddleware(BaseRequestMiddleware):
+    """Middleware сессии бота, считающий время запросов к Telegram API.
+
+    Учитываются только запросы из хендлера. Сообщения из очереди
+    отправки уходят из её воркеров, и хендлер видит только ожидание.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        """Выполняет запрос к API и учитывает его время."""
+        stats = query_stats.get()
+        if stats is None:
+            return await make_request(bot, method)
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        finally:
+            stats.api_seconds += time.perf_counter() - started
+
+
+class HandlerNameMiddleware(BaseMiddleware):
+    """Middleware, записывающий в статистику имя выбранного хендлера."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """Подписывает статистику обновления именем хендлера."""
+        stats = query_stats.get()
+        if stats is not None:
+            callback = data['handler'].callback
+            stats.handler = f'{callback.__module__}.{callback.__name__}'
+        return await handler(event, data)
+
+
+class UpdateStatsMiddleware(BaseMiddleware):
+    """Внешний middleware, измеряющий стоимость обработки обновления.
+
+    Время обработки, время и количество SQL-запросов и время запросов
+    к Telegram API попадают в гистограммы Prometheus с именем хендлера.
+    Обновления дольше HANDLER_BUDGET_MS пишутся в лог, а при
+    DB_DEBUG_QUERIES в лог пишется каждое обновление.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any],
+    ) -> Any:
+        """Считает запросы и время на всё время обработки обновления."""
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            total = time.perf_counter() - started
+            query_stats.reset(token)
+            self.observe(stats, total)
+
+    @staticmethod
+    def observe(stats: QueryStats, total: float) -> None:
+        """Записывает статистику обновления в метрики и лог."""
+        HANDLER_SECONDS.labels(stats.handler).observe(total)
+        DB_SECONDS.labels(stats.handler).observe(stats.db_seconds)
+        API_SECONDS.labels(stats.handler).observe(stats.api_seconds)
+        DB_STATEMENTS.labels(stats.handler).observe(stats.statements)
+        summary = (
+            f'{stats.handler}: {total * 1000:.0f} мс, '
+            f'запросов {stats.statements} ({stats.db_seconds * 1000:.0f} мс), '
+            f'строк {stats.rows}, '
+            f'Telegram API {stats.api_seconds * 1000:.0f} мс'
+        )
+        if total * 1000 > settings.HANDLER_BUDGET_MS:
+            logging.warning(
+                f'{summary}, бюджет {settings.HANDLER_BUDGET_MS} мс',
+            )
+        elif settings.DB_DEBUG_QUERIES:
+            logging.info(summary)
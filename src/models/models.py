@@ -1,5 +1,5 @@
+import secrets
 from datetime import datetime
-from random import sample
 from typing import List, Optional
 
 from sqlalchemy import (
@@ -7,7 +7,9 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    Sequence,
     String,
     Text,
     func,
@@ -46,9 +48,33 @@ GET_UNIQUE_TOKEN_ERROR = 'Не удалось создать уникальны
 UNIQUE_ERROR_MESSAGE = 'Предложенный вариант токена уже существует.'
 
 
+def generate_link_token() -> str:
+    """Криптографически случайный токен ссылки-приглашения."""
+    return ''.join(
+        secrets.choice(ACCEPTABLE_SYMBOLS) for _ in range(TOKEN_LENGTH)
+    )
+
+
+def trigram_index(table: str, column: str) -> Index:
+    """GIN-индекс pg_trgm для нечёткого поиска по колонке."""
+    return Index(
+        f'ix_{table}_{column}_trgm',
+        column,
+        postgresql_using='gin',
+        postgresql_ops={column: 'gin_trgm_ops'},
+    )
+
+
 class User(BaseModel):
     """Модель пользователя."""
 
+    __table_args__ = (
+        trigram_index('user', 'first_name'),
+        trigram_index('user', 'last_name'),
+        trigram_index('user', 'email'),
+        trigram_index('user', 'phone_number'),
+    )
+
     first_name: Mapped[str] = mapped_column(
         String(MAX_LEN_FIRST_NAME), nullable=False)
     last_name: Mapped[str] = mapped_column(
@@ -73,7 +99,10 @@ class User(BaseModel):
         back_populates='users',
     )
 
-    manager_id: Mapped[Optional[int]] = mapped_column(ForeignKey('user.id'))
+    manager_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey('user.id'),
+        index=True,
+    )
     manager: Mapped[Optional['User']] = relationship(
         'User',
         remote_side='User.id',
@@ -104,6 +133,11 @@ class User(BaseModel):
 class Restaurant(BaseModel):
     """Модель ресторана."""
 
+    __table_args__ = (
+        trigram_index('restaurant', 'name'),
+        trigram_index('restaurant', 'short_address'),
+    )
+
     name: Mapped[str] = mapped_column(
         String(MAX_LEN_RESTAURANT_NAME), nullable=False)
     full_address: Mapped[str] = mapped_column(Text, nullable=False)
@@ -135,6 +169,10 @@ class Restaurant(BaseModel):
 class TemplateRoadMap(RoadMapMixin, BaseModel):
     """Шаблон дорожной карты."""
 
+    __table_args__ = (
+        trigram_index('templateroadmap', 'name'),
+    )
+
     is_blocked: Mapped[bool] = mapped_column(Boolean, default=False)
 
     restaurant_id: Mapped[Optional[int]] = mapped_column(
@@ -157,7 +195,7 @@ class TemplateReferencePoint(ReferencePointMixin, BaseModel):
         back_populates='template_referencepoints')
 
     templateroadmap_id: Mapped[int] = mapped_column(
-        ForeignKey('templateroadmap.id'))
+        ForeignKey('templateroadmap.id'), index=True)
     template_roadmap: Mapped['TemplateRoadMap'] = relationship(
         back_populates='reference_points')
 
@@ -219,6 +257,25 @@ class RoadMap(RoadMapMixin, BaseModel):
 class ReferencePoint(ReferencePointMixin, BaseModel):
     """Контрольная точка пользователя (выполняемая)."""
 
+    __table_args__ = (
+        Index(
+            'ix_referencepoint_is_completed_trigger_datetime',
+            'is_completed',
+            'trigger_datetime',
+        ),
+        Index(
+            'ix_referencepoint_is_completed_check_datetime',
+            'is_completed',
+            'check_datetime',
+        ),
+        Index(
+            'ix_referencepoint_roadmap_id_is_completed_order_execution',
+            'roadmap_id',
+            'is_completed',
+            'order_execution',
+        ),
+    )
+
     is_blocked: Mapped[bool] = mapped_column(Boolean, default=False)
     trigger_datetime: Mapped[datetime] = mapped_column(
         DateTime, nullable=False)
@@ -228,6 +285,9 @@ class ReferencePoint(ReferencePointMixin, BaseModel):
     completion_datetime: Mapped[Optional[datetime]] = mapped_column(DateTime)
     is_completed: Mapped[bool] = mapped_column(
         Boolean, default=False)
+    is_sent: Mapped[bool] = mapped_column(Boolean, default=False)
+    is_overdue_notified: Mapped[bool] = mapped_column(
+        Boolean, default=False)
 
     roadmap_id: Mapped[int] = mapped_column(ForeignKey('roadmap.id'))
     roadmap: Mapped['RoadMap'] = relationship(
@@ -258,6 +318,10 @@ class ReferencePoint(ReferencePointMixin, BaseModel):
 class UserRoadMap(BaseModel):
     """Связь пользователя и дорожной карты."""
 
+    __table_args__ = (
+        Index('ix_userroadmap_user_id_id', 'user_id', 'id'),
+    )
+
     user_id: Mapped[int] = mapped_column(
         ForeignKey('user.id', ondelete="CASCADE"),
         nullable=False,
@@ -267,6 +331,7 @@ class UserRoadMap(BaseModel):
     roadmap_id: Mapped[int] = mapped_column(
         ForeignKey('roadmap.id', ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     roadmap: Mapped['RoadMap'] = relationship(
         back_populates='user_associations')
@@ -275,11 +340,11 @@ class UserRoadMap(BaseModel):
 class InvitationLink(BaseModel):
     """Модель пригласительной ссылки."""
 
-    is_used: Mapped[bool] = mapped_column(Boolean, default=True)
+    is_used: Mapped[bool] = mapped_column(Boolean, default=False)
     link_token: Mapped[str] = mapped_column(
         String(TOKEN_LENGTH),
         unique=True,
-        default=''.join(sample(ACCEPTABLE_SYMBOLS, TOKEN_LENGTH)),
+        default=generate_link_token,
     )
     expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
@@ -313,7 +378,10 @@ class Question(QuestionMixin, BaseModel):
 
     user_answer: Mapped[Optional[int]] = mapped_column(Integer)
 
-    test_id: Mapped[Optional[int]] = mapped_column(ForeignKey('test.id'))
+    test_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey('test.id'),
+        index=True,
+    )
     test: Mapped[Optional['Test']] = relationship(
         back_populates='questions',
     )
@@ -378,7 +446,7 @@ class TemplateQuestion(QuestionMixin, BaseModel):
     """Модель вопросов теста (шаблон)."""
 
     templatetest_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey('templatetest.id'))
+        ForeignKey('templatetest.id'), index=True)
     test: Mapped[Optional['TemplateTest']] = relationship(
         back_populates='questions')
 
@@ -410,11 +478,33 @@ class TemplateFeedbackRequest(FeedbackRequestMixin, BaseModel):
 
 
 class Dialog(BaseModel):
-    """Модель диалогов между менеджером и интерном."""
-
+    """Модель диалогов между менеджером и интерном.
+
+    Таблица секционирована по месяцам message_datetime, поэтому время
+    сообщения входит в первичный ключ, а id берётся из обычной
+    последовательности. Секции создаёт и удаляет по сроку хранения
+    services/dialog_partitions.py.
+    """
+
+    __table_args__ = (
+        Index(
+            'ix_dialog_sender_id_recipient_id_message_datetime_id',
+            'sender_id',
+            'recipient_id',
+            'message_datetime',
+            'id',
+        ),
+        {'postgresql_partition_by': 'RANGE (message_datetime)'},
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        Sequence('dialog_id_seq'),
+        primary_key=True,
+    )
     message: Mapped[str] = mapped_column(Text, nullable=False)
     message_datetime: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False)
+        DateTime, primary_key=True)
 
     sender_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey('user.id', ondelete="SET NULL"),
@@ -0,0 +1,6 @@
+from redis.asyncio import Redis
+
+from config import settings
+
+# Общий клиент Redis для кэшей бота (соединения открываются лениво).
+redis_client = Redis.from_url(settings.redis_url)
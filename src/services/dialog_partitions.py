@@ -0,0 +1,139 @@
+"""Месячные секции таблицы dialog и срок хранения переписки."""
+
+import logging
+import re
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from config import settings
+from engine import engine
+
+PARTITION_PATTERN = re.compile(r'^dialog_p(\d{4})(\d{2})$')
+DEFAULT_PARTITION = 'dialog_default'
+# Ключ блокировки: обслуживать секции должен один процесс за раз.
+MAINTENANCE_LOCK_KEY = 0x6469616C
+
+
+def month_start(moment: datetime) -> datetime:
+    """Начало месяца, в который попадает момент."""
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    """Начало месяца, отстоящего от month на count месяцев."""
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+async def _partitions(conn: AsyncConnection) -> dict[datetime, str]:
+    """Месячные секции dialog по началу их месяца."""
+    names = await conn.scalars(
+        text(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+            "WHERE parent.relname = 'dialog'",
+        ),
+    )
+    partitions = {}
+    for name in names:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            year, month = map(int, match.groups())
+            partitions[datetime(year, month, 1)] = name
+    return partitions
+
+
+async def create_partitions(
+    conn: AsyncConnection,
+    first: datetime,
+    last: datetime,
+) -> list[str]:
+    """Создаёт недостающие секции на месяцы с first по last включительно.
+
+    Секцию месяца нельзя создать, если его строки уже лежат в секции
+    по умолчанию, поэтому секции создаются до записи сообщений.
+    """
+    existing = await _partitions(conn)
+    created = []
+    month = month_start(first)
+    while month <= last:
+        if month not in existing:
+            name = f'dialog_p{month:%Y%m}'
+            await conn.execute(
+                text(
+                    f'CREATE TABLE IF NOT EXISTS {name} PARTITION OF dialog '
+                    f"FOR VALUES FROM ('{month:%Y-%m-%d}') "
+                    f"TO ('{add_months(month, 1):%Y-%m-%d}')",
+                ),
+            )
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    now: datetime,
+) -> list[str]:
+    """Создаёт секции с текущего месяца на DIALOG_PARTITIONS_AHEAD вперёд.
+
+    Секции создаются заранее: сообщения нового месяца не должны
+    попадать в секцию по умолчанию.
+    """
+    current = month_start(now)
+    return await create_partitions(
+        conn,
+        current,
+        add_months(current, settings.DIALOG_PARTITIONS_AHEAD),
+    )
+
+
+async def drop_expired_partitions(
+    conn: AsyncConnection,
+    now: datetime,
+) -> list[str]:
+    """Удаляет переписку старше DIALOG_RETENTION_MONTHS месяцев.
+
+    Секция удаляется целиком, когда закончился последний её месяц
+    в сроке хранения; из секции по умолчанию старые сообщения
+    удаляются построчно. При DIALOG_RETENTION_MONTHS = 0 переписка
+    хранится бессрочно.
+    """
+    if not settings.DIALOG_RETENTION_MONTHS:
+        return []
+    cutoff = add_months(month_start(now), -settings.DIALOG_RETENTION_MONTHS)
+    dropped = []
+    for month, name in sorted((await _partitions(conn)).items()):
+        if add_months(month, 1) > cutoff:
+            break
+        await conn.execute(text(f'DROP TABLE IF EXISTS {name}'))
+        dropped.append(name)
+    await conn.execute(
+        text(
+            f'DELETE FROM {DEFAULT_PARTITION} '
+            'WHERE message_datetime < :cutoff',
+        ),
+        {'cutoff': cutoff},
+    )
+    return dropped
+
+
+async def maintain_partitions_job() -> None:
+    """Задача планировщика: создаёт новые и удаляет старые секции."""
+    now = datetime.now()
+    async with engine.begin() as conn:
+        locked = await conn.scalar(
+            text('SELECT pg_try_advisory_xact_lock(:key)'),
+            {'key': MAINTENANCE_LOCK_KEY},
+        )
+        if not locked:
+            return
+        created = await ensure_partitions(conn, now)
+        dropped = await drop_expired_partitions(conn, now)
+    if created or dropped:
+        logging.info(
+            f'Секции dialog: созданы {created}, удалены {dropped}',
+        )
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from config import settings
+from crud.dialogue import dialog_crud
+from engine import session_maker
+from services.metrics import DIALOG_MESSAGES, DIALOG_PENDING
+
+
+class DialogWriter:
+    """Пакетная запись переписки в таблицу dialog.
+
+    Сообщения копятся в памяти и пишутся одним INSERT, когда набралось
+    DIALOG_BATCH_SIZE строк или прошло DIALOG_FLUSH_MS миллисекунд
+    с первого сообщения пачки. Хендлер не ждёт записи. Пачка, которую
+    не удалось записать из-за ошибки в данных, делится пополам, пока
+    не останутся отдельные неподходящие строки: они отбрасываются, а
+    остальные записываются. Пачка, которую не удалось записать из-за
+    недоступности БД, остаётся в буфере и пишется повторно с
+    удваивающейся паузой (не дольше DIALOG_RETRY_MAX_MS). После
+    DIALOG_WRITE_RETRIES неудач подряд буфер пишется в лог и
+    отбрасывается: история переписки не должна копиться в памяти
+    бесконечно и задерживать пересылку сообщений.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.DIALOG_BATCH_SIZE,
+        flush_ms: int = settings.DIALOG_FLUSH_MS,
+    ) -> None:
+        """Инициализирует пустой буфер."""
+        self.batch_size = batch_size
+        self.flush_ms = flush_ms
+        self._rows: list[dict[str, Any]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        # пачки пишутся по очереди, чтобы id шли в порядке сообщений
+        self._lock = asyncio.Lock()
+        self._failures = 0
+        DIALOG_PENDING.set_function(lambda: self.pending)
+
+    @property
+    def pending(self) -> int:
+        """Количество сообщений, ожидающих записи."""
+        return len(self._rows)
+
+    def write(
+        self,
+        sender_id: int,
+        recipient_id: int,
+        text: Optional[str],
+    ) -> None:
+        """Ставит сообщение в очередь на запись.
+
+        Сообщения без текста (стикеры, фото) не пишутся: колонка
+        message обязательна, и такая строка сорвала бы всю пачку.
+        """
+        if not text:
+            DIALOG_MESSAGES.labels('rejected').inc()
+            logging.warning(
+                f'Пропущено сообщение без текста от {sender_id} '
+                f'для {recipient_id}',
+            )
+            return
+        self._rows.append({
+            'sender_id': sender_id,
+            'recipient_id': recipient_id,
+            'message': text,
+            'message_datetime': datetime.now(),
+        })
+        # во время повторов полный буфер ждёт паузы, а не пишется сразу
+        if len(self._rows) >= self.batch_size and not self._failures:
+            self._flush_later()
+        else:
+            self._schedule()
+
+    def _schedule(self) -> None:
+        """Откладывает запись буфера, если она ещё не запланирована."""
+        if self._timer is not None:
+            return
+        delay = min(
+            self.flush_ms * 2 ** self._failures,
+            settings.DIALOG_RETRY_MAX_MS,
+        )
+        self._timer = asyncio.get_running_loop().call_later(
+            delay / 1000,
+            self._flush_later,
+        )
+
+    def _flush_later(self) -> None:
+        """Запускает запись накопленной пачки в фоне."""
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        """Записывает накопленные сообщения."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        rows, self._rows = self._rows, []
+        if not rows:
+            return
+        async with self._lock:
+            unwritten = await self._insert(rows)
+        if unwritten:
+            self._retry(unwritten)
+        else:
+            self._failures = 0
+
+    async def _insert(
+        self,
+        rows: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Вставляет пачку, отсеивая строки, которые отвергла БД.
+
+        Возвращает строки, не записанные из-за недоступности БД.
+        """
+        try:
+            async with session_maker() as session:
+                await dialog_crud.bulk_create(rows, session)
+        except (DataError, IntegrityError):
+            if len(rows) == 1:
+                DIALOG_MESSAGES.labels('rejected').inc()
+                logging.exception(
+                    'БД отвергла сообщение переписки от '
+                    f'{rows[0]["sender_id"]} для {rows[0]["recipient_id"]}',
+                )
+                return []
+            middle = len(rows) // 2
+            return [
+                *await self._insert(rows[:middle]),
+                *await self._insert(rows[middle:]),
+            ]
+        except Exception as e:
+            logging.warning(f'БД недоступна для переписки: {str(e)}')
+            return rows
+        DIALOG_MESSAGES.labels('written').inc(len(rows))
+        return []
+
+    def _retry(self, rows: list[dict[str, Any]]) -> None:
+        """Возвращает неудавшуюся пачку в буфер или отбрасывает её."""
+        self._failures += 1
+        if self._failures > settings.DIALOG_WRITE_RETRIES:
+            self._failures = 0
+            DIALOG_MESSAGES.labels('dropped').inc(len(rows))
+            logging.error(
+                f'Не удалось записать {len(rows)} сообщений переписки, '
+                'сообщения отброшены',
+            )
+            return
+        DIALOG_MESSAGES.labels('retried').inc(len(rows))
+        logging.warning(
+            f'Не удалось записать {len(rows)} сообщений переписки, '
+            f'попытка {self._failures} из {settings.DIALOG_WRITE_RETRIES}',
+        )
+        self._rows[:0] = rows
+        self._schedule()
+
+    async def close(self) -> None:
+        """Дописывает буфер и ждёт фоновые записи при остановке бота."""
+        await self.flush()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._rows:
+            DIALOG_MESSAGES.labels('dropped').inc(len(self._rows))
+            logging.error(
+                f'Бот остановлен, не записано {len(self._rows)} '
+                'сообщений переписки',
+            )
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Iterable
+
+from config import settings
+from crud.referencepoint import referencepoint_crud
+from engine import session_maker
+from intern.handlers.notifications import handle_reference_point_type
+from manager.handlers.interns import intern_missed_deadline
+from services.scheduler import get_reference_point_scheduler
+from services.sender import SendQueue
+
+
+async def dispatcher_job() -> None:
+    """Задача планировщика: тик диспетчера контрольных точек."""
+    await dispatch_due_reference_points(
+        get_reference_point_scheduler().sender,
+    )
+
+
+async def dispatch_due_reference_points(sender: SendQueue) -> None:
+    """Рассылает все наступившие и просроченные контрольные точки.
+
+    Точки забираются пачками по DISPATCHER_BATCH_SIZE одним запросом
+    и обрабатываются с ограничением параллельности. Пачки выбираются,
+    пока очередь не опустеет, поэтому точки, наступившие за время
+    простоя бота, досылаются на первом же тике.
+    """
+    batch_size = settings.DISPATCHER_BATCH_SIZE
+    while await _dispatch_due_batch(sender) == batch_size:
+        pass
+    while await _dispatch_overdue_batch(sender) == batch_size:
+        pass
+
+
+async def _dispatch_due_batch(sender: SendQueue) -> int:
+    """Отправляет стажёрам одну пачку наступивших точек."""
+    # Сессию закрываем до рассылки: обработчики точек открывают свои.
+    async with session_maker() as session:
+        claimed = await referencepoint_crud.claim_due_points(
+            settings.DISPATCHER_BATCH_SIZE,
+            session,
+        )
+    failed_ids = await _fan_out(
+        (
+            (
+                reference_point.id,
+                handle_reference_point_type(
+                    sender=sender,
+                    reference_point=reference_point,
+                    user=intern,
+                ),
+            )
+            for reference_point, intern in claimed
+        ),
+    )
+    await _release(failed_ids, {'is_sent': False})
+    return len(claimed)
+
+
+async def _dispatch_overdue_batch(sender: SendQueue) -> int:
+    """Уведомляет менеджеров об одной пачке просроченных точек."""
+    async with session_maker() as session:
+        claimed = await referencepoint_crud.claim_overdue_points(
+            settings.DISPATCHER_BATCH_SIZE,
+            session,
+        )
+    failed_ids = await _fan_out(
+        (
+            (
+                point_id,
+                intern_missed_deadline(
+                    sender=sender,
+                    manager_tg_id=manager_tg_id,
+                    reference_point_name=point_name,
+                    name=first_name,
+                    surname=last_name,
+                ),
+            )
+            for (
+                point_id,
+                point_name,
+                first_name,
+                last_name,
+                manager_tg_id,
+            ) in claimed
+        ),
+    )
+    await _release(failed_ids, {'is_overdue_notified': False})
+    return len(claimed)
+
+
+async def _release(failed_ids: list[int], values: dict[str, Any]) -> None:
+    """Возвращает неотправленные точки в очередь следующего тика."""
+    if not failed_ids:
+        return
+    async with session_maker() as session:
+        await referencepoint_crud.release_points(failed_ids, values, session)
+
+
+async def _fan_out(
+    tasks: Iterable[tuple[int, Awaitable[Any]]],
+) -> list[int]:
+    """Выполняет задачи с ограничением параллельности.
+
+    Возвращает id точек, обработка которых завершилась ошибкой.
+    """
+    semaphore = asyncio.Semaphore(settings.DISPATCHER_CONCURRENCY)
+
+    async def run(point_id: int, task: Awaitable[Any]) -> int | None:
+        async with semaphore:
+            try:
+                await task
+            except Exception as error:
+                logging.exception(
+                    f'\nОшибка отправки контрольной точки {point_id}: '
+                    f'{str(error)}\n',
+                )
+                return point_id
+        return None
+
+    results = await asyncio.gather(
+        *(run(point_id, task) for point_id, task in tasks),
+    )
+    return [point_id for point_id in results if point_id is not None]
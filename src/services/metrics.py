@@ -0,0 +1,117 @@
+"""Метрики обработки обновлений в формате Prometheus."""
+
+import logging
+from typing import Optional
+
+from aiohttp import web
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+from config import settings
+
+# Границы корзин в секундах: от быстрых ответов из кэша до долгих отчётов.
+SECONDS_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+STATEMENTS_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+HANDLER_SECONDS = Histogram(
+    'bot_handler_seconds',
+    'Полное время обработки обновления',
+    ['handler'],
+    buckets=SECONDS_BUCKETS,
+)
+DB_SECONDS = Histogram(
+    'bot_handler_db_seconds',
+    'Время SQL-запросов при обработке обновления',
+    ['handler'],
+    buckets=SECONDS_BUCKETS,
+)
+API_SECONDS = Histogram(
+    'bot_handler_telegram_api_seconds',
+    'Время запросов к Telegram API при обработке обновления',
+    ['handler'],
+    buckets=SECONDS_BUCKETS,
+)
+DB_STATEMENTS = Histogram(
+    'bot_handler_db_statements',
+    'Количество SQL-запросов при обработке обновления',
+    ['handler'],
+    buckets=STATEMENTS_BUCKETS,
+)
+
+DB_POOL_WAIT_SECONDS = Histogram(
+    'bot_db_pool_wait_seconds',
+    'Ожидание свободного соединения в пуле БД',
+    buckets=SECONDS_BUCKETS,
+)
+DB_POOL_HOLD_SECONDS = Histogram(
+    'bot_db_pool_hold_seconds',
+    'Время удержания соединения из пула БД',
+    buckets=SECONDS_BUCKETS,
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    'bot_db_pool_checked_out',
+    'Соединения пула БД, выданные в данный момент',
+)
+
+SEND_MESSAGES = Counter(
+    'bot_send_messages_total',
+    'Исходящие сообщения очереди отправки по исходу',
+    ['result'],
+)
+SEND_WAIT_SECONDS = Histogram(
+    'bot_send_wait_seconds',
+    'Время от постановки сообщения в очередь до отправки',
+    buckets=SECONDS_BUCKETS,
+)
+SEND_QUEUE_SIZE = Gauge(
+    'bot_send_queue_size',
+    'Сообщения, ожидающие отправки в очереди',
+)
+
+CRUD_CACHE_REQUESTS = Counter(
+    'bot_crud_cache_requests_total',
+    'Обращения к кэшу CRUD по таблицам и результату',
+    ['table', 'result'],
+)
+
+DIALOG_MESSAGES = Counter(
+    'bot_dialog_messages_total',
+    'Сообщения переписки при пакетной записи по исходу',
+    ['result'],
+)
+DIALOG_PENDING = Gauge(
+    'bot_dialog_pending_messages',
+    'Сообщения переписки, ожидающие записи в БД',
+)
+
+
+async def _metrics(request: web.Request) -> web.Response:
+    """Отдаёт метрики процесса в текстовом формате Prometheus."""
+    response = web.Response(body=generate_latest())
+    response.content_type = CONTENT_TYPE_LATEST.split(';')[0]
+    return response
+
+
+async def start_metrics_server(worker_index: int) -> Optional[web.AppRunner]:
+    """Запускает HTTP-сервер метрик процесса бота.
+
+    Каждый процесс вебхука считает метрики отдельно и слушает свой порт:
+    METRICS_PORT + номер процесса. При METRICS_PORT = 0 сервер не нужен.
+    """
+    if not settings.METRICS_PORT:
+        return None
+    app = web.Application()
+    app.router.add_get('/metrics', _metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    port = settings.METRICS_PORT + worker_index
+    await web.TCPSite(runner, settings.METRICS_HOST, port).start()
+    logging.info(f'Метрики доступны на {settings.METRICS_HOST}:{port}')
+    return runner
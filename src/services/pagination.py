@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence
+
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud.base import CRUDBase, Page
+
+PREV_PAGE = '◀️ Назад'
+NEXT_PAGE = 'Далее ▶️'
+
+
+class PageCallback(CallbackData, prefix='page'):
+    """Класс обработки кнопок листания клавиатуры выбора."""
+
+    picker: str
+    direction: str
+    cursor: int
+
+
+def page_buttons(picker: str, page: Page) -> list[InlineKeyboardButton]:
+    """Кнопки перехода на предыдущую и следующую страницу."""
+    buttons = []
+    if page.has_prev:
+        buttons.append(
+            InlineKeyboardButton(
+                text=PREV_PAGE,
+                callback_data=PageCallback(
+                    picker=picker,
+                    direction='prev',
+                    cursor=page.items[0].id,
+                ).pack(),
+            ),
+        )
+    if page.has_next:
+        buttons.append(
+            InlineKeyboardButton(
+                text=NEXT_PAGE,
+                callback_data=PageCallback(
+                    picker=picker,
+                    direction='next',
+                    cursor=page.items[-1].id,
+                ).pack(),
+            ),
+        )
+    return buttons
+
+
+def page_bounds(
+    callback_data: Optional[PageCallback],
+) -> dict[str, Optional[int]]:
+    """Аргументы after_id и before_id для get_page по кнопке листания."""
+    if callback_data is None:
+        return {}
+    if callback_data.direction == 'prev':
+        return {'before_id': callback_data.cursor}
+    return {'after_id': callback_data.cursor}
+
+
+@dataclass(frozen=True, slots=True)
+class Picker:
+    """Постраничная клавиатура выбора объектов модели.
+
+    build_keyboard получает объекты страницы, префикс callback и кнопки
+    листания. Префиксом служит имя выбора, поэтому обработчики нажатия
+    на объект остаются прежними.
+    """
+
+    crud: CRUDBase
+    build_keyboard: Callable[..., InlineKeyboardMarkup]
+    options: Sequence[Any] = ()
+    filters: Sequence[Any] = ()
+
+    async def keyboard(
+        self,
+        name: str,
+        session: AsyncSession,
+        *,
+        callback_data: Optional[PageCallback] = None,
+        filters: Sequence[Any] = (),
+    ) -> Optional[InlineKeyboardMarkup]:
+        """Клавиатура первой страницы или страницы по кнопке листания.
+
+        Возвращает None, если на странице нет объектов.
+        """
+        page = await self.crud.get_page(
+            session,
+            filters=(*self.filters, *filters),
+            options=self.options,
+            **page_bounds(callback_data),
+        )
+        if not page.items:
+            return None
+        return self.build_keyboard(
+            page.items,
+            name,
+            page_buttons(name, page),
+        )
@@ -0,0 +1,253 @@
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models.models import ReferencePoint, RoadMap, User, UserRoadMap
+from services.cache import redis_client
+
+PROGRESS_CACHE_KEY = 'intern_progress:{intern_id}'
+# По id карты находим стажёра, чтобы сбросить его снимок.
+PROGRESS_ROADMAP_KEY = 'intern_progress:roadmap:{roadmap_id}'
+DATETIME_FIELDS = ('trigger_datetime', 'check_datetime', 'completion_datetime')
+
+
+@dataclass(frozen=True, slots=True)
+class PointProgress:
+    """Состояние контрольной точки в снимке прогресса."""
+
+    id: int
+    name: str
+    point_type: str
+    order_execution: int
+    is_completed: bool
+    is_blocked: bool
+    auto_closing: bool
+    trigger_datetime: Optional[datetime]
+    check_datetime: Optional[datetime]
+    completion_datetime: Optional[datetime]
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'PointProgress':
+        """Создаёт точку из словаря с датами в формате ISO."""
+        for field in DATETIME_FIELDS:
+            if data[field]:
+                data[field] = datetime.fromisoformat(data[field])
+        return cls(**data)
+
+
+@dataclass(frozen=True, slots=True)
+class InternProgressSnapshot:
+    """Снимок прогресса стажёра по его дорожной карте.
+
+    Строится одним запросом к БД и используется экранами статуса
+    дорожной карты, текущей точки и прогресса обучения у менеджера.
+    """
+
+    intern_id: int
+    first_name: str
+    last_name: str
+    roadmap_id: Optional[int]
+    roadmap_name: Optional[str]
+    total_points: int
+    completed_points: int
+    overdue_points: int
+    next_deadline: Optional[datetime]
+    points: tuple[PointProgress, ...]
+
+    @property
+    def current_point(self) -> Optional[PointProgress]:
+        """Первая невыполненная точка со сроком проверки."""
+        return next(
+            (
+                point for point in self.points
+                if not point.is_completed and point.check_datetime
+            ),
+            None,
+        )
+
+    def to_json(self) -> str:
+        """Сериализует снимок для хранения в Redis."""
+        return json.dumps(asdict(self), default=datetime.isoformat)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> 'InternProgressSnapshot':
+        """Восстанавливает снимок из Redis."""
+        data = json.loads(raw)
+        if data['next_deadline']:
+            data['next_deadline'] = datetime.fromisoformat(
+                data['next_deadline'],
+            )
+        data['points'] = tuple(
+            PointProgress.from_dict(point) for point in data['points']
+        )
+        return cls(**data)
+
+
+async def get_intern_progress(
+    intern_id: int,
+    session: AsyncSession,
+) -> Optional[InternProgressSnapshot]:
+    """Возвращает снимок прогресса стажёра из кэша или из БД.
+
+    Возвращает None, если стажёр не найден.
+    """
+    try:
+        raw = await redis_client.get(
+            PROGRESS_CACHE_KEY.format(intern_id=intern_id),
+        )
+    except RedisError as e:
+        logging.warning(f'Кэш прогресса недоступен: {str(e)}')
+        raw = None
+    if raw is not None:
+        return InternProgressSnapshot.from_json(raw)
+
+    snapshot = await _load_intern_progress(intern_id, session)
+    if snapshot is not None:
+        await _cache_snapshot(snapshot)
+    return snapshot
+
+
+async def invalidate_intern_progress(intern_id: int) -> None:
+    """Сбрасывает снимок прогресса стажёра."""
+    try:
+        await redis_client.delete(
+            PROGRESS_CACHE_KEY.format(intern_id=intern_id),
+        )
+    except RedisError as e:
+        logging.warning(f'Кэш прогресса недоступен: {str(e)}')
+
+
+async def invalidate_roadmap_progress(roadmap_id: int) -> None:
+    """Сбрасывает снимок прогресса стажёра, которому назначена карта."""
+    try:
+        intern_id = await redis_client.get(
+            PROGRESS_ROADMAP_KEY.format(roadmap_id=roadmap_id),
+        )
+    except RedisError as e:
+        logging.warning(f'Кэш прогресса недоступен: {str(e)}')
+        return
+    if intern_id is not None:
+        await invalidate_intern_progress(int(intern_id))
+
+
+async def _cache_snapshot(snapshot: InternProgressSnapshot) -> None:
+    """Сохраняет снимок и связь карты со стажёром в Redis."""
+    ttl = settings.PROGRESS_CACHE_TTL
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(
+                PROGRESS_CACHE_KEY.format(intern_id=snapshot.intern_id),
+                snapshot.to_json(),
+                ex=ttl,
+            )
+            if snapshot.roadmap_id is not None:
+                pipe.set(
+                    PROGRESS_ROADMAP_KEY.format(
+                        roadmap_id=snapshot.roadmap_id,
+                    ),
+                    snapshot.intern_id,
+                    ex=ttl,
+                )
+            await pipe.execute()
+    except RedisError as e:
+        logging.warning(f'Кэш прогресса недоступен: {str(e)}')
+
+
+async def _load_intern_progress(
+    intern_id: int,
+    session: AsyncSession,
+) -> Optional[InternProgressSnapshot]:
+    """Строит снимок прогресса одним запросом к БД.
+
+    Берётся последняя назначенная стажёру карта, счётчики и ближайший
+    срок считаются агрегатами, точки собираются в json по порядку.
+    """
+    now = datetime.now()
+    roadmap_id = (
+        select(UserRoadMap.roadmap_id)
+        .where(UserRoadMap.user_id == intern_id)
+        .order_by(UserRoadMap.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    pending = ReferencePoint.is_completed.is_(False)
+    point = func.json_build_object(
+        *(
+            item
+            for column in (
+                'id',
+                'name',
+                'point_type',
+                'order_execution',
+                'is_completed',
+                'is_blocked',
+                'auto_closing',
+                *DATETIME_FIELDS,
+            )
+            for item in (column, getattr(ReferencePoint, column))
+        ),
+    )
+    row = (
+        await session.execute(
+            select(
+                User.first_name,
+                User.last_name,
+                RoadMap.id,
+                RoadMap.name,
+                func.count(ReferencePoint.id),
+                func.count(ReferencePoint.id).filter(
+                    ReferencePoint.is_completed.is_(True),
+                ),
+                func.count(ReferencePoint.id).filter(
+                    pending,
+                    ReferencePoint.check_datetime < now,
+                ),
+                func.min(ReferencePoint.check_datetime).filter(
+                    pending,
+                    ReferencePoint.check_datetime >= now,
+                ),
+                func.json_agg(
+                    aggregate_order_by(point, ReferencePoint.order_execution),
+                    type_=JSON,
+                ).filter(ReferencePoint.id.is_not(None)),
+            )
+            .select_from(User)
+            .outerjoin(RoadMap, RoadMap.id == roadmap_id)
+            .outerjoin(ReferencePoint, ReferencePoint.roadmap_id == RoadMap.id)
+            .where(User.id == intern_id)
+            .group_by(User.id, RoadMap.id),
+        )
+    ).one_or_none()
+    if row is None:
+        return None
+    (
+        first_name,
+        last_name,
+        roadmap_id,
+        roadmap_name,
+        total_points,
+        completed_points,
+        overdue_points,
+        next_deadline,
+        points,
+    ) = row
+    return InternProgressSnapshot(
+        intern_id=intern_id,
+        first_name=first_name,
+        last_name=last_name,
+        roadmap_id=roadmap_id,
+        roadmap_name=roadmap_name,
+        total_points=total_points,
+        completed_points=completed_points,
+        overdue_points=overdue_points,
+        next_deadline=next_deadline,
+        points=tuple(PointProgress.from_dict(item) for item in points or ()),
+    )
@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Optional
+
+from apscheduler.jobstores.redis import RedisJobStore
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from config import settings
+from services.sender import SendQueue
+
+# Задачи храним в Redis, поэтому функция передаётся текстовой ссылкой,
+# а очередь отправки берётся из запущенного планировщика.
+DISPATCHER_JOB = 'services.dispatcher:dispatcher_job'
+DISPATCHER_JOB_ID = 'reference_point_dispatcher'
+DIALOG_PARTITIONS_JOB = 'services.dialog_partitions:maintain_partitions_job'
+DIALOG_PARTITIONS_JOB_ID = 'dialog_partitions'
+TEST_ANSWERS_JOB = 'services.test_answers:flush_expired_attempts_job'
+TEST_ANSWERS_JOB_ID = 'test_answers'
+
+_scheduler: Optional['ReferencePointScheduler'] = None
+
+
+class ReferencePointScheduler:
+    """Единый на процесс планировщик контрольных точек.
+
+    Создаётся один раз в main.py. Вместо отдельной задачи на каждую
+    контрольную точку периодически запускает диспетчер, который
+    выбирает наступившие точки одним запросом к БД.
+    """
+
+    def __init__(self, sender: SendQueue) -> None:
+        """Инициализирует планировщик с хранилищем задач в Redis."""
+        self.sender = sender
+        self.scheduler = AsyncIOScheduler(
+            jobstores={
+                'default': RedisJobStore(
+                    db=settings.SCHEDULER_REDIS_DB,
+                    host=settings.REDIS_HOST,
+                    port=int(settings.REDIS_PORT),
+                    password=settings.REDIS_PASSWORD or None,
+                ),
+            },
+            job_defaults={
+                'coalesce': True,
+                'max_instances': 1,
+                'misfire_grace_time': None,
+            },
+            timezone=settings.SCHEDULER_TIMEZONE,
+        )
+
+    def start(self) -> None:
+        """Запускает планировщик. Вызывать внутри работающего event loop.
+
+        Первый тик диспетчера выполняется сразу, чтобы дослать точки,
+        наступившие за время простоя бота. Обслуживание секций dialog
+        тоже запускается сразу и затем раз в DIALOG_MAINTENANCE_HOURS,
+        а ответы тестов с истёкшим сроком дописываются в БД раз
+        в TEST_ANSWERS_SWEEP_SECONDS.
+        """
+        global _scheduler
+        _scheduler = self
+        self.scheduler.start()
+        self.scheduler.add_job(
+            DISPATCHER_JOB,
+            'interval',
+            seconds=settings.DISPATCHER_INTERVAL_SECONDS,
+            id=DISPATCHER_JOB_ID,
+            replace_existing=True,
+            next_run_time=datetime.now(self.scheduler.timezone),
+        )
+        self.scheduler.add_job(
+            DIALOG_PARTITIONS_JOB,
+            'interval',
+            hours=settings.DIALOG_MAINTENANCE_HOURS,
+            id=DIALOG_PARTITIONS_JOB_ID,
+            replace_existing=True,
+            next_run_time=datetime.now(self.scheduler.timezone),
+        )
+        self.scheduler.add_job(
+            TEST_ANSWERS_JOB,
+            'interval',
+            seconds=settings.TEST_ANSWERS_SWEEP_SECONDS,
+            id=TEST_ANSWERS_JOB_ID,
+            replace_existing=True,
+            next_run_time=datetime.now(self.scheduler.timezone),
+        )
+
+    def shutdown(self) -> None:
+        """Останавливает планировщик, не дожидаясь выполнения задач."""
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+
+
+def get_reference_point_scheduler() -> ReferencePointScheduler:
+    """Возвращает запущенный планировщик для задач из хранилища."""
+    if _scheduler is None:
+        raise RuntimeError('Планировщик контрольных точек не запущен.')
+    return _scheduler
@@ -0,0 +1,264 @@
+import asyncio
+import itertools
+import logging
+import time
+from enum import IntEnum
+from typing import Any
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import Message
+
+from config import settings
+from services.metrics import SEND_MESSAGES, SEND_QUEUE_SIZE, SEND_WAIT_SECONDS
+
+# Сколько корзин отдельных чатов держим, прежде чем чистить простаивающие.
+MAX_CHAT_BUCKETS = 10_000
+
+
+class SendPriority(IntEnum):
+    """Приоритеты исходящих сообщений (меньше — раньше)."""
+
+    DEADLINE = 0
+    DIALOG = 1
+    REMINDER = 2
+
+
+class TokenBucket:
+    """Корзина токенов: не более rate отправок в секунду."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Инициализирует полную корзину."""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def try_acquire(self) -> float:
+        """Берёт токен. Возвращает 0 или сколько секунд ждать токена."""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.rate,
+        )
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self) -> None:
+        """Ждёт, пока в корзине появится токен, и забирает его."""
+        while True:
+            delay = self.try_acquire()
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+    def block(self, seconds: float) -> None:
+        """Запрещает отправку на seconds секунд (ответ 429 Telegram)."""
+        self.blocked_until = max(
+            self.blocked_until,
+            time.monotonic() + seconds,
+        )
+
+    def is_idle(self) -> bool:
+        """Корзина полна и не заблокирована — её можно не хранить."""
+        now = time.monotonic()
+        return (
+            now >= self.blocked_until
+            and self.tokens + (now - self.updated_at) * self.rate
+            >= self.capacity
+        )
+
+
+class _SendJob:
+    """Отложенный вызов send_message."""
+
+    __slots__ = (
+        'seq', 'chat_id', 'kwargs', 'future', 'attempts', 'enqueued_at',
+    )
+
+    def __init__(
+        self,
+        seq: int,
+        chat_id: int,
+        kwargs: dict[str, Any],
+        future: asyncio.Future,
+    ) -> None:
+        self.seq = seq
+        self.chat_id = chat_id
+        self.kwargs = kwargs
+        self.future = future
+        self.attempts = 0
+        self.enqueued_at = time.monotonic()
+
+
+class SendQueue:
+    """Очередь исходящих сообщений бота с ограничением скорости.
+
+    Соблюдает общий лимит Telegram (SEND_GLOBAL_RATE сообщений в секунду)
+    и лимит на чат (SEND_CHAT_RATE), учитывает retry_after из ответа 429
+    и отправляет сообщения в порядке приоритета. Если бот запущен
+    в нескольких процессах, общий лимит делится между ними поровну.
+    """
+
+    def __init__(self, bot: Bot, processes: int = 1) -> None:
+        """Инициализирует очередь поверх экземпляра Bot."""
+        self.bot = bot
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._counter = itertools.count()
+        global_rate = settings.SEND_GLOBAL_RATE / processes
+        self._global_bucket = TokenBucket(global_rate, global_rate)
+        self._chat_buckets: dict[int, TokenBucket] = {}
+        self._workers: list[asyncio.Task] = []
+        # задачи, отложенные до конца лимита чата или retry_after
+        self._delayed: dict[int, tuple[asyncio.TimerHandle, _SendJob]] = {}
+        self._closed = False
+        SEND_QUEUE_SIZE.set_function(self._queue.qsize)
+
+    @property
+    def queue_size(self) -> int:
+        """Количество сообщений, ожидающих отправки."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Запускает воркеры. Вызывать внутри работающего event loop."""
+        self._closed = False
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(settings.SEND_WORKERS)
+        ]
+
+    async def close(self) -> None:
+        """Останавливает воркеры, неотправленные сообщения отменяются.
+
+        Отменяются и отложенные задачи, иначе их вызовы ждали бы
+        отправки, которой после остановки уже не будет.
+        """
+        self._closed = True
+        for handle, job in self._delayed.values():
+            handle.cancel()
+            job.future.cancel()
+        self._delayed.clear()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while not self._queue.empty():
+            *_, job = self._queue.get_nowait()
+            job.future.cancel()
+
+    async def send_message(
+        self,
+        chat_id: int,
+        text: str,
+        *,
+        priority: SendPriority = SendPriority.DIALOG,
+        **kwargs: Any,
+    ) -> Message:
+        """Ставит сообщение в очередь и ждёт его отправки."""
+        future = asyncio.get_running_loop().create_future()
+        job = _SendJob(
+            next(self._counter),
+            chat_id,
+            {'text': text, **kwargs},
+            future,
+        )
+        SEND_MESSAGES.labels('enqueued').inc()
+        self._put(priority, job)
+        return await future
+
+    def _put(self, priority: SendPriority, job: _SendJob) -> None:
+        """Кладёт задачу в очередь с сохранением порядка поступления.
+
+        Отложенная задача возвращается со своим исходным номером,
+        поэтому сообщения одного чата не перемешиваются. После close()
+        задача сразу отменяется.
+        """
+        self._delayed.pop(job.seq, None)
+        if self._closed:
+            job.future.cancel()
+            return
+        self._queue.put_nowait((priority, job.seq, job))
+
+    def _put_later(
+        self,
+        delay: float,
+        priority: SendPriority,
+        job: _SendJob,
+    ) -> None:
+        """Возвращает задачу в очередь через delay секунд."""
+        handle = asyncio.get_running_loop().call_later(
+            delay, self._put, priority, job,
+        )
+        self._delayed[job.seq] = (handle, job)
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        """Возвращает корзину токенов чата."""
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= MAX_CHAT_BUCKETS:
+                self._chat_buckets = {
+                    key: value
+                    for key, value in self._chat_buckets.items()
+                    if not value.is_idle()
+                }
+            bucket = TokenBucket(settings.SEND_CHAT_RATE, 1)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    async def _worker(self) -> None:
+        """Выбирает сообщения из очереди и отправляет их."""
+        while True:
+            priority, _, job = await self._queue.get()
+            if job.future.done():
+                continue
+            chat_bucket = self._chat_bucket(job.chat_id)
+            delay = chat_bucket.try_acquire()
+            if delay > 0:
+                # Чат упёрся в лимит — не блокируем воркер остальным чатам.
+                self._put_later(delay, priority, job)
+                continue
+            await self._global_bucket.acquire()
+            await self._send(priority, job, chat_bucket)
+
+    async def _send(
+        self,
+        priority: SendPriority,
+        job: _SendJob,
+        chat_bucket: TokenBucket,
+    ) -> None:
+        """Отправляет сообщение и обрабатывает ответ 429."""
+        job.attempts += 1
+        try:
+            message = await self.bot.send_message(job.chat_id, **job.kwargs)
+        except TelegramRetryAfter as error:
+            if job.attempts > settings.SEND_MAX_RETRIES:
+                self._fail(job, error)
+                return
+            SEND_MESSAGES.labels('retried').inc()
+            # 429 может означать общий лимит бота, поэтому на время
+            # retry_after замолкают все чаты, а не только этот.
+            chat_bucket.block(error.retry_after)
+            self._global_bucket.block(error.retry_after)
+            self._put_later(error.retry_after, priority, job)
+        except Exception as error:
+            self._fail(job, error)
+        else:
+            SEND_MESSAGES.labels('sent').inc()
+            SEND_WAIT_SECONDS.observe(time.monotonic() - job.enqueued_at)
+            if not job.future.done():
+                job.future.set_result(message)
+
+    def _fail(self, job: _SendJob, error: Exception) -> None:
+        """Передаёт ошибку отправки ожидающему вызову."""
+        SEND_MESSAGES.labels('failed').inc()
+        logging.warning(
+            f'Не удалось отправить сообщение в чат {job.chat_id}: {error}',
+        )
+        if not job.future.done():
+            job.future.set_exception(error)
@@ -0,0 +1,257 @@
+"""Попытки прохождения тестов: состояние в Redis, запись в БД в конце.
+
+Попытка - хэш Redis с вопросами в порядке показа, ответами стажёра
+и счётчиком ответов. Срок попытки (time_respond, в минутах) лежит
+в отдельном отсортированном множестве. Нажатие на ответ - один вызов
+скрипта Redis без обращения к БД. Когда стажёр ответил на все вопросы
+или истекло время, ответы пишутся в question одним UPDATE, тест
+оценивается одним агрегатным запросом, а контрольная точка
+закрывается.
+
+Завершает попытку только тот, кто первым захватил её ключом с
+TTL: повторное нажатие последнего ответа и задача планировщика не
+пишут её второй раз. Попытка удаляется из Redis только после записи
+в БД: если процесс упал, не дописав её, захват истекает и ответы
+дописывает периодическая задача планировщика.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from crud.questions import question_crud
+from engine import session_maker
+from intern.utils import complete_ref_point
+from models.models import ReferencePoint
+from services.cache import redis_client
+from services.scheduler import get_reference_point_scheduler
+from services.sender import SendPriority
+
+ANSWERS_KEY = 'test_answers:{test_id}'
+DEADLINES_KEY = 'test_answers:deadlines'
+CLAIM_KEY = 'test_answers:{test_id}:claim'
+QUESTION_FIELD = 'q:{index}'
+ANSWER_PREFIX = b'a:'
+TIMEOUT_MESSAGE = (
+    '⌛ Время на тест истекло.\n'
+    'Правильных ответов: {correct} из {total}'
+)
+
+# Открывает попытку, если её ещё нет, и возвращает текущий шаг.
+# Повторный старт не продлевает срок и не сбрасывает ответы.
+_START_ATTEMPT = redis_client.register_script(
+    """
+    if redis.call('HSETNX', KEYS[1], 'total', ARGV[2]) == 1 then
+        redis.call('HSET', KEYS[1], 'answered', 0, unpack(ARGV, 4))
+        redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+    end
+    local answered = tonumber(redis.call('HGET', KEYS[1], 'answered'))
+    local total = tonumber(redis.call('HGET', KEYS[1], 'total'))
+    return {total - answered, redis.call('HGET', KEYS[1], 'q:' .. answered)}
+    """,
+)
+
+# Записывает первый ответ на вопрос, если срок попытки не истёк.
+# Возвращает {-1}, если попытка закрыта, иначе число вопросов без
+# ответа и следующий вопрос.
+_RECORD_ANSWER = redis_client.register_script(
+    """
+    local deadline = redis.call('ZSCORE', KEYS[2], ARGV[1])
+    if not deadline or tonumber(deadline) < tonumber(ARGV[4]) then
+        return {-1}
+    end
+    local answered = tonumber(redis.call('HGET', KEYS[1], 'answered'))
+    if redis.call('HSETNX', KEYS[1], 'a:' .. ARGV[2], ARGV[3]) == 1 then
+        answered = redis.call('HINCRBY', KEYS[1], 'answered', 1)
+    end
+    local total = tonumber(redis.call('HGET', KEYS[1], 'total'))
+    return {total - answered, redis.call('HGET', KEYS[1], 'q:' .. answered)}
+    """,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class AttemptStep:
+    """Состояние попытки: сколько вопросов осталось и какой следующий.
+
+    question - словарь с id, text, answers, number и total или None,
+    если ответы даны на все вопросы.
+    """
+
+    remaining: int
+    question: Optional[dict[str, Any]]
+
+    @classmethod
+    def from_script(cls, reply: list) -> 'AttemptStep':
+        """Разбирает ответ скрипта Redis."""
+        remaining, *question = reply
+        if not question or question[0] is None:
+            return cls(remaining, None)
+        return cls(remaining, json.loads(question[0]))
+
+
+@dataclass(frozen=True, slots=True)
+class TestResult:
+    """Итог попытки."""
+
+    chat_id: int
+    correct: int
+    total: int
+
+
+async def start_attempt(
+    reference_point: ReferencePoint,
+    chat_id: int,
+) -> Optional[AttemptStep]:
+    """Открывает или продолжает попытку теста контрольной точки.
+
+    Возвращает None, если Redis недоступен.
+    """
+    test = reference_point.test
+    questions = sorted(test.questions, key=lambda question: question.id)
+    fields = [
+        'ref_point_id', reference_point.id,
+        'chat_id', chat_id,
+    ]
+    for index, question in enumerate(questions):
+        fields += [
+            QUESTION_FIELD.format(index=index),
+            json.dumps({
+                'id': question.id,
+                'text': question.text_question,
+                'answers': question.answers,
+                'number': index + 1,
+                'total': len(questions),
+            }),
+        ]
+    try:
+        reply = await _START_ATTEMPT(
+            keys=[ANSWERS_KEY.format(test_id=test.id), DEADLINES_KEY],
+            args=[
+                test.id,
+                len(questions),
+                time.time() + test.time_respond * 60,
+                *fields,
+            ],
+        )
+    except RedisError as e:
+        logging.warning(f'Хранилище попыток недоступно: {str(e)}')
+        return None
+    return AttemptStep.from_script(reply)
+
+
+async def save_answer(
+    test_id: int,
+    question_id: int,
+    answer_index: int,
+) -> Optional[AttemptStep]:
+    """Записывает ответ в попытку без обращения к БД.
+
+    Возвращает None, если попытка завершена или её время истекло.
+    Ошибки Redis передаются вызывающему: ответ не сохранён.
+    """
+    reply = await _RECORD_ANSWER(
+        keys=[ANSWERS_KEY.format(test_id=test_id), DEADLINES_KEY],
+        args=[test_id, question_id, answer_index, time.time()],
+    )
+    if reply[0] < 0:
+        return None
+    return AttemptStep.from_script(reply)
+
+
+async def finish_attempt(
+    test_id: int,
+    session: AsyncSession,
+) -> Optional[TestResult]:
+    """Пишет ответы попытки в БД, оценивает тест и закрывает точку.
+
+    Возвращает None, если попытки уже нет или её завершает другой
+    обработчик: писать и сообщать итог должен только захвативший её.
+    Захват снимается при ошибке и истекает через
+    TEST_ANSWERS_CLAIM_SECONDS, если процесс упал, поэтому попытку
+    потом дописывает задача планировщика; те же ответы пишутся ещё раз.
+    """
+    claim = CLAIM_KEY.format(test_id=test_id)
+    if not await redis_client.set(
+        claim, 1, nx=True, ex=settings.TEST_ANSWERS_CLAIM_SECONDS,
+    ):
+        return None
+    try:
+        return await _write_attempt(test_id, claim, session)
+    except Exception:
+        await redis_client.delete(claim)
+        raise
+
+
+async def _write_attempt(
+    test_id: int,
+    claim: str,
+    session: AsyncSession,
+) -> Optional[TestResult]:
+    """Пишет захваченную попытку в БД и удаляет её из Redis."""
+    key = ANSWERS_KEY.format(test_id=test_id)
+    raw = await redis_client.hgetall(key)
+    if not raw:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.zrem(DEADLINES_KEY, test_id)
+            pipe.delete(claim)
+            await pipe.execute()
+        return None
+    answers = {
+        int(field.removeprefix(ANSWER_PREFIX)): int(answer)
+        for field, answer in raw.items()
+        if field.startswith(ANSWER_PREFIX)
+    }
+    await question_crud.bulk_update_answers(test_id, answers, session)
+    score = await question_crud.get_test_score(test_id, session)
+    reference_point = await session.get(
+        ReferencePoint, int(raw[b'ref_point_id']),
+    )
+    if reference_point is not None and not reference_point.is_completed:
+        await complete_ref_point(reference_point, session)
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.delete(key, claim)
+        pipe.zrem(DEADLINES_KEY, test_id)
+        await pipe.execute()
+    return TestResult(int(raw[b'chat_id']), score.correct, score.total)
+
+
+async def flush_expired_attempts_job() -> None:
+    """Задача планировщика: завершает попытки с истёкшим сроком."""
+    try:
+        expired = await redis_client.zrangebyscore(
+            DEADLINES_KEY,
+            '-inf',
+            time.time(),
+            start=0,
+            num=settings.TEST_ANSWERS_FLUSH_BATCH,
+        )
+    except RedisError as e:
+        logging.warning(f'Хранилище попыток недоступно: {str(e)}')
+        return
+    sender = get_reference_point_scheduler().sender
+    async with session_maker() as session:
+        for test_id in map(int, expired):
+            try:
+                result = await finish_attempt(test_id, session)
+            except Exception:
+                await session.rollback()
+                logging.exception(
+                    f'Не удалось завершить попытку теста {test_id}',
+                )
+                continue
+            if result is not None:
+                await sender.send_message(
+                    result.chat_id,
+                    TIMEOUT_MESSAGE.format(
+                        correct=result.correct,
+                        total=result.total,
+                    ),
+                    priority=SendPriority.DEADLINE,
+                )
@@ -0,0 +1,113 @@
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from config import settings
+from models.models import User
+from services.cache import redis_client
+
+USER_CACHE_KEY = 'user_cache:{tg_id}'
+# Сколько записей держим в памяти, прежде чем чистить просроченные.
+MAX_LOCAL_ENTRIES = 10_000
+
+
+@dataclass(frozen=True, slots=True)
+class CachedUser:
+    """Данные пользователя, нужные для проверки прав в хендлерах."""
+
+    id: int
+    tg_id: int
+    role: str
+    is_active: bool
+    restaurant_id: Optional[int]
+    timezone: str
+
+    @classmethod
+    def from_user(cls, user: User) -> 'CachedUser':
+        """Создаёт запись кэша из модели пользователя."""
+        return cls(
+            id=user.id,
+            tg_id=user.tg_id,
+            role=user.role,
+            is_active=user.is_active,
+            restaurant_id=user.restaurant_id,
+            timezone=user.timezone,
+        )
+
+
+class UserCache:
+    """Кэш пользователей по tg_id: память процесса и Redis.
+
+    Записи живут USER_CACHE_LOCAL_TTL секунд в памяти и USER_CACHE_TTL
+    секунд в Redis. При изменении пользователя запись удаляется из обоих
+    уровней; в памяти других процессов она доживает до своего TTL.
+    Недоступность Redis не ломает проверку прав — запрос идёт в БД.
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует пустой кэш."""
+        self._local: dict[int, tuple[float, CachedUser]] = {}
+        self._redis = redis_client
+
+    async def get(self, tg_id: int) -> Optional[CachedUser]:
+        """Возвращает пользователя из кэша или None."""
+        entry = self._local.get(tg_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        try:
+            raw = await self._redis.get(USER_CACHE_KEY.format(tg_id=tg_id))
+        except RedisError as e:
+            logging.warning(f'Кэш пользователей недоступен: {str(e)}')
+            return None
+        if raw is None:
+            return None
+        user = CachedUser(**json.loads(raw))
+        self._set_local(user)
+        return user
+
+    async def set(self, user: CachedUser) -> None:
+        """Сохраняет пользователя в оба уровня кэша."""
+        self._set_local(user)
+        try:
+            await self._redis.set(
+                USER_CACHE_KEY.format(tg_id=user.tg_id),
+                json.dumps(asdict(user)),
+                ex=settings.USER_CACHE_TTL,
+            )
+        except RedisError as e:
+            logging.warning(f'Кэш пользователей недоступен: {str(e)}')
+
+    async def invalidate(self, *tg_ids: Optional[int]) -> None:
+        """Удаляет пользователей из кэша после их изменения."""
+        keys = [tg_id for tg_id in set(tg_ids) if tg_id is not None]
+        if not keys:
+            return
+        for tg_id in keys:
+            self._local.pop(tg_id, None)
+        try:
+            await self._redis.delete(
+                *(USER_CACHE_KEY.format(tg_id=tg_id) for tg_id in keys),
+            )
+        except RedisError as e:
+            logging.warning(f'Кэш пользователей недоступен: {str(e)}')
+
+    def _set_local(self, user: CachedUser) -> None:
+        """Кладёт запись в память процесса."""
+        now = time.monotonic()
+        if len(self._local) >= MAX_LOCAL_ENTRIES:
+            self._local = {
+                tg_id: entry
+                for tg_id, entry in self._local.items()
+                if entry[0] > now
+            }
+        self._local[user.tg_id] = (
+            now + settings.USER_CACHE_LOCAL_TTL,
+            user,
+        )
+
+
+user_cache = UserCache()
@@ -0,0 +1,90 @@
+import logging
+import multiprocessing
+import signal
+from types import FrameType
+from typing import Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import (
+    SimpleRequestHandler,
+    setup_application,
+)
+from aiohttp import web
+
+from config import settings
+
+
+def build_webhook_app(dispatcher: Dispatcher, bot: Bot) -> web.Application:
+    """Создаёт aiohttp-приложение, принимающее обновления от Telegram.
+
+    Обработчики завершения диспетчера регистрируются раньше закрытия
+    сессии бота, чтобы очередь отправки успела остановиться.
+    """
+    app = web.Application()
+    setup_application(app, dispatcher, bot=bot)
+    SimpleRequestHandler(
+        dispatcher=dispatcher,
+        bot=bot,
+        secret_token=settings.WEBHOOK_SECRET or None,
+    ).register(app, path=settings.WEBHOOK_PATH)
+    return app
+
+
+async def set_webhook(dispatcher: Dispatcher, bot: Bot) -> None:
+    """Регистрирует адрес вебхука в Telegram."""
+    await bot.set_webhook(
+        url=settings.webhook_url,
+        secret_token=settings.WEBHOOK_SECRET or None,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+    )
+
+
+def _serve(dispatcher: Dispatcher, bot: Bot, index: int) -> None:
+    """Запускает один процесс веб-сервера.
+
+    Планировщик контрольных точек и регистрацию вебхука выполняет
+    только первый процесс, состояние FSM общее для всех через Redis.
+    """
+    dispatcher['is_primary_worker'] = index == 0
+    dispatcher['worker_index'] = index
+    web.run_app(
+        build_webhook_app(dispatcher, bot),
+        host=settings.WEBHOOK_HOST,
+        port=settings.WEBHOOK_PORT,
+        reuse_port=settings.WEBHOOK_WORKERS > 1,
+        print=None,
+    )
+
+
+def run_webhook(dispatcher: Dispatcher, bot: Bot) -> None:
+    """Запускает бота в режиме вебхука на WEBHOOK_WORKERS процессах.
+
+    Процессы слушают один порт (SO_REUSEPORT). SIGTERM и SIGINT
+    пересылаются процессам, каждый из них корректно завершает работу.
+    """
+    if settings.WEBHOOK_WORKERS == 1:
+        _serve(dispatcher, bot, 0)
+        return
+
+    context = multiprocessing.get_context('fork')
+    workers = [
+        context.Process(target=_serve, args=(dispatcher, bot, index))
+        for index in range(settings.WEBHOOK_WORKERS)
+    ]
+
+    def stop_workers(signum: int, frame: Optional[FrameType]) -> None:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    for worker in workers:
+        worker.start()
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, stop_workers)
+    for worker in workers:
+        worker.join()
+        if worker.exitcode:
+            logging.warning(
+                f'Процесс вебхука {worker.pid} завершился '
+                f'с кодом {worker.exitcode}',
+            )